@@ -0,0 +1,71 @@
+"""
+The admin, checked against the middleware stack it actually runs behind.
+
+Django's admin checks that the session, authentication and messages
+middleware are in MIDDLEWARE (admin.E408 to admin.E410). Here they are in
+FULL_STACK_MIDDLEWARE, which PathRoutedMiddleware runs for the admin, so
+`AdminConfig` registers `check_dependencies` instead, which looks for them
+there. Installed in place of "django.contrib.admin".
+"""
+
+from django.conf import settings
+from django.contrib.admin import apps as admin_apps
+from django.contrib.admin import checks as admin_checks
+from django.core import checks
+
+MIDDLEWARE_CHECKS = {"admin.E408", "admin.E409", "admin.E410"}
+
+SESSION_MIDDLEWARE = "django.contrib.sessions.middleware.SessionMiddleware"
+AUTHENTICATION_MIDDLEWARE = "django.contrib.auth.middleware.AuthenticationMiddleware"
+MESSAGE_MIDDLEWARE = "django.contrib.messages.middleware.MessageMiddleware"
+
+
+def check_dependencies(**kwargs):
+    """
+    The admin's dependency checks, with the middleware ones made against
+    FULL_STACK_MIDDLEWARE.
+    """
+    errors = [
+        error
+        for error in admin_checks.check_dependencies(**kwargs)
+        if error.id not in MIDDLEWARE_CHECKS
+    ]
+    middleware = settings.FULL_STACK_MIDDLEWARE
+    for name, id in [
+        (AUTHENTICATION_MIDDLEWARE, "api.E001"),
+        (MESSAGE_MIDDLEWARE, "api.E002"),
+        (SESSION_MIDDLEWARE, "api.E003"),
+    ]:
+        if name not in middleware:
+            errors.append(
+                checks.Error(
+                    f"'{name}' must be in FULL_STACK_MIDDLEWARE in order to use "
+                    "the admin application.",
+                    id=id,
+                )
+            )
+    if (
+        SESSION_MIDDLEWARE in middleware
+        and AUTHENTICATION_MIDDLEWARE in middleware
+        and middleware.index(SESSION_MIDDLEWARE)
+        > middleware.index(AUTHENTICATION_MIDDLEWARE)
+    ):
+        errors.append(
+            checks.Error(
+                f"'{SESSION_MIDDLEWARE}' must be before "
+                f"'{AUTHENTICATION_MIDDLEWARE}' in FULL_STACK_MIDDLEWARE.",
+                id="api.E004",
+            )
+        )
+    return errors
+
+
+class AdminConfig(admin_apps.AdminConfig):
+    default = False
+
+    def ready(self):
+        # Not super().ready(), which registers the admin's own
+        # check_dependencies.
+        checks.register(check_dependencies, checks.Tags.admin)
+        checks.register(admin_checks.check_admin_app, checks.Tags.admin)
+        self.module.autodiscover()
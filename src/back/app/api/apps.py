@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "app.api"
+
+    def ready(self):
+        from app.api import signals, sqlite  # noqa: F401
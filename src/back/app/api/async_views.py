@@ -0,0 +1,142 @@
+"""
+Async implementations of the read-only list and profile endpoints.
+
+They reuse the querysets, serializers, permission and pagination classes of
+the DRF views in `app.api.views`, but authenticate, read version stamps and
+fetch rows through Django's async ORM. Under an ASGI server a request waiting
+on the database therefore does not hold a worker thread. Enabled with the
+ASYNC_READ_VIEWS setting.
+"""
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse, HttpResponseNotModified
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from app.api.authentication import CachedTokenAuthentication
+from app.api.conditional import (
+    VersionStampConditionalGetMixin,
+    etag_matches,
+    set_etag,
+    version_etag,
+    version_scope,
+)
+from app.api.models import CustomUser, VersionStamp
+from app.api.replicas import reading_from
+from app.api.views import EmployeeListView, LeaveRequestListView, UserProfileView
+
+
+async def aauthenticate(request):
+    """
+    Returns (user, auth) for a token or session authenticated request. Roles
+    are resolved in the same query, so permission checks and get_queryset()
+    of the reused DRF views run without touching the database.
+    """
+    authenticator = CachedTokenAuthentication()
+    result = await authenticator.aauthenticate(request)
+    if result is not None:
+        return result
+
+    if not hasattr(request, "auser"):
+        # Lean paths skip the session and authentication middleware.
+        return (AnonymousUser(), None)
+    user = await request.auser()
+    if user.is_authenticated:
+        user = await CustomUser.objects.select_related("employee", "supervisor").aget(
+            pk=user.pk
+        )
+    return (user, None)
+
+
+class AsyncReadView(View):
+    """
+    Base for async GET endpoints backed by the DRF view `sync_view_class`.
+    Subclasses implement `aget_data()`.
+    """
+
+    sync_view_class = None
+    renderer = JSONRenderer()
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            user, auth = await aauthenticate(request)
+            drf_request = Request(request)
+            drf_request.user, drf_request.auth = user, auth
+            if not user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+
+            view = self.sync_view_class(
+                request=drf_request,
+                args=args,
+                kwargs=kwargs,
+                format_kwarg=None,
+                headers={},
+            )
+            view.check_permissions(drf_request)
+
+            # The version stamp is read from the same database as the data.
+            with reading_from(view.get_read_database()):
+                etag = None
+                if issubclass(self.sync_view_class, VersionStampConditionalGetMixin):
+                    scope = version_scope(user)
+                    if scope is not None:
+                        version = await VersionStamp.acurrent(scope)
+                        etag = version_etag(request, scope, version)
+                        if etag_matches(request, etag):
+                            return set_etag(HttpResponseNotModified(), etag)
+
+                response = self.render(await self.aget_data(view, drf_request))
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+        if etag is not None:
+            set_etag(response, etag)
+        return response
+
+    async def aget_data(self, view, request):
+        raise NotImplementedError
+
+    def render(self, data, status=200):
+        return HttpResponse(
+            self.renderer.render(data),
+            content_type="application/json",
+            status=status,
+        )
+
+    def handle_exception(self, exc):
+        response = self.render({"detail": exc.detail}, status=exc.status_code)
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            response["WWW-Authenticate"] = CachedTokenAuthentication.keyword
+        return response
+
+
+class AsyncListView(AsyncReadView):
+    async def aget_data(self, view, request):
+        serializer = view.get_values_serializer()
+        queryset = serializer.values(view.filter_queryset(view.get_queryset()))
+        paginator = view.paginator
+        page = await paginator.apaginate_queryset(queryset, request, view=view)
+        return paginator.get_paginated_response(serializer.serialize(page)).data
+
+
+class AsyncLeaveRequestListView(AsyncListView):
+    sync_view_class = LeaveRequestListView
+
+
+class AsyncEmployeeListView(AsyncListView):
+    sync_view_class = EmployeeListView
+
+
+class AsyncUserProfileView(AsyncReadView):
+    sync_view_class = UserProfileView
+
+    async def aget_data(self, view, request):
+        # Usually memoized by authentication; otherwise it queries the roles.
+        subclass_instance = await sync_to_async(request.user.get_subclass_instance)()
+        await subclass_instance.aload_deferred_fields()
+        return view.get_profile_data(subclass_instance)
@@ -0,0 +1,125 @@
+from django.db.models import DEFERRED
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+
+from app.api.models import CustomUser, Employee, Supervisor
+from app.api.token_cache import TokenIdentity, get_token_cache
+
+
+class RoleAwareTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that loads the user together with their Employee or
+    Supervisor row in a single query, so role checks made by permission
+    classes and views during the request are answered from memory.
+    """
+
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = self._token_queryset().get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+        return self._check_token(token)
+
+    async def aauthenticate(self, request):
+        """Async counterpart of `authenticate()`, for async views."""
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(_("Invalid token header."))
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(_("Invalid token header."))
+        return await self.aauthenticate_credentials(key)
+
+    async def aauthenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = await self._token_queryset().aget(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+        return self._check_token(token)
+
+    def _token_queryset(self):
+        return self.get_model().objects.select_related(
+            "user", "user__employee", "user__supervisor"
+        )
+
+    def _check_token(self, token):
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return (token.user, token)
+
+
+class CachedTokenAuthentication(RoleAwareTokenAuthentication):
+    """
+    Caches each token's identity (user id, role, supervisor id, superuser flag)
+    so that authenticating a known token runs no queries. On a cache hit the
+    user is built with every other field deferred; views that need the full
+    row call `load_deferred_fields()`.
+
+    Entries are dropped by the signals in `app.api.signals` when the token is
+    deleted or the user is saved (e.g. deactivated). Bulk `QuerySet.update()`
+    calls on users bypass those signals.
+    """
+
+    def authenticate_credentials(self, key):
+        token_cache = get_token_cache()
+        identity = token_cache.get(key)
+        if identity is not None:
+            user = self._build_user(identity)
+            return (user, self.get_model()(key=key, user_id=user.pk))
+
+        user, token = super().authenticate_credentials(key)
+        token_cache.set(key, self._identity(user))
+        return (user, token)
+
+    async def aauthenticate_credentials(self, key):
+        token_cache = get_token_cache()
+        identity = await token_cache.aget(key)
+        if identity is not None:
+            user = self._build_user(identity)
+            return (user, self.get_model()(key=key, user_id=user.pk))
+
+        user, token = await super().aauthenticate_credentials(key)
+        await token_cache.aset(key, self._identity(user))
+        return (user, token)
+
+    def _identity(self, user):
+        subclass_instance = user.get_subclass_instance()
+        return TokenIdentity(
+            user_id=user.pk,
+            role=user.get_role(),
+            supervisor_id=getattr(subclass_instance, "assigned_supervisor_id", None),
+            is_superuser=user.is_superuser,
+        )
+
+    def _build_user(self, identity):
+        known = {
+            "id": identity.user_id,
+            "is_superuser": identity.is_superuser,
+            "is_active": True,
+        }
+        if identity.role == "employee":
+            model = Employee
+            known["customuser_ptr_id"] = identity.user_id
+            known["assigned_supervisor_id"] = identity.supervisor_id
+        elif identity.role == "supervisor":
+            model = Supervisor
+            known["customuser_ptr_id"] = identity.user_id
+        else:
+            model = CustomUser
+
+        fields = model._meta.concrete_fields
+        user = model.from_db(
+            None,
+            [field.attname for field in fields],
+            [known.get(field.attname, DEFERRED) for field in fields],
+        )
+        # The role is known, so role checks must not look up the Employee and
+        # Supervisor rows; a user without a role is its own subclass instance.
+        user._subclass_instance = user
+        return user
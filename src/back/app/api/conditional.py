@@ -0,0 +1,61 @@
+import hashlib
+
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from app.api.models import VersionStamp
+
+
+def version_scope(user):
+    """The VersionStamp scope covering everything `user` can read."""
+    if user.is_superuser:
+        return VersionStamp.GLOBAL
+    if user.is_employee_or_supervisor():
+        return VersionStamp.for_user(user.pk)
+    return None
+
+
+def version_etag(request, scope, version):
+    path_hash = hashlib.md5(request.get_full_path().encode()).hexdigest()[:12]
+    return f'"{scope}.{version}.{path_hash}"'
+
+
+def etag_matches(request, etag):
+    return etag in parse_etags(request.headers.get("If-None-Match", ""))
+
+
+def set_etag(response, etag):
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class VersionStampConditionalGetMixin:
+    """
+    Adds an ETag built from the VersionStamp of the requesting user's scope to
+    GET responses, and answers a matching If-None-Match with 304 Not Modified
+    before the queryset is built or anything is serialized.
+    """
+
+    def get_version_scope(self):
+        return version_scope(self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        scope = self.get_version_scope()
+        if scope is None:
+            return super().get(request, *args, **kwargs)
+
+        # Read before building the response, so a change that lands meanwhile
+        # makes the next request miss rather than hit on stale data.
+        etag = version_etag(request, scope, VersionStamp.current(scope))
+
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        return set_etag(response, etag)
@@ -0,0 +1,160 @@
+"""
+Read-only serialization of `QuerySet.values()` rows.
+
+`ValuesSerializer` is built from a ModelSerializer class and produces the
+same output, but from plain dicts instead of model instances, with one
+precompiled converter per field instead of DRF's per-field dispatch. Field
+types without a dedicated converter fall back to the DRF field's
+`to_representation()`, so the output always matches the ModelSerializer.
+"""
+
+from functools import cache, cached_property
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# DRF field classes whose representation is the database value itself, when
+# the model field is one of the given types.
+TEXT_FIELDS = (models.CharField, models.TextField)
+IDENTITY_FIELDS = {
+    serializers.CharField: TEXT_FIELDS,
+    serializers.EmailField: TEXT_FIELDS,
+    serializers.IntegerField: (models.IntegerField,),
+    serializers.BooleanField: (models.BooleanField,),
+}
+
+
+class ValuesSerializer:
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+
+    @property
+    def model(self):
+        return self.serializer_class.Meta.model
+
+    @cached_property
+    def fields(self):
+        """[(name, lookup, DRF field, nested ValuesSerializer or None)]"""
+        serializer = self.serializer_class()
+        fields = []
+        for field in serializer._readable_fields:
+            if "." in field.source or field.source == "*":
+                raise ValueError(
+                    f"{self.serializer_class.__name__}.{field.field_name}: "
+                    f"unsupported source {field.source!r}"
+                )
+            nested = None
+            if isinstance(field, serializers.BaseSerializer):
+                nested = ValuesSerializer(type(field))
+            fields.append((field.field_name, field.source, field, nested))
+        return fields
+
+    @cached_property
+    def lookups(self):
+        lookups = []
+        for _, source, _, nested in self.fields:
+            lookups.append(source)
+            if nested is not None:
+                lookups.extend(f"{source}__{lookup}" for lookup in nested.lookups)
+        return list(dict.fromkeys(lookups))
+
+    def values(self, queryset):
+        return queryset.values(*self.lookups)
+
+    def serialize(self, rows):
+        to_representation = self.compile()
+        return [to_representation(row) for row in rows]
+
+    def compile(self, prefix=""):
+        """
+        Returns a function rendering one row. Converters are created per call,
+        so they pick up the timezone active at that time.
+        """
+        plan = []
+        for name, source, field, nested in self.fields:
+            key = prefix + source
+            if nested is not None:
+                plan.append((name, key, nested.compile(f"{key}__"), True))
+            else:
+                plan.append((name, key, self._converter(field), False))
+
+        def to_representation(row):
+            data = {}
+            for name, key, convert, is_nested in plan:
+                value = row[key]
+                if value is None:
+                    data[name] = None
+                elif is_nested:
+                    data[name] = convert(row)
+                elif convert is None:
+                    data[name] = value
+                else:
+                    data[name] = convert(value)
+            return data
+
+        return to_representation
+
+    def _converter(self, field):
+        """Returns a function converting a database value, or None for identity."""
+        if isinstance(field, serializers.DateTimeField):
+            return _datetime_converter(field)
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return None if field.pk_field is None else field.pk_field.to_representation
+        if isinstance(field, serializers.ChoiceField):
+            if all(isinstance(key, str) for key in field.choices):
+                return None
+            return field.to_representation
+        model_types = IDENTITY_FIELDS.get(type(field))
+        if model_types and isinstance(
+            self.model._meta.get_field(field.source), model_types
+        ):
+            return None
+        return field.to_representation
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if (
+        output_format is None
+        or output_format.lower() != ISO_8601
+        or hasattr(field, "timezone")
+        or not settings.USE_TZ
+    ):
+        return field.to_representation
+    tz = timezone.get_current_timezone()
+
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        if value.endswith("+00:00"):
+            return value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+@cache
+def values_serializer_for(serializer_class):
+    return ValuesSerializer(serializer_class)
+
+
+class ValuesListMixin:
+    """
+    Serves `list()` from `.values()` rows through a ValuesSerializer built
+    from the view's serializer class. The pagination ordering columns must be
+    among the serialized fields.
+    """
+
+    def get_values_serializer(self):
+        return values_serializer_for(self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        queryset = serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
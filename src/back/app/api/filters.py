@@ -0,0 +1,30 @@
+from django_filters import rest_framework as filters
+
+from app.api.models import LeaveRequest
+
+
+class LeaveRequestFilter(filters.FilterSet):
+    """
+    Filters for leave request listings. Each combination is served by one of
+    the indexes declared on LeaveRequest: per employee by the employee
+    indexes, otherwise by the status ones, or by the index of the ordering
+    column.
+    """
+
+    status = filters.MultipleChoiceFilter(
+        choices=LeaveRequest.LeaveStatus.choices, distinct=False
+    )
+    employee = filters.NumberFilter(field_name="employee_id")
+    # Requests overlapping [overlaps_from, overlaps_to].
+    overlaps_from = filters.IsoDateTimeFilter(field_name="end_date", lookup_expr="gte")
+    overlaps_to = filters.IsoDateTimeFilter(field_name="start_date", lookup_expr="lte")
+    created_after = filters.IsoDateTimeFilter(
+        field_name="created_at", lookup_expr="gte"
+    )
+    created_before = filters.IsoDateTimeFilter(
+        field_name="created_at", lookup_expr="lt"
+    )
+
+    class Meta:
+        model = LeaveRequest
+        fields = []
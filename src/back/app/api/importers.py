@@ -0,0 +1,185 @@
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from app.api.models import (
+    CustomUser,
+    Employee,
+    LeaveBalanceEntry,
+    LeaveRequestCounter,
+    VersionStamp,
+)
+from app.api.serializers import EmployeeImportSerializer
+
+USER_FIELDS = {field.name for field in CustomUser._meta.concrete_fields}
+
+
+def read_csv_rows(stream):
+    """
+    Yields one dict per CSV row, leaving out empty cells so they fall back to
+    the serializer defaults.
+    """
+    for row in csv.DictReader(stream):
+        yield {key: value for key, value in row.items() if value not in ("", None)}
+
+
+def read_json_lines(stream):
+    """
+    Yields one object per non-empty line of a JSON Lines stream. Lines that
+    are not valid JSON are yielded as-is and rejected during validation.
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            yield line
+
+
+# Readers by file extension, shared by the import endpoint and command.
+READERS = {
+    ".csv": read_csv_rows,
+    ".jsonl": read_json_lines,
+    ".ndjson": read_json_lines,
+}
+
+
+def import_employees(rows, assigned_supervisor=None, batch_size=500, workers=None):
+    """
+    Validates and creates employees from an iterable of row dicts, one batch
+    at a time, so memory use does not depend on the number of rows.
+
+    Passwords are hashed in a process pool of `workers` processes (all CPUs by
+    default, in-process when `workers` is 1). Returns a report with the number
+    of created employees and the 1-based row number and errors of every
+    rejected row.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, not {workers}.")
+    report = {"created": 0, "rejected": []}
+    serializer = EmployeeImportSerializer()
+    pool = (
+        ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+        if workers != 1
+        else None
+    )
+    hash_passwords = pool.map if pool else map
+
+    try:
+        numbered_rows = enumerate(rows, start=1)
+        while batch := list(islice(numbered_rows, batch_size)):
+            accepted = _validate_batch(serializer, batch, report["rejected"])
+            if not accepted:
+                continue
+            passwords = hash_passwords(
+                make_password, [data.pop("password") for _, data in accepted]
+            )
+            _insert_batch(
+                [data for _, data in accepted], passwords, assigned_supervisor
+            )
+            report["created"] += len(accepted)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    return report
+
+
+def _validate_batch(serializer, batch, rejected):
+    batch_rejected = []
+    valid = []
+    for row_number, data in batch:
+        try:
+            valid.append((row_number, serializer.run_validation(data)))
+        except serializers.ValidationError as exc:
+            errors = serializers.as_serializer_error(exc)
+            batch_rejected.append({"row": row_number, "errors": errors})
+
+    emails = {data["email"] for _, data in valid}
+    national_ids = {data["national_id"] for _, data in valid}
+    taken_emails = set(
+        CustomUser.objects.filter(email__in=emails).values_list("email", flat=True)
+    )
+    taken_national_ids = set(
+        CustomUser.objects.filter(national_id__in=national_ids).values_list(
+            "national_id", flat=True
+        )
+    )
+
+    accepted = []
+    for row_number, data in valid:
+        errors = {}
+        if data["email"] in taken_emails:
+            errors["email"] = ["User with this email already exists."]
+        if data["national_id"] in taken_national_ids:
+            errors["national_id"] = ["User with this national id already exists."]
+        if errors:
+            batch_rejected.append({"row": row_number, "errors": errors})
+            continue
+        # Later rows of the same file must not reuse these either.
+        taken_emails.add(data["email"])
+        taken_national_ids.add(data["national_id"])
+        accepted.append((row_number, data))
+
+    rejected.extend(sorted(batch_rejected, key=lambda item: item["row"]))
+    return accepted
+
+
+def _insert_batch(rows, passwords, assigned_supervisor):
+    """
+    Inserts the parent CustomUser rows with bulk_create, then the Employee
+    child rows with a single executemany, since bulk_create does not support
+    multi-table inheritance.
+    """
+    default_leave_requests = Employee._meta.get_field(
+        "leave_requests_left"
+    ).get_default()
+    with transaction.atomic():
+        users = CustomUser.objects.bulk_create(
+            CustomUser(
+                password=password,
+                **{key: value for key, value in data.items() if key in USER_FIELDS},
+            )
+            for data, password in zip(rows, passwords)
+        )
+
+        opts = Employee._meta
+        columns = ", ".join(
+            connection.ops.quote_name(opts.get_field(name).column)
+            for name in ("customuser_ptr", "assigned_supervisor", "leave_requests_left")
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {connection.ops.quote_name(opts.db_table)} "
+                f"({columns}) VALUES (%s, %s, %s)",
+                [
+                    (
+                        user.pk,
+                        assigned_supervisor.pk if assigned_supervisor else None,
+                        data.get("leave_requests_left", default_leave_requests),
+                    )
+                    for user, data in zip(users, rows)
+                ],
+            )
+        LeaveRequestCounter.objects.bulk_create(
+            LeaveRequestCounter(user_id=user.pk) for user in users
+        )
+        VersionStamp.objects.bulk_create(
+            VersionStamp(scope=VersionStamp.for_user(user.pk)) for user in users
+        )
+        LeaveBalanceEntry.objects.bulk_create(
+            LeaveBalanceEntry(
+                employee_id=user.pk,
+                kind=LeaveBalanceEntry.Kind.GRANT,
+                amount=data.get("leave_requests_left", default_leave_requests),
+            )
+            for user, data in zip(users, rows)
+        )
@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.api.exports import EXPORT_FORMATS, export_leave_requests
+from app.api.filters import LeaveRequestFilter
+from app.api.models import LeaveRequest, Supervisor
+
+
+class Command(BaseCommand):
+    help = "Exports leave history as CSV or NDJSON, for payroll."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", type=Path, help="File to write to. Defaults to stdout."
+        )
+        parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument(
+            "--supervisor",
+            help="Only export the team of the supervisor with this email.",
+        )
+        parser.add_argument(
+            "--from",
+            dest="overlaps_from",
+            help="Only export leave ending at or after this ISO 8601 datetime.",
+        )
+        parser.add_argument(
+            "--to",
+            dest="overlaps_to",
+            help="Only export leave starting at or before this ISO 8601 datetime.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        queryset = LeaveRequest.objects.all()
+        if options["supervisor"]:
+            try:
+                supervisor = Supervisor.objects.get(email=options["supervisor"])
+            except Supervisor.DoesNotExist:
+                raise CommandError(f"No supervisor with email {options['supervisor']}")
+            queryset = queryset.filter(employee__assigned_supervisor=supervisor)
+
+        filterset = LeaveRequestFilter(
+            {
+                name: options[name]
+                for name in ("overlaps_from", "overlaps_to")
+                if options[name]
+            },
+            queryset=queryset,
+        )
+        if not filterset.is_valid():
+            raise CommandError(filterset.errors.as_text())
+
+        chunks = export_leave_requests(
+            filterset.qs,
+            options["format"],
+            compress=options["gzip"],
+            chunk_size=options["chunk_size"],
+        )
+        if options["output"]:
+            with options["output"].open("wb") as output:
+                output.writelines(chunks)
+        else:
+            sys.stdout.buffer.writelines(chunks)
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from app.api.schema import CODECS, generate_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes the OpenAPI schema to a file. JSON files can be served through "
+        "the API_SCHEMA_FILE setting."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", type=Path)
+        parser.add_argument(
+            "--format",
+            choices=CODECS,
+            help="Output format. Defaults to the file extension, else json.",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        file_format = options["format"] or (
+            "yaml" if output.suffix.lower() in (".yaml", ".yml") else "json"
+        )
+        content = generate_schema(file_format)
+        output.write_bytes(content)
+        self.stdout.write(f"Wrote {len(content)} bytes to {output}.")
@@ -0,0 +1,66 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.api.importers import READERS, import_employees
+from app.api.models import Supervisor
+
+
+class Command(BaseCommand):
+    help = "Imports employees from a CSV or JSON Lines file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", type=Path)
+        parser.add_argument(
+            "--format",
+            choices=[suffix.lstrip(".") for suffix in READERS],
+            help="Input format. Defaults to the file extension.",
+        )
+        parser.add_argument(
+            "--supervisor", help="Email of the supervisor to assign employees to."
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes. Defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--report",
+            type=Path,
+            help="Write rejected rows as JSON Lines to this file.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        suffix = "." + options["format"] if options["format"] else path.suffix.lower()
+        if suffix not in READERS:
+            raise CommandError(f"Unsupported input format: {suffix.lstrip('.')!r}")
+        if options["workers"] is not None and options["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+
+        supervisor = None
+        if options["supervisor"]:
+            try:
+                supervisor = Supervisor.objects.get(email=options["supervisor"])
+            except Supervisor.DoesNotExist:
+                raise CommandError(f"No supervisor with email {options['supervisor']}")
+
+        with path.open(newline="", encoding="utf-8") as stream:
+            report = import_employees(
+                READERS[suffix](stream),
+                assigned_supervisor=supervisor,
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+            )
+
+        if options["report"]:
+            with options["report"].open("w", encoding="utf-8") as report_file:
+                for rejected in report["rejected"]:
+                    report_file.write(json.dumps(rejected) + "\n")
+
+        self.stdout.write(
+            f"Created {report['created']} employees, "
+            f"rejected {len(report['rejected'])} rows."
+        )
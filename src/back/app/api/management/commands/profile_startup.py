@@ -0,0 +1,89 @@
+import statistics
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.api.startup import HANDLERS, profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Boots app.wsgi or app.asgi in fresh processes and reports the time to "
+        "the first request, peak resident memory and the import tree. Use "
+        "--settings to profile another settings module."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--handler", choices=HANDLERS, default="wsgi")
+        parser.add_argument(
+            "--path",
+            default="/api/leave-requests/",
+            help="Path of the first request. Sent without credentials.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of processes to boot; timings are the median.",
+        )
+        parser.add_argument(
+            "--depth", type=int, default=3, help="Levels of the import tree."
+        )
+        parser.add_argument(
+            "--min-ms",
+            type=float,
+            default=5.0,
+            help="Hide imports whose cumulative time is below this.",
+        )
+
+    def handle(self, *args, **options):
+        runs = []
+        for _ in range(max(options["repeat"], 1)):
+            try:
+                runs.append(
+                    profile_startup(
+                        options["handler"], options["path"], cwd=settings.BASE_DIR
+                    )
+                )
+            except RuntimeError as error:
+                raise CommandError(f"Startup failed:\n{error}")
+
+        def median(key):
+            return statistics.median(run[key] for run in runs)
+
+        self.stdout.write(
+            f"{HANDLERS[options['handler']]} with {settings.SETTINGS_MODULE}: "
+            f"GET {options['path']} -> {runs[-1]['status']}, "
+            f"median of {len(runs)} runs"
+        )
+        for label, key in [
+            ("interpreter started", "interpreter"),
+            ("application loaded", "loaded"),
+            ("first response", "served"),
+        ]:
+            self.stdout.write(f"  {label:<22}{median(key) * 1000:9.1f} ms")
+        for label, key in [
+            ("RSS when loaded", "loaded_rss"),
+            ("RSS after response", "served_rss"),
+        ]:
+            self.stdout.write(f"  {label:<22}{median(key) / 2**20:9.1f} MiB")
+
+        imports = runs[-1]["imports"]
+        total = sum(node.cumulative_us for node in imports)
+        modules = sum(1 for node in imports for _ in node.walk())
+        self.stdout.write(
+            f"Imports of the last run: {modules} modules, {total / 1000:.1f} ms. "
+            f"Showing those taking {options['min_ms']} ms or more:"
+        )
+        self._write_tree(imports, options["depth"], options["min_ms"] * 1000)
+
+    def _write_tree(self, nodes, depth, min_us, level=0):
+        if level >= depth:
+            return
+        for node in sorted(nodes, key=lambda node: -node.cumulative_us):
+            if node.cumulative_us < min_us:
+                continue
+            self.stdout.write(
+                f"  {node.cumulative_us / 1000:9.1f} ms  {'  ' * level}{node.name}"
+            )
+            self._write_tree(node.children, depth, min_us, level + 1)
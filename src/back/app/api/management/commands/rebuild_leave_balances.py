@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from app.api.models import LeaveBalanceEntry
+
+
+class Command(BaseCommand):
+    help = "Recomputes the cached leave balances from the ledger and reports any drift."
+
+    def handle(self, *args, **options):
+        drift = LeaveBalanceEntry.rebuild()
+        for employee_id, stored, actual in drift:
+            self.stdout.write(f"employee {employee_id}: was {stored}, now {actual}")
+        self.stdout.write(f"Rebuilt leave balances, {len(drift)} drifted.")
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from app.api.models import LeaveRequestCounter
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the per-user leave request counters and reports any drift."
+
+    def handle(self, *args, **options):
+        drift = LeaveRequestCounter.rebuild()
+        for user_id, status, stored, actual in drift:
+            self.stdout.write(f"user {user_id}: {status} was {stored}, now {actual}")
+        self.stdout.write(f"Rebuilt leave request counters, {len(drift)} drifted.")
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from app.api.models import Employee, LeaveBalanceEntry
+
+
+class Command(BaseCommand):
+    help = "Records the yearly reset of every employee's leave balance."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--allowance",
+            type=int,
+            default=Employee._meta.get_field("leave_requests_left").get_default(),
+            help="Balance every employee starts the year with.",
+        )
+
+    def handle(self, *args, **options):
+        changed = LeaveBalanceEntry.reset(options["allowance"])
+        self.stdout.write(
+            f"Reset leave balances to {options['allowance']}, {changed} changed."
+        )
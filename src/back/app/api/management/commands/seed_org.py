@@ -0,0 +1,64 @@
+import argparse
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from app.api.seeding import seed_org
+
+
+def reference_time(value):
+    """Parses an ISO date or datetime; naive values use the current time zone."""
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None and (day := parse_date(value)) is not None:
+            parsed = datetime.datetime.combine(day, datetime.time.min)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"Invalid date or datetime: {value!r}")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a synthetic organization with supervisors, employees and "
+        "years of leave history, for load testing and benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--supervisors", type=int, default=10)
+        parser.add_argument("--employees-per-supervisor", type=int, default=20)
+        parser.add_argument("--years", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--password", default="password", help="Password of every created user."
+        )
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument(
+            "--now",
+            type=reference_time,
+            help="Date or datetime the history is generated around, instead of "
+            "the current time. Pass it with --seed, into an empty database, to "
+            "get the same rows on every run.",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        created = seed_org(
+            options["supervisors"],
+            options["employees_per_supervisor"],
+            options["years"],
+            seed=options["seed"],
+            password=options["password"],
+            batch_size=options["batch_size"],
+            now=options["now"],
+        )
+        self.stdout.write(
+            f"Created {created['users']} users and {created['leave_requests']} "
+            f"leave requests in {time.perf_counter() - start:.1f} s."
+        )
@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from app.api.replicas import replicate
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the default SQLite database into every READ_REPLICAS alias, a "
+        "stand-in for replication when running with replicas locally."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            help="Keep copying every this many seconds, which also simulates "
+            "replication lag.",
+        )
+
+    def handle(self, *args, **options):
+        aliases = settings.READ_REPLICAS["ALIASES"]
+        if not aliases:
+            raise CommandError("No READ_REPLICAS are configured.")
+        while True:
+            for alias in aliases:
+                replicate(alias)
+            self.stdout.write(f"Copied the primary to {', '.join(aliases)}.")
+            if options["interval"] is None:
+                return
+            time.sleep(options["interval"])
@@ -0,0 +1,173 @@
+"""
+Per-endpoint request metrics in Prometheus text format.
+
+Each thread aggregates into its own table, so recording a request takes no
+lock and allocates nothing once the endpoint has been seen. Tables are summed
+when metrics are scraped. With several worker processes, set
+REQUEST_METRICS["MULTIPROCESS_DIR"]: every process then periodically writes
+its totals to a file there, and a scrape adds up all of them.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from functools import cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Layout of the per-endpoint row: totals, then one count per bucket plus +Inf.
+COUNT, LATENCY, QUERIES, DB_TIME, RESPONSE_BYTES = range(5)
+BUCKETS = 5
+ROW_SIZE = BUCKETS + len(LATENCY_BUCKETS) + 1
+
+
+class MetricsStore:
+    def __init__(self, multiprocess_dir=None, flush_interval=1.0):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._tables = []
+        self._tables_lock = threading.Lock()
+        self._file_name = f"{os.getpid()}-{time.time_ns()}.json"
+        self._flushed_at = time.monotonic()
+
+    def _table(self):
+        try:
+            return self._local.table
+        except AttributeError:
+            table = self._local.table = {}
+            with self._tables_lock:
+                self._tables.append(table)
+            return table
+
+    def record(self, endpoint, latency, queries, db_time, response_bytes):
+        table = self._table()
+        row = table.get(endpoint)
+        if row is None:
+            row = table[endpoint] = [0] * ROW_SIZE
+        row[COUNT] += 1
+        row[LATENCY] += latency
+        row[QUERIES] += queries
+        row[DB_TIME] += db_time
+        row[RESPONSE_BYTES] += response_bytes
+        row[BUCKETS + bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+        if (
+            self.multiprocess_dir
+            and time.monotonic() - self._flushed_at > self.flush_interval
+        ):
+            self.flush()
+
+    def snapshot(self):
+        """Totals of this process, {endpoint: row}."""
+        totals = {}
+        with self._tables_lock:
+            tables = list(self._tables)
+        for table in tables:
+            for endpoint, row in list(table.items()):
+                _add(totals, endpoint, row)
+        return totals
+
+    def flush(self):
+        self._flushed_at = time.monotonic()
+        os.makedirs(self.multiprocess_dir, exist_ok=True)
+        path = os.path.join(self.multiprocess_dir, self._file_name)
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.snapshot(), file)
+        os.replace(temp_path, path)
+
+    def collect(self):
+        """Totals of every process sharing the store."""
+        totals = self.snapshot()
+        if not self.multiprocess_dir or not os.path.isdir(self.multiprocess_dir):
+            return totals
+        for name in os.listdir(self.multiprocess_dir):
+            if name == self._file_name or not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.multiprocess_dir, name)) as file:
+                    rows = json.load(file)
+            except (OSError, ValueError):
+                continue
+            for endpoint, row in rows.items():
+                _add(totals, endpoint, row)
+        return totals
+
+
+def _add(totals, endpoint, row):
+    total = totals.setdefault(endpoint, [0] * ROW_SIZE)
+    for i, value in enumerate(row):
+        total[i] += value
+
+
+@cache
+def get_metrics_store():
+    config = getattr(settings, "REQUEST_METRICS", {})
+    return MetricsStore(
+        multiprocess_dir=config.get("MULTIPROCESS_DIR"),
+        flush_interval=config.get("FLUSH_INTERVAL", 1.0),
+    )
+
+
+@receiver(setting_changed)
+def reset_metrics_store(*, setting, **kwargs):
+    if setting == "REQUEST_METRICS":
+        get_metrics_store.cache_clear()
+
+
+def render_metrics(totals):
+    lines = []
+
+    def family(name, kind, description, column):
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} {kind}")
+        for endpoint, row in sorted(totals.items()):
+            lines.append(f'{name}{{endpoint="{endpoint}"}} {row[column]}')
+
+    family("api_requests_total", "counter", "Requests handled.", COUNT)
+    lines.append("# HELP api_request_duration_seconds Request latency.")
+    lines.append("# TYPE api_request_duration_seconds histogram")
+    for endpoint, row in sorted(totals.items()):
+        cumulative = 0
+        for i, bound in enumerate((*LATENCY_BUCKETS, "+Inf")):
+            cumulative += row[BUCKETS + i]
+            lines.append(
+                f"api_request_duration_seconds_bucket"
+                f'{{endpoint="{endpoint}",le="{bound}"}} {cumulative}'
+            )
+        lines.append(
+            f'api_request_duration_seconds_sum{{endpoint="{endpoint}"}} {row[LATENCY]}'
+        )
+        lines.append(
+            f'api_request_duration_seconds_count{{endpoint="{endpoint}"}} {row[COUNT]}'
+        )
+    family("api_db_queries_total", "counter", "SQL queries executed.", QUERIES)
+    family(
+        "api_db_duration_seconds_total",
+        "counter",
+        "Time spent executing SQL queries.",
+        DB_TIME,
+    )
+    family(
+        "api_response_bytes_total",
+        "counter",
+        "Response body bytes, excluding streaming responses.",
+        RESPONSE_BYTES,
+    )
+    return "\n".join(lines) + "\n"
+
+
+def metrics_view(request):
+    return HttpResponse(
+        render_metrics(get_metrics_store().collect()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,264 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.db import connections
+from django.utils.module_loading import import_string
+from rest_framework.permissions import SAFE_METHODS
+
+from app.api.metrics import get_metrics_store
+from app.api.replicas import pin_to_primary
+
+
+class QueryTracker:
+    """
+    Database execute wrapper counting queries and the time spent in them, on
+    every database alias of the current thread.
+    """
+
+    __slots__ = ("queries", "duration", "connections")
+
+    def __init__(self):
+        self.queries = 0
+        self.duration = 0.0
+        self.connections = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.duration += time.perf_counter() - start
+
+    def install(self):
+        self.connections = connections.all()
+        for connection in self.connections:
+            connection.execute_wrappers.append(self)
+
+    def uninstall(self):
+        for connection in self.connections:
+            connection.execute_wrappers.remove(self)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records latency, SQL query count and time, and response size per resolved
+    URL name into the metrics store served at /metrics. Should be the first
+    middleware so the latency covers the whole stack.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tracker = QueryTracker()
+        start = time.perf_counter()
+        tracker.install()
+        try:
+            response = self.get_response(request)
+        finally:
+            tracker.uninstall()
+        self.record(request, response, time.perf_counter() - start, tracker)
+        return response
+
+    async def __acall__(self, request):
+        # Queries made by async views run on the request's sync thread, so the
+        # tracker is installed on that thread's connection.
+        tracker = QueryTracker()
+        start = time.perf_counter()
+        await sync_to_async(tracker.install)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(tracker.uninstall)()
+        self.record(request, response, time.perf_counter() - start, tracker)
+        return response
+
+    def record(self, request, response, latency, tracker):
+        match = request.resolver_match
+        get_metrics_store().record(
+            match.view_name if match else "unresolved",
+            latency,
+            tracker.queries,
+            tracker.duration,
+            0 if response.streaming else len(response.content),
+        )
+
+
+class MiddlewareStack(BaseHandler):
+    """
+    Chain of `middleware` around `get_response`, built the way Django builds
+    MIDDLEWARE, with the process_view(), process_template_response() and
+    process_exception() hooks collected for the caller to run.
+    """
+
+    def __init__(self, middleware, get_response, is_async):
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+
+        handler = convert_exception_to_response(get_response)
+        handler_is_async = is_async
+        for middleware_path in reversed(middleware):
+            middleware_class = import_string(middleware_path)
+            can_sync = getattr(middleware_class, "sync_capable", True)
+            can_async = getattr(middleware_class, "async_capable", False)
+            if not can_sync and not can_async:
+                raise ImproperlyConfigured(
+                    f"Middleware {middleware_path} must have at least one of "
+                    "sync_capable/async_capable set to True."
+                )
+            middleware_is_async = (
+                can_async if handler_is_async or not can_sync else False
+            )
+            try:
+                instance = middleware_class(
+                    self.adapt_method_mode(
+                        middleware_is_async, handler, handler_is_async
+                    )
+                )
+            except MiddlewareNotUsed:
+                continue
+            if hasattr(instance, "process_view"):
+                self._view_middleware.insert(
+                    0, self.adapt_method_mode(is_async, instance.process_view)
+                )
+            if hasattr(instance, "process_template_response"):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(is_async, instance.process_template_response)
+                )
+            if hasattr(instance, "process_exception"):
+                self._exception_middleware.append(
+                    self.adapt_method_mode(False, instance.process_exception)
+                )
+            handler = convert_exception_to_response(instance)
+            handler_is_async = middleware_is_async
+        self._middleware_chain = self.adapt_method_mode(
+            is_async, handler, handler_is_async
+        )
+
+
+class PathRoutedMiddleware:
+    """
+    Runs FULL_STACK_MIDDLEWARE (sessions, CSRF, authentication, messages,
+    clickjacking) for every request except those under LEAN_PATH_PREFIXES or
+    at one of LEAN_PATHS, which go straight to the view. Must be the last
+    entry of MIDDLEWARE: the hooks of the full stack then run exactly as if it
+    were listed there.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lean_prefixes = tuple(settings.LEAN_PATH_PREFIXES)
+        self.lean_paths = frozenset(settings.LEAN_PATHS)
+        is_async = iscoroutinefunction(get_response)
+        self.stack = MiddlewareStack(
+            settings.FULL_STACK_MIDDLEWARE, get_response, is_async
+        )
+        if is_async:
+            markcoroutinefunction(self)
+            self.process_view = self._aprocess_view
+            self.process_template_response = self._aprocess_template_response
+
+    def is_lean(self, request):
+        path = request.path_info
+        return path in self.lean_paths or path.startswith(self.lean_prefixes)
+
+    def __call__(self, request):
+        if self.is_lean(request):
+            return self.get_response(request)
+        return self.stack._middleware_chain(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_lean(request):
+            return None
+        for hook in self.stack._view_middleware:
+            response = hook(request, view_func, view_args, view_kwargs)
+            if response:
+                return response
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_lean(request):
+            return None
+        for hook in self.stack._view_middleware:
+            response = await hook(request, view_func, view_args, view_kwargs)
+            if response:
+                return response
+
+    def process_template_response(self, request, response):
+        if not self.is_lean(request):
+            for hook in self.stack._template_response_middleware:
+                response = hook(request, response)
+        return response
+
+    async def _aprocess_template_response(self, request, response):
+        if not self.is_lean(request):
+            for hook in self.stack._template_response_middleware:
+                response = await hook(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if self.is_lean(request):
+            return None
+        for hook in self.stack._exception_middleware:
+            response = hook(request, exception)
+            if response:
+                return response
+
+
+class PrimaryPinningMiddleware:
+    """
+    Pins the user of a successful unsafe request to the primary database for
+    READ_REPLICAS["STICKY_SECONDS"], so views reading from a replica serve
+    them their own writes. Not used when there are no replicas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.READ_REPLICAS["ALIASES"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        user_id = self.wrote_as(request, response)
+        if user_id is not None:
+            pin_to_primary(user_id)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        user_id = self.wrote_as(request, response)
+        if user_id is not None:
+            await sync_to_async(pin_to_primary)(user_id)
+        return response
+
+    def wrote_as(self, request, response):
+        """Returns the id of the user who made a successful write, if any."""
+        if request.method in SAFE_METHODS or response.status_code >= 400:
+            return None
+        # DRF sets the user it authenticated on the underlying request too.
+        user = getattr(request, "user", None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user.pk
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0003_alter_leaverequest_end_date_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(
+                fields=["employee", "start_date", "end_date"],
+                name="leave_employee_range_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(
+                fields=["employee", "status"], name="leave_employee_status_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(
+                fields=["status", "created_at"], name="leave_status_created_idx"
+            ),
+        ),
+    ]
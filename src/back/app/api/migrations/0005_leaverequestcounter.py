@@ -0,0 +1,61 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_counters(apps, schema_editor):
+    CustomUser = apps.get_model("api", "CustomUser")
+    LeaveRequest = apps.get_model("api", "LeaveRequest")
+    LeaveRequestCounter = apps.get_model("api", "LeaveRequestCounter")
+
+    counters = {
+        user_id: LeaveRequestCounter(user_id=user_id)
+        for user_id in CustomUser.objects.filter(
+            models.Q(employee__isnull=False) | models.Q(supervisor__isnull=False)
+        ).values_list("pk", flat=True)
+    }
+    for owner in ("employee_id", "employee__assigned_supervisor_id"):
+        rows = (
+            LeaveRequest.objects.order_by()
+            .values_list(owner, "status")
+            .annotate(total=models.Count("pk"))
+        )
+        for user_id, status, total in rows:
+            if user_id is not None:
+                setattr(counters[user_id], status, total)
+    LeaveRequestCounter.objects.bulk_create(counters.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0004_leaverequest_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaveRequestCounter",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="leave_request_counter",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("pending", models.IntegerField(default=0)),
+                ("approved", models.IntegerField(default=0)),
+                ("rejected", models.IntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Leave Request Counter",
+                "verbose_name_plural": "Leave Request Counters",
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:22
+
+from django.db import migrations, models
+
+
+def create_stamps(apps, schema_editor):
+    CustomUser = apps.get_model("api", "CustomUser")
+    VersionStamp = apps.get_model("api", "VersionStamp")
+
+    user_ids = CustomUser.objects.filter(
+        models.Q(employee__isnull=False) | models.Q(supervisor__isnull=False)
+    ).values_list("pk", flat=True)
+    VersionStamp.objects.bulk_create(
+        [VersionStamp(scope="global")]
+        + [VersionStamp(scope=f"user:{user_id}") for user_id in user_ids]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_leaverequestcounter"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VersionStamp",
+            fields=[
+                (
+                    "scope",
+                    models.CharField(max_length=40, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Version Stamp",
+                "verbose_name_plural": "Version Stamps",
+            },
+        ),
+        migrations.RunPython(create_stamps, migrations.RunPython.noop),
+    ]
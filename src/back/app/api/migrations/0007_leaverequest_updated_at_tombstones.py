@@ -0,0 +1,57 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    LeaveRequest = apps.get_model("api", "LeaveRequest")
+    LeaveRequest.objects.update(updated_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_versionstamp"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaveRequestTombstone",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("leave_request_id", models.BigIntegerField()),
+                ("employee_id", models.BigIntegerField()),
+                ("supervisor_id", models.BigIntegerField(blank=True, null=True)),
+                ("deleted_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "Leave Request Tombstone",
+                "verbose_name_plural": "Leave Request Tombstones",
+            },
+        ),
+        migrations.AddField(
+            model_name="leaverequest",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(fields=["updated_at", "id"], name="leave_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="leaverequesttombstone",
+            index=models.Index(
+                fields=["deleted_at", "id"], name="tombstone_deleted_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 08:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0007_leaverequest_updated_at_tombstones"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="leaverequest",
+            name="leave_employee_status_idx",
+        ),
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(
+                fields=["employee", "status", "created_at"],
+                name="leave_employee_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(
+                fields=["status", "start_date"], name="leave_status_start_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(fields=["created_at", "id"], name="leave_created_idx"),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.2.3 on 2026-10-18 09:03
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def open_balances(apps, schema_editor):
+    Employee = apps.get_model("api", "Employee")
+    LeaveBalanceEntry = apps.get_model("api", "LeaveBalanceEntry")
+
+    LeaveBalanceEntry.objects.bulk_create(
+        (
+            LeaveBalanceEntry(employee_id=pk, kind="grant", amount=balance)
+            for pk, balance in Employee.objects.values_list("pk", "leave_requests_left")
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_leaverequest_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaveBalanceEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("grant", "Grant"),
+                            ("consumption", "Consumption"),
+                            ("reversal", "Reversal"),
+                            ("reset", "Yearly reset"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("amount", models.IntegerField()),
+                ("leave_request_id", models.BigIntegerField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_entries",
+                        to="api.employee",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Leave Balance Entry",
+                "verbose_name_plural": "Leave Balance Entries",
+                "indexes": [
+                    models.Index(fields=["employee", "id"], name="balance_employee_idx")
+                ],
+            },
+        ),
+        migrations.RunPython(open_balances, migrations.RunPython.noop),
+    ]
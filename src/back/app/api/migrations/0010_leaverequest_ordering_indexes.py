@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_leavebalanceentry"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(fields=["start_date", "id"], name="leave_start_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="leaverequest",
+            index=models.Index(fields=["end_date", "id"], name="leave_end_idx"),
+        ),
+    ]
@@ -1,9 +1,15 @@
-from django.db import models
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.forms import ValidationError
+from django.utils import timezone
 
 from app.api.managers import UserManager
 
+TEAM_AT_CAPACITY = "Too many team members are on leave at that time."
+
 
 class CustomUser(AbstractBaseUser, PermissionsMixin):
     email = models.EmailField(unique=True)
@@ -26,6 +32,19 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         ordering = ["date_joined"]
 
     def get_subclass_instance(self):
+        """
+        Returns the Employee or Supervisor row for this user, or the user itself.
+        The result is memoized on the instance, so role checks made while
+        handling a single request only resolve it once.
+        """
+        if not hasattr(self, "_subclass_instance"):
+            self._subclass_instance = self._resolve_subclass_instance()
+            self._subclass_instance._subclass_instance = self._subclass_instance
+        return self._subclass_instance
+
+    def _resolve_subclass_instance(self):
+        if isinstance(self, (Employee, Supervisor)):
+            return self
         try:
             return self.employee
         except Employee.DoesNotExist:
@@ -43,6 +62,27 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     def is_employee_or_supervisor(self):
         return self.is_employee() or self.is_supervisor()
 
+    def get_role(self):
+        if self.is_employee():
+            return "employee"
+        if self.is_supervisor():
+            return "supervisor"
+        return None
+
+    def load_deferred_fields(self):
+        """
+        Loads every deferred field in one query, for instances built from
+        partial data such as cached authentication entries.
+        """
+        deferred_fields = self.get_deferred_fields()
+        if deferred_fields:
+            self.refresh_from_db(fields=deferred_fields)
+
+    async def aload_deferred_fields(self):
+        deferred_fields = self.get_deferred_fields()
+        if deferred_fields:
+            await self.arefresh_from_db(fields=deferred_fields)
+
     def get_full_name(self):
         """
         Returns the first_name plus the last_name, with a space in between.
@@ -74,6 +114,72 @@ class Employee(CustomUser):
         verbose_name_plural = "Employees"
         ordering = ["date_joined"]
 
+    def save(self, *args, **kwargs):
+        # Reassigning an employee moves their leave requests from the previous
+        # supervisor's counter and delta sync to the new one's, in the same
+        # transaction. `_previous_supervisor_id` is set by a pre_save receiver.
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            previous_supervisor_id = getattr(self, "_previous_supervisor_id", None)
+            if previous_supervisor_id != self.assigned_supervisor_id:
+                self.move_leave_request_counts(
+                    previous_supervisor_id, self.assigned_supervisor_id
+                )
+                self.resync_leave_requests(previous_supervisor_id)
+
+    def move_leave_request_counts(self, from_supervisor_id, to_supervisor_id):
+        counts = dict(
+            LeaveRequest.objects.filter(employee_id=self.pk)
+            .order_by()
+            .values_list("status")
+            .annotate(total=models.Count("pk"))
+        )
+        if counts:
+            LeaveRequestCounter.apply(
+                {
+                    from_supervisor_id: {
+                        status: -total for status, total in counts.items()
+                    },
+                    to_supervisor_id: counts,
+                }
+            )
+
+    def resync_leave_requests(self, from_supervisor_id):
+        """
+        Marks the employee's leave requests as changed, so the new supervisor's
+        delta sync picks them up, and tombstones them for the previous one.
+        """
+        now = timezone.now()
+        leave_requests = LeaveRequest.objects.filter(employee_id=self.pk)
+        pks = list(leave_requests.values_list("pk", flat=True))
+        if not pks:
+            return
+        leave_requests.update(updated_at=now)
+        if from_supervisor_id is not None:
+            LeaveRequestTombstone.objects.bulk_create(
+                LeaveRequestTombstone(
+                    leave_request_id=pk,
+                    employee_id=self.pk,
+                    supervisor_id=from_supervisor_id,
+                    deleted_at=now,
+                )
+                for pk in pks
+            )
+
+
+class LeaveRequestQuerySet(models.QuerySet):
+    def delete(self):
+        # Uncounted and tombstoned in bulk; without delete signals on
+        # LeaveRequest, the rows themselves are then removed in one DELETE.
+        with transaction.atomic():
+            LeaveRequest.record_deletions(self)
+            return super().delete()
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 
 class LeaveRequest(models.Model):
     class LeaveStatus(models.TextChoices):
@@ -93,29 +199,266 @@ class LeaveRequest(models.Model):
         default=LeaveStatus.PENDING,
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Set on every change, including the guarded UPDATEs below, which bypass
+    # auto_now. Drives the delta-sync endpoint.
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = LeaveRequestQuerySet.as_manager()
 
     def approve_leave(self):
-        if self.employee.leave_requests_left > 0:
-            self.employee.leave_requests_left -= 1
-            self.employee.save()
-            self.status = self.LeaveStatus.APPROVED
-            self.save()
-        else:
-            raise ValidationError("No leave requests left.")
+        """
+        Moves a pending request to approved and consumes one of the employee's
+        leave requests. Both are conditional UPDATEs in a single transaction, so
+        concurrent approvals can neither double-approve a request nor drive the
+        balance below zero. Also refused when the team is at MAX_TEAM_ON_LEAVE.
+        """
+        with transaction.atomic():
+            self._transition_from_pending(self.LeaveStatus.APPROVED)
+            if settings.MAX_TEAM_ON_LEAVE is not None:
+                from app.api.overlaps import TeamLeaveCapacity
+
+                supervisor_id = self.get_supervisor_id()
+                capacity = TeamLeaveCapacity(
+                    settings.MAX_TEAM_ON_LEAVE,
+                    [supervisor_id],
+                    [(self.pk, self.start_date, self.end_date)],
+                )
+                if not capacity.allows(
+                    supervisor_id, self.employee_id, self.start_date, self.end_date
+                ):
+                    raise ValidationError(TEAM_AT_CAPACITY)
+            consumed = LeaveBalanceEntry.record(
+                self.employee_id,
+                LeaveBalanceEntry.Kind.CONSUMPTION,
+                -1,
+                leave_request_id=self.pk,
+            )
+            if not consumed:
+                raise ValidationError("No leave requests left.")
+
+        self.status = self.LeaveStatus.APPROVED
+        if LeaveRequest.employee.is_cached(self):
+            self.employee.refresh_from_db(fields=["leave_requests_left"])
 
     def reject_leave(self):
+        with transaction.atomic():
+            self._transition_from_pending(self.LeaveStatus.REJECTED)
         self.status = self.LeaveStatus.REJECTED
-        self.save()
+
+    def _transition_from_pending(self, new_status):
+        updated = LeaveRequest.objects.filter(
+            pk=self.pk, status=self.LeaveStatus.PENDING
+        ).update(status=new_status, updated_at=timezone.now())
+        if not updated:
+            raise ValidationError("Leave request is not pending.")
+        self.update_counters({self.LeaveStatus.PENDING: -1, new_status: 1})
+
+    def update_counters(self, changes):
+        """
+        Applies `changes` ({status: delta}) to the counters of the employee
+        and of their supervisor.
+        """
+        LeaveRequestCounter.apply(
+            {self.employee_id: changes, self.get_supervisor_id(): changes}
+        )
+
+    def get_supervisor_id(self):
+        if LeaveRequest.employee.is_cached(self):
+            return self.employee.assigned_supervisor_id
+        return (
+            Employee.objects.filter(pk=self.employee_id)
+            .values_list("assigned_supervisor_id", flat=True)
+            .first()
+        )
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        # Status changes go through approve_leave(), reject_leave() and
+        # bulk_update_status(), so only new rows are counted here.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            self.update_counters({self.status: 1})
+
+    def delete(self, *args, **kwargs):
+        # Deleting an approved request gives the leave back. Cascades and
+        # queryset deletes do not call this; they go through record_deletions().
+        with transaction.atomic():
+            if self.status == self.LeaveStatus.APPROVED:
+                LeaveBalanceEntry.record(
+                    self.employee_id,
+                    LeaveBalanceEntry.Kind.REVERSAL,
+                    1,
+                    leave_request_id=self.pk,
+                )
+            supervisor_id = self.get_supervisor_id()
+            changes = {self.status: -1}
+            LeaveRequestCounter.apply(
+                {self.employee_id: changes, supervisor_id: changes}
+            )
+            LeaveRequestTombstone.objects.create(
+                leave_request_id=self.pk,
+                employee_id=self.employee_id,
+                supervisor_id=supervisor_id,
+            )
+            return super().delete(*args, **kwargs)
+
+    @classmethod
+    def record_deletions(cls, queryset):
+        """
+        Uncounts and tombstones the leave requests of `queryset`, which are
+        about to be deleted, with one read, one counter UPDATE and one bulk
+        INSERT however many rows there are.
+        """
+        rows = list(
+            queryset.order_by().values_list(
+                "pk", "employee_id", "employee__assigned_supervisor_id", "status"
+            )
+        )
+        if not rows:
+            return
+        deltas = defaultdict(Counter)
+        for _, employee_id, supervisor_id, status in rows:
+            deltas[employee_id][status] -= 1
+            deltas[supervisor_id][status] -= 1
+        LeaveRequestCounter.apply(deltas)
+        now = timezone.now()
+        LeaveRequestTombstone.objects.bulk_create(
+            LeaveRequestTombstone(
+                leave_request_id=pk,
+                employee_id=employee_id,
+                supervisor_id=supervisor_id,
+                deleted_at=now,
+            )
+            for pk, employee_id, supervisor_id, _ in rows
+        )
+
+    @classmethod
+    def bulk_update_status(cls, decisions, queryset=None):
+        """
+        Applies a list of (leave request id, new status) decisions in one
+        transaction and returns one result dict per decision, in order.
+
+        Requests outside `queryset`, requests that are no longer pending and
+        approvals beyond the employee's remaining balance or the team's
+        MAX_TEAM_ON_LEAVE fail individually without affecting the rest of the
+        batch.
+        """
+        if queryset is None:
+            queryset = cls.objects.all()
+
+        results = []
+        approvals = {}  # employee id -> approved leave request ids
+        rejections = []
+
+        with transaction.atomic():
+            rows = (
+                queryset.filter(pk__in=[pk for pk, _ in decisions])
+                .select_for_update()
+                .values_list("pk", "employee_id", "status", "start_date", "end_date")
+            )
+            leave_requests = {pk: row for pk, *row in rows}
+            employees = Employee.objects.filter(
+                pk__in={employee_id for employee_id, *_ in leave_requests.values()}
+            ).select_for_update()
+            balances = {}
+            supervisor_ids = {}
+            for pk, balance, supervisor_id in employees.values_list(
+                "pk", "leave_requests_left", "assigned_supervisor_id"
+            ):
+                balances[pk] = balance
+                supervisor_ids[pk] = supervisor_id
+            counter_deltas = defaultdict(Counter)
+            capacity = None
+            if settings.MAX_TEAM_ON_LEAVE is not None:
+                from app.api.overlaps import TeamLeaveCapacity
+
+                capacity = TeamLeaveCapacity(
+                    settings.MAX_TEAM_ON_LEAVE,
+                    set(supervisor_ids.values()),
+                    [
+                        (pk, start, end)
+                        for pk, (_, status, start, end) in leave_requests.items()
+                        if status == cls.LeaveStatus.PENDING
+                    ],
+                )
+
+            decided = set()
+            for pk, new_status in decisions:
+                if pk not in leave_requests:
+                    results.append({"id": pk, "detail": "Not found."})
+                    continue
+                employee_id, current_status, start, end = leave_requests[pk]
+                if pk in decided or current_status != cls.LeaveStatus.PENDING:
+                    results.append(
+                        {"id": pk, "detail": "Leave request is not pending."}
+                    )
+                    continue
+
+                if new_status == cls.LeaveStatus.APPROVED:
+                    if balances[employee_id] <= 0:
+                        results.append({"id": pk, "detail": "No leave requests left."})
+                        continue
+                    if capacity and not capacity.allows(
+                        supervisor_ids[employee_id], employee_id, start, end
+                    ):
+                        results.append({"id": pk, "detail": TEAM_AT_CAPACITY})
+                        continue
+                    if capacity:
+                        capacity.approve(pk)
+                    balances[employee_id] -= 1
+                    approvals.setdefault(employee_id, []).append(pk)
+                elif new_status == cls.LeaveStatus.REJECTED:
+                    rejections.append(pk)
+                else:
+                    results.append({"id": pk, "detail": "Invalid status"})
+                    continue
+                decided.add(pk)
+                results.append({"id": pk, "status": new_status})
+                for owner_id in (employee_id, supervisor_ids[employee_id]):
+                    counter_deltas[owner_id][cls.LeaveStatus.PENDING] -= 1
+                    counter_deltas[owner_id][new_status] += 1
+
+            now = timezone.now()
+            if rejections:
+                cls.objects.filter(pk__in=rejections).update(
+                    status=cls.LeaveStatus.REJECTED, updated_at=now
+                )
+            if approvals:
+                cls.objects.filter(
+                    pk__in=[pk for pks in approvals.values() for pk in pks]
+                ).update(status=cls.LeaveStatus.APPROVED, updated_at=now)
+                consumed = models.Case(
+                    *(
+                        models.When(pk=employee_id, then=len(pks))
+                        for employee_id, pks in approvals.items()
+                    ),
+                    output_field=models.IntegerField(),
+                )
+                Employee.objects.filter(pk__in=approvals).update(
+                    leave_requests_left=models.F("leave_requests_left") - consumed
+                )
+                LeaveBalanceEntry.objects.bulk_create(
+                    LeaveBalanceEntry(
+                        employee_id=employee_id,
+                        kind=LeaveBalanceEntry.Kind.CONSUMPTION,
+                        amount=-1,
+                        leave_request_id=pk,
+                        created_at=now,
+                    )
+                    for employee_id, pks in approvals.items()
+                    for pk in pks
+                )
+            LeaveRequestCounter.apply(counter_deltas)
+
+        return results
 
     def clean(self):
         if self.end_date <= self.start_date:
             raise ValidationError("End date must be after start date.")
-        overlapping_requests = LeaveRequest.objects.filter(
-            employee=self.employee,
-            start_date__lte=self.end_date,
-            end_date__gte=self.start_date,
-        ).exclude(pk=self.pk)
-        if overlapping_requests.exists():
+        from app.api.overlaps import has_overlap
+
+        if has_overlap(self.employee_id, self.start_date, self.end_date, self.pk):
             raise ValidationError("Leave request overlaps with an existing request.")
 
     def __str__(self):
@@ -125,3 +468,344 @@ class LeaveRequest(models.Model):
         verbose_name = "Leave Request"
         verbose_name_plural = "Leave Requests"
         ordering = ["created_at"]
+        indexes = [
+            # Overlap checks: employee=X AND start_date <= end AND end_date >= start
+            models.Index(
+                fields=["employee", "start_date", "end_date"],
+                name="leave_employee_range_idx",
+            ),
+            # Per-employee listings filtered by status, in created_at order
+            models.Index(
+                fields=["employee", "status", "created_at"],
+                name="leave_employee_status_idx",
+            ),
+            # Superuser/admin listings filtered by status, in created_at order
+            models.Index(
+                fields=["status", "created_at"], name="leave_status_created_idx"
+            ),
+            # Listings filtered by status and date range, e.g. "pending, next
+            # 30 days": status=X AND start_date <= end
+            models.Index(
+                fields=["status", "start_date"], name="leave_status_start_idx"
+            ),
+            # Unfiltered listings, in cursor pagination order
+            models.Index(fields=["created_at", "id"], name="leave_created_idx"),
+            # Unfiltered listings with ?ordering=start_date or end_date
+            models.Index(fields=["start_date", "id"], name="leave_start_idx"),
+            models.Index(fields=["end_date", "id"], name="leave_end_idx"),
+            # Delta sync: updated_at > cursor ORDER BY updated_at, id
+            models.Index(fields=["updated_at", "id"], name="leave_updated_idx"),
+        ]
+
+
+class LeaveRequestTombstone(models.Model):
+    """
+    Records a deleted leave request so delta-sync clients can drop it. The
+    owner ids are plain columns, copied at deletion time, so tombstones
+    survive the deletion of the employee or supervisor as well.
+    """
+
+    leave_request_id = models.BigIntegerField()
+    employee_id = models.BigIntegerField()
+    supervisor_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Leave request {self.leave_request_id} deleted at {self.deleted_at}"
+
+    class Meta:
+        verbose_name = "Leave Request Tombstone"
+        verbose_name_plural = "Leave Request Tombstones"
+        indexes = [
+            models.Index(
+                fields=["deleted_at", "id"],
+                name="tombstone_deleted_idx",
+            ),
+        ]
+
+
+class LeaveBalanceEntry(models.Model):
+    """
+    Append-only ledger of an employee's leave balance. The current balance is
+    cached in Employee.leave_requests_left and updated in the same
+    transaction as each entry, so reads stay a single column; `rebuild()`
+    recomputes it from the ledger. The leave request id is a plain column, so
+    entries survive the deletion of the request.
+    """
+
+    class Kind(models.TextChoices):
+        GRANT = "grant", "Grant"
+        CONSUMPTION = "consumption", "Consumption"
+        REVERSAL = "reversal", "Reversal"
+        RESET = "reset", "Yearly reset"
+
+    employee = models.ForeignKey(
+        Employee, on_delete=models.CASCADE, related_name="balance_entries"
+    )
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    amount = models.IntegerField()
+    leave_request_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.kind} {self.amount:+d} for employee {self.employee_id}"
+
+    class Meta:
+        verbose_name = "Leave Balance Entry"
+        verbose_name_plural = "Leave Balance Entries"
+        indexes = [
+            models.Index(fields=["employee", "id"], name="balance_employee_idx"),
+        ]
+
+    @classmethod
+    def record(cls, employee_id, kind, amount, leave_request_id=None):
+        """
+        Applies `amount` to the cached balance with one conditional UPDATE and
+        appends the entry with one INSERT. Returns False, writing nothing, when
+        a debit exceeds the balance. Callers bump the version stamps.
+        """
+        with transaction.atomic():
+            employees = Employee.objects.filter(pk=employee_id)
+            if amount < 0:
+                employees = employees.filter(leave_requests_left__gte=-amount)
+            if not employees.update(
+                leave_requests_left=models.F("leave_requests_left") + amount
+            ):
+                return False
+            cls.objects.create(
+                employee_id=employee_id,
+                kind=kind,
+                amount=amount,
+                leave_request_id=leave_request_id,
+            )
+        return True
+
+    @classmethod
+    def reset(cls, allowance, employees=None):
+        """
+        Records a yearly reset bringing the balance of every employee in
+        `employees` (all by default) to `allowance`. Returns the number of
+        balances changed.
+        """
+        if employees is None:
+            employees = Employee.objects.all()
+        now = timezone.now()
+        with transaction.atomic():
+            entries = [
+                cls(
+                    employee_id=pk,
+                    kind=cls.Kind.RESET,
+                    amount=allowance - balance,
+                    created_at=now,
+                )
+                for pk, balance in employees.select_for_update().values_list(
+                    "pk", "leave_requests_left"
+                )
+                if balance != allowance
+            ]
+            cls.objects.bulk_create(entries, batch_size=1000)
+            changed = [entry.employee_id for entry in entries]
+            for start in range(0, len(changed), 1000):
+                batch = changed[start : start + 1000]
+                Employee.objects.filter(pk__in=batch).update(
+                    leave_requests_left=allowance
+                )
+                VersionStamp.bump([VersionStamp.for_user(pk) for pk in batch])
+            if changed:
+                VersionStamp.bump([VersionStamp.GLOBAL])
+        return len(changed)
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recomputes every cached balance from the ledger, stores the result and
+        returns the drift found as a list of (employee_id, stored, actual)
+        tuples. Employees without entries, e.g. inserted in bulk, get an
+        opening grant of their current balance instead.
+        """
+        with transaction.atomic():
+            totals = dict(
+                cls.objects.order_by()
+                .values_list("employee_id")
+                .annotate(total=models.Sum("amount"))
+            )
+            opening = []
+            changed = []
+            drift = []
+            for pk, stored in (
+                Employee.objects.select_for_update()
+                .order_by("pk")
+                .values_list("pk", "leave_requests_left")
+            ):
+                if pk not in totals:
+                    opening.append(
+                        cls(employee_id=pk, kind=cls.Kind.GRANT, amount=stored)
+                    )
+                elif totals[pk] != stored:
+                    drift.append((pk, stored, totals[pk]))
+                    changed.append(Employee(pk=pk, leave_requests_left=totals[pk]))
+            cls.objects.bulk_create(opening, batch_size=1000)
+            Employee.objects.bulk_update(
+                changed, ["leave_requests_left"], batch_size=1000
+            )
+            for start in range(0, len(changed), 1000):
+                VersionStamp.bump(
+                    [VersionStamp.GLOBAL]
+                    + [
+                        VersionStamp.for_user(employee.pk)
+                        for employee in changed[start : start + 1000]
+                    ]
+                )
+        return drift
+
+
+class LeaveRequestCounter(models.Model):
+    """
+    Number of leave requests per status, for every employee (their own
+    requests) and every supervisor (their team's requests). Kept up to date in
+    the same transaction as each create, delete and status change; rebuilt
+    from scratch by the `reconcile_leave_counters` command.
+    """
+
+    user = models.OneToOneField(
+        CustomUser,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="leave_request_counter",
+    )
+    pending = models.IntegerField(default=0)
+    approved = models.IntegerField(default=0)
+    rejected = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Leave Request Counter"
+        verbose_name_plural = "Leave Request Counters"
+
+    @classmethod
+    def apply(cls, deltas):
+        """
+        Applies {user_id: {status: delta}} to the counters in a single UPDATE.
+        """
+        deltas = {
+            user_id: changes
+            for user_id, changes in deltas.items()
+            if user_id is not None and any(changes.values())
+        }
+        if not deltas:
+            return
+
+        updates = {}
+        for status in LeaveRequest.LeaveStatus.values:
+            whens = [
+                models.When(user_id=user_id, then=models.F(status) + changes[status])
+                for user_id, changes in deltas.items()
+                if changes.get(status)
+            ]
+            if whens:
+                updates[status] = models.Case(*whens, default=models.F(status))
+        cls.objects.filter(user_id__in=deltas).update(**updates)
+        VersionStamp.bump(
+            [VersionStamp.GLOBAL] + [VersionStamp.for_user(pk) for pk in deltas]
+        )
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Recomputes every counter from the leave request table, stores the
+        result and returns the drift found as a list of
+        (user_id, status, stored, actual) tuples.
+        """
+        statuses = LeaveRequest.LeaveStatus.values
+        actual = {
+            user_id: dict.fromkeys(statuses, 0)
+            for user_id in CustomUser.objects.filter(
+                models.Q(employee__isnull=False) | models.Q(supervisor__isnull=False)
+            ).values_list("pk", flat=True)
+        }
+        for owner in ("employee_id", "employee__assigned_supervisor_id"):
+            rows = (
+                LeaveRequest.objects.order_by()
+                .values_list(owner, "status")
+                .annotate(total=models.Count("pk"))
+            )
+            for user_id, status, total in rows:
+                if user_id is not None:
+                    actual[user_id][status] = total
+
+        drift = []
+        with transaction.atomic():
+            stored = {
+                counter.user_id: counter for counter in cls.objects.select_for_update()
+            }
+            missing = []
+            changed = []
+            for user_id, counts in actual.items():
+                counter = stored.get(user_id) or cls(user_id=user_id)
+                counter_drift = [
+                    (user_id, status, getattr(counter, status), total)
+                    for status, total in counts.items()
+                    if getattr(counter, status) != total
+                ]
+                for _, status, _, total in counter_drift:
+                    setattr(counter, status, total)
+                if user_id not in stored:
+                    missing.append(counter)
+                elif counter_drift:
+                    changed.append(counter)
+                drift.extend(counter_drift)
+            cls.objects.bulk_create(missing)
+            cls.objects.bulk_update(changed, statuses)
+        return drift
+
+
+class VersionStamp(models.Model):
+    """
+    Monotonic version number per scope: one global scope, and one per
+    employee or supervisor covering their leave requests and profile. Bumped
+    in the same transaction as every change, and used as the ETag of the list
+    and profile endpoints.
+    """
+
+    GLOBAL = "global"
+
+    scope = models.CharField(max_length=40, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Version Stamp"
+        verbose_name_plural = "Version Stamps"
+
+    @staticmethod
+    def for_user(user_id):
+        return f"user:{user_id}"
+
+    @classmethod
+    def current(cls, scope):
+        return (
+            cls.objects.filter(scope=scope).values_list("version", flat=True).first()
+            or 0
+        )
+
+    @classmethod
+    async def acurrent(cls, scope):
+        return (
+            await cls.objects.filter(scope=scope)
+            .values_list("version", flat=True)
+            .afirst()
+            or 0
+        )
+
+    @classmethod
+    def bump(cls, scopes):
+        scopes = set(scopes)
+        updated = cls.objects.filter(scope__in=scopes).update(
+            version=models.F("version") + 1
+        )
+        if updated < len(scopes):
+            existing = set(
+                cls.objects.filter(scope__in=scopes).values_list("scope", flat=True)
+            )
+            cls.objects.bulk_create(
+                [cls(scope=scope, version=1) for scope in scopes - existing],
+                ignore_conflicts=True,
+            )
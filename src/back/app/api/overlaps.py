@@ -0,0 +1,176 @@
+"""
+Overlap detection for leave requests.
+
+Two requests overlap when each starts no later than the other ends. Rejected
+requests never block a new one. Single checks run one indexed EXISTS query;
+checking many ranges at once loads the relevant intervals once into an
+IntervalIndex and answers each range in O(log n + k). `TeamLeaveCapacity`
+does so for the MAX_TEAM_ON_LEAVE check made when approving requests.
+"""
+
+from collections import defaultdict
+
+from django.db.models import Q
+
+from app.api.models import LeaveRequest
+
+
+def active_leave_requests():
+    return LeaveRequest.objects.exclude(status=LeaveRequest.LeaveStatus.REJECTED)
+
+
+def has_overlap(employee_id, start, end, exclude_pk=None):
+    overlapping = active_leave_requests().filter(
+        employee_id=employee_id, start_date__lte=end, end_date__gte=start
+    )
+    if exclude_pk is not None:
+        overlapping = overlapping.exclude(pk=exclude_pk)
+    return overlapping.exists()
+
+
+class IntervalIndex:
+    """
+    Static interval tree over closed [start, end] intervals, laid out as an
+    implicit balanced binary tree on the intervals sorted by start. Every node
+    stores the largest end in its subtree, so whole subtrees that end before
+    a query starts are skipped.
+    """
+
+    def __init__(self, intervals):
+        """`intervals` is an iterable of (start, end, item) tuples."""
+        intervals = sorted(intervals, key=lambda interval: interval[0])
+        self._starts = [interval[0] for interval in intervals]
+        self._ends = [interval[1] for interval in intervals]
+        self._items = [interval[2] for interval in intervals]
+        self._max_ends = list(self._ends)
+        self._build(0, len(intervals))
+
+    @classmethod
+    def for_employee(cls, employee_id, exclude_pks=()):
+        return cls.from_queryset(
+            active_leave_requests()
+            .filter(employee_id=employee_id)
+            .exclude(pk__in=exclude_pks)
+        )
+
+    @classmethod
+    def for_team(cls, supervisor_id):
+        return cls.from_queryset(
+            active_leave_requests().filter(
+                employee__assigned_supervisor_id=supervisor_id
+            )
+        )
+
+    @classmethod
+    def from_queryset(cls, queryset):
+        """
+        Indexes the queryset's requests with (pk, employee_id) as the item, in
+        a single query.
+        """
+        rows = queryset.order_by().values_list(
+            "start_date", "end_date", "pk", "employee_id"
+        )
+        return cls(
+            (start, end, (pk, employee_id)) for start, end, pk, employee_id in rows
+        )
+
+    def __len__(self):
+        return len(self._items)
+
+    def overlapping(self, start, end):
+        """Returns the items of every interval overlapping [start, end]."""
+        found = []
+        self._search(0, len(self._items), start, end, found)
+        return [self._items[index] for index in found]
+
+    def overlaps(self, start, end):
+        return bool(self.overlapping(start, end))
+
+    def overlapping_many(self, ranges):
+        """Answers `overlapping()` for each (start, end) in `ranges`, in order."""
+        return [self.overlapping(start, end) for start, end in ranges]
+
+    def _build(self, lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and self._max_ends[child] > self._max_ends[mid]:
+                self._max_ends[mid] = self._max_ends[child]
+        return mid
+
+    def _search(self, lo, hi, start, end, found):
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._max_ends[mid] < start:
+                return
+            self._search(lo, mid, start, end, found)
+            if self._starts[mid] > end:
+                return
+            if self._ends[mid] >= start:
+                found.append(mid)
+            lo = mid + 1
+
+
+class TeamLeaveCapacity:
+    """
+    Refuses approvals that would put more than `limit` members of a team on
+    approved leave at the same time. `candidates` are the (pk, start, end) of
+    the requests about to be decided. Their teams' approved requests within
+    the candidates' span are loaded, with the candidates, into one
+    IntervalIndex per team in a single query, so each `allows()` is
+    O(log n + k) however many requests a batch decides.
+    """
+
+    def __init__(self, limit, supervisor_ids, candidates):
+        self.limit = limit
+        self._approved = set()
+        self._indexes = {}
+        if not candidates:
+            return
+        rows = (
+            active_leave_requests()
+            .filter(employee__assigned_supervisor_id__in=supervisor_ids)
+            .filter(
+                Q(
+                    status=LeaveRequest.LeaveStatus.APPROVED,
+                    start_date__lte=max(end for _, _, end in candidates),
+                    end_date__gte=min(start for _, start, _ in candidates),
+                )
+                | Q(pk__in=[pk for pk, _, _ in candidates])
+            )
+            .order_by()
+            .values_list(
+                "employee__assigned_supervisor_id",
+                "start_date",
+                "end_date",
+                "pk",
+                "employee_id",
+                "status",
+            )
+        )
+        intervals = defaultdict(list)
+        for supervisor_id, start, end, pk, employee_id, status in rows:
+            intervals[supervisor_id].append((start, end, (pk, employee_id)))
+            if status == LeaveRequest.LeaveStatus.APPROVED:
+                self._approved.add(pk)
+        self._indexes = {
+            supervisor_id: IntervalIndex(team_intervals)
+            for supervisor_id, team_intervals in intervals.items()
+        }
+
+    def allows(self, supervisor_id, employee_id, start, end):
+        """Whether another team member may go on leave over [start, end]."""
+        index = self._indexes.get(supervisor_id)
+        if index is None:
+            return True
+        on_leave = {
+            other_id
+            for pk, other_id in index.overlapping(start, end)
+            if pk in self._approved and other_id != employee_id
+        }
+        return len(on_leave) < self.limit
+
+    def approve(self, pk):
+        """Counts an approval made since loading, for the following checks."""
+        self._approved.add(pk)
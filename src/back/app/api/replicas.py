@@ -0,0 +1,116 @@
+"""
+Read replicas for the read-only endpoints.
+
+`ReplicaRouter` sends every write to the primary ("default"), and reads to
+the database selected with `reading_from()`, else to the primary. Views with
+`ReplicaReadMixin` select one of READ_REPLICAS["ALIASES"] once the request is
+authenticated, so authentication itself always sees fresh tokens. Users
+whose write request succeeded within the last STICKY_SECONDS are pinned to
+the primary by `PrimaryPinningMiddleware`, so they read their own writes.
+
+`replicate()` copies the primary into a replica with SQLite's backup API. It
+stands in for replication when trying this out locally with two SQLite files;
+see the sync_replicas command.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_read_database = ContextVar("read_database", default=None)
+
+
+@contextmanager
+def reading_from(alias):
+    """Routes the reads made in the block to `alias`; None means the primary."""
+    token = _read_database.set(alias)
+    try:
+        yield
+    finally:
+        _read_database.reset(token)
+
+
+def current_read_database():
+    return _read_database.get()
+
+
+def _pin_key(user_id):
+    return f"replicas:pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    config = settings.READ_REPLICAS
+    caches[config["CACHE"]].set(_pin_key(user_id), 1, config["STICKY_SECONDS"])
+
+
+def is_pinned_to_primary(user_id):
+    return caches[settings.READ_REPLICAS["CACHE"]].get(_pin_key(user_id)) is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_database.get()
+
+    def db_for_write(self, model, **hints):
+        # Also for instances that were read from a replica.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.READ_REPLICAS["ALIASES"]}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas get their schema from the primary.
+        if db in settings.READ_REPLICAS["ALIASES"]:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """
+    Serves safe requests of a DRF view from a read replica, from the end of
+    `initial()` until the response is finalized. Querysets that go through
+    `filter_queryset()` are bound to the replica, so streamed responses keep
+    reading from it after the view returns.
+    """
+
+    def get_read_database(self):
+        """Returns the replica alias to read from, or None for the primary."""
+        replicas = settings.READ_REPLICAS["ALIASES"]
+        user = self.request.user
+        if not replicas or self.request.method not in SAFE_METHODS:
+            return None
+        if user.is_authenticated and is_pinned_to_primary(user.pk):
+            return None
+        return random.choice(replicas)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._read_database_token = _read_database.set(self.get_read_database())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_read_database_token", None)
+        if token is not None:
+            _read_database.reset(token)
+            self._read_database_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        alias = _read_database.get()
+        return queryset if alias is None else queryset.using(alias)
+
+
+def replicate(target, source=DEFAULT_DB_ALIAS):
+    """Overwrites the SQLite database `target` with a copy of `source`."""
+    source_connection, target_connection = connections[source], connections[target]
+    source_connection.ensure_connection()
+    target_connection.ensure_connection()
+    source_connection.connection.backup(target_connection.connection)
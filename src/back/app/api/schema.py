@@ -0,0 +1,103 @@
+"""
+OpenAPI schema of the API, generated once instead of on every docs request.
+
+The schema is read from API_SCHEMA_FILE when set (a JSON file written by the
+`generate_api_schema` command), otherwise generated on first use and kept in
+memory. It is served with an ETag hashed from its content. Only imported when
+API_DOCS_ENABLED is true, so drf_yasg stays off the startup path otherwise.
+"""
+
+import hashlib
+import json
+from functools import cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.urls import path
+from django.utils.cache import patch_cache_control
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.renderers import SwaggerUIRenderer
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from app.api.conditional import etag_matches
+
+API_VERSION = "v1"
+API_INFO = openapi.Info(
+    title="Leave Request API",
+    default_version=API_VERSION,
+    description="API docs for Leave Request portal",
+)
+CODECS = {"json": OpenAPICodecJson, "yaml": OpenAPICodecYaml}
+
+
+def generate_schema(file_format="json"):
+    """Generates the public schema of every route and returns it encoded."""
+    generator = OpenAPISchemaGenerator(API_INFO, urlconf=settings.ROOT_URLCONF)
+    schema = generator.get_schema(request=None, public=True)
+    return CODECS[file_format](validators=[]).encode(schema)
+
+
+@cache
+def get_schema():
+    """Returns the JSON schema and its ETag."""
+    if settings.API_SCHEMA_FILE:
+        with open(settings.API_SCHEMA_FILE, "rb") as schema_file:
+            content = schema_file.read()
+        # Served as /swagger.json, which Swagger UI parses as JSON.
+        try:
+            json.loads(content)
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"API_SCHEMA_FILE {settings.API_SCHEMA_FILE!r} is not a JSON "
+                "schema; write it with generate_api_schema --format json."
+            )
+    else:
+        content = generate_schema()
+    return content, f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+@receiver(setting_changed)
+def reset_schema(*, setting, **kwargs):
+    if setting in ("API_SCHEMA_FILE", "ROOT_URLCONF"):
+        get_schema.cache_clear()
+
+
+def schema_view(request):
+    content, etag = get_schema()
+    if etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type="application/openapi+json")
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+class SwaggerUIView(APIView):
+    """
+    Swagger UI page. It loads the schema from `schema_view`, so rendering the
+    page does not generate anything.
+    """
+
+    renderer_classes = [SwaggerUIRenderer]
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    swagger_schema = None  # Not part of the schema itself.
+    # Only the title and version are read by the page template.
+    page_schema = openapi.Swagger(info=API_INFO, _prefix="/", _version=API_VERSION)
+
+    def get(self, request, *args, **kwargs):
+        return Response(self.page_schema)
+
+
+urlpatterns = [
+    path("swagger.json", schema_view, name="schema-json"),
+    path("swagger/", SwaggerUIView.as_view(), name="schema-swagger-ui"),
+]
@@ -0,0 +1,235 @@
+"""
+Generates a synthetic organization for load testing and benchmarks.
+
+Rows are written with executemany in batches, bypassing model save() and
+signals; counters, opening balances and version stamps are built once at
+the end. Given the same arguments, seed and `now`, an empty database always
+receives the same rows. Ids, and the emails and national ids derived from
+them, continue after the largest existing ids.
+"""
+
+import datetime
+import functools
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from app.api.models import (
+    CustomUser,
+    Employee,
+    LeaveBalanceEntry,
+    LeaveRequest,
+    LeaveRequestCounter,
+    Supervisor,
+    VersionStamp,
+)
+
+FIRST_NAMES = (
+    "Ali Sara Reza Maryam Hossein Zahra Mohammad Fatemeh "
+    "Amir Narges Mehdi Leila Hamid Niloofar Kian Parisa"
+).split()
+LAST_NAMES = (
+    "Ahmadi Hosseini Karimi Moradi Rahimi Jafari Rezaei "
+    "Mohammadi Sadeghi Kazemi Behnam Ebrahimi Nazari Tehrani"
+).split()
+REASONS = ("Vacation", "Sick leave", "Family matters", "Medical appointment", None)
+
+# Share of decided requests that are approved, and of requests starting in
+# the last PENDING_WINDOW that are still pending.
+APPROVAL_RATE = 0.8
+PENDING_RATE = 0.6
+PENDING_WINDOW = datetime.timedelta(days=14)
+
+USER_COLUMNS = [
+    "id",
+    "password",
+    "is_superuser",
+    "email",
+    "first_name",
+    "last_name",
+    "national_id",
+    "phone_number",
+    "date_joined",
+    "is_active",
+    "is_staff",
+]
+EMPLOYEE_COLUMNS = ["customuser_ptr", "assigned_supervisor", "leave_requests_left"]
+LEAVE_COLUMNS = [
+    "id",
+    "employee",
+    "start_date",
+    "end_date",
+    "reason",
+    "status",
+    "created_at",
+    "updated_at",
+]
+
+
+def seed_org(
+    supervisors,
+    employees_per_supervisor,
+    years,
+    seed=0,
+    password="password",
+    batch_size=10_000,
+    now=None,
+):
+    """
+    Creates `supervisors` supervisors with `employees_per_supervisor`
+    employees each, and `years` years of leave history per employee up to
+    two months ahead of `now` (the current time by default). Every user gets
+    `password`. Returns the number of users and leave requests created.
+    """
+    rng = random.Random(seed)
+    now = now or timezone.now()
+    history_start = now - datetime.timedelta(days=365 * years)
+    horizon = now + datetime.timedelta(days=60)
+    password_hash = make_password(password, salt=f"seed{seed}")
+    # Timestamps fall on whole hours, so adapted values repeat a lot.
+    adapt = functools.cache(connection.ops.adapt_datetimefield_value)
+
+    with transaction.atomic():
+        next_user_id = _next_id(CustomUser)
+        next_leave_id = _next_id(LeaveRequest)
+        user_rows, supervisor_rows, employee_rows, leave_rows = [], [], [], []
+        created = {"users": 0, "leave_requests": 0}
+
+        def flush(force=False):
+            if force or len(leave_rows) >= batch_size or len(user_rows) >= batch_size:
+                created["users"] += len(user_rows)
+                created["leave_requests"] += len(leave_rows)
+                _insert(CustomUser, USER_COLUMNS, user_rows)
+                _insert(Supervisor, ["customuser_ptr"], supervisor_rows)
+                _insert(Employee, EMPLOYEE_COLUMNS, employee_rows)
+                _insert(LeaveRequest, LEAVE_COLUMNS, leave_rows)
+                for rows in (user_rows, supervisor_rows, employee_rows, leave_rows):
+                    rows.clear()
+
+        def user_row(user_id, joined):
+            return (
+                user_id,
+                password_hash,
+                False,
+                f"user{user_id}@seed.example",
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                f"{user_id:010d}",
+                f"0912{rng.randrange(10**7):07d}",
+                adapt(joined),
+                True,
+                False,
+            )
+
+        for _ in range(supervisors):
+            supervisor_id = next_user_id
+            next_user_id += 1
+            user_rows.append(user_row(supervisor_id, history_start))
+            supervisor_rows.append((supervisor_id,))
+
+            for _ in range(employees_per_supervisor):
+                employee_id = next_user_id
+                next_user_id += 1
+                joined = history_start + datetime.timedelta(
+                    days=rng.randrange(max(365 * years // 4, 1))
+                )
+                user_rows.append(user_row(employee_id, joined))
+
+                approved_this_year = 0
+                start = joined + datetime.timedelta(days=rng.randrange(5, 40))
+                while start < horizon:
+                    leave_row, status, end = _leave_row(
+                        rng, next_leave_id, employee_id, start, now, adapt
+                    )
+                    leave_rows.append(leave_row)
+                    next_leave_id += 1
+                    if (
+                        status == LeaveRequest.LeaveStatus.APPROVED
+                        and start.year == now.year
+                    ):
+                        approved_this_year += 1
+                    start = end + datetime.timedelta(days=rng.randrange(5, 60))
+
+                employee_rows.append(
+                    (employee_id, supervisor_id, max(30 - approved_this_year, 0))
+                )
+                flush()
+        flush(force=True)
+
+        LeaveRequestCounter.rebuild()
+        LeaveBalanceEntry.rebuild()
+        VersionStamp.objects.bulk_create(
+            [VersionStamp(scope=VersionStamp.GLOBAL)]
+            + [
+                VersionStamp(scope=VersionStamp.for_user(user_id))
+                for user_id in CustomUser.objects.filter(
+                    models.Q(employee__isnull=False)
+                    | models.Q(supervisor__isnull=False)
+                ).values_list("pk", flat=True)
+            ],
+            batch_size=batch_size,
+            ignore_conflicts=True,
+        )
+
+    # Refresh the planner statistics, so queries pick the per-team and
+    # per-employee indexes instead of scanning by status.
+    if connection.vendor in ("sqlite", "postgresql"):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    return created
+
+
+def _leave_row(rng, leave_id, employee_id, start, now, adapt):
+    duration = rng.choice(
+        (
+            datetime.timedelta(hours=4),
+            datetime.timedelta(days=1),
+            datetime.timedelta(days=rng.randrange(2, 11)),
+        )
+    )
+    created_at = min(start - datetime.timedelta(days=rng.randrange(1, 30)), now)
+    if start > now - PENDING_WINDOW and rng.random() < PENDING_RATE:
+        status = LeaveRequest.LeaveStatus.PENDING
+        updated_at = created_at
+    else:
+        status = (
+            LeaveRequest.LeaveStatus.APPROVED
+            if rng.random() < APPROVAL_RATE
+            else LeaveRequest.LeaveStatus.REJECTED
+        )
+        updated_at = min(
+            created_at + datetime.timedelta(hours=rng.randrange(1, 72)), now
+        )
+    end = start + duration
+    row = (
+        leave_id,
+        employee_id,
+        adapt(start),
+        adapt(end),
+        rng.choice(REASONS),
+        status,
+        adapt(created_at),
+        adapt(updated_at),
+    )
+    return row, status, end
+
+
+def _next_id(model):
+    return (model.objects.aggregate(models.Max("pk"))["pk__max"] or 0) + 1
+
+
+def _insert(model, field_names, rows):
+    if not rows:
+        return
+    opts = model._meta
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(opts.get_field(name).column) for name in field_names)
+    placeholders = ", ".join(["%s"] * len(field_names))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {quote(opts.db_table)} ({columns}) VALUES ({placeholders})",
+            rows,
+        )
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 
 from app.api.models import Supervisor, Employee, LeaveRequest
 
@@ -80,6 +81,23 @@ class EmployeeSignupSerializer(serializers.ModelSerializer):
         return employee
 
 
+class EmployeeImportSerializer(EmployeeSignupSerializer):
+    """
+    Signup validation for bulk imports. Email and national id uniqueness is
+    checked by the importer once per batch instead of once per row.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in ("email", "national_id"):
+            fields[name].validators = [
+                validator
+                for validator in fields[name].validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        return fields
+
+
 class LeaveRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = LeaveRequest
@@ -96,8 +114,69 @@ class LeaveRequestSerializer(serializers.ModelSerializer):
         return data
 
 
+class EmployeeSummarySerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Employee
+        fields = ["id", "email", "first_name", "last_name"]
+        read_only_fields = fields
+
+
+class LeaveRequestListSerializer(serializers.ModelSerializer):
+    """
+    Read-only serializer for leave request listings. Embeds a compact summary
+    of the employee, so the queryset must select the employee in the same query.
+    """
+
+    employee_summary = EmployeeSummarySerializer(source="employee", read_only=True)
+
+    class Meta:
+        model = LeaveRequest
+        fields = [
+            "id",
+            "employee",
+            "employee_summary",
+            "start_date",
+            "end_date",
+            "reason",
+            "status",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+
 class LeaveRequestStatusUpdateSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = LeaveRequest
         fields = ["status"]
+
+
+class LeaveRequestStatusDecisionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(
+        choices=[LeaveRequest.LeaveStatus.APPROVED, LeaveRequest.LeaveStatus.REJECTED]
+    )
+
+
+class AvailabilityQuerySerializer(serializers.Serializer):
+    RESOLUTIONS = {"day": 366, "hour": 31 * 24}  # maximum number of buckets
+
+    start = serializers.DateField(required=False)
+    days = serializers.IntegerField(min_value=1, default=30)
+    resolution = serializers.ChoiceField(choices=list(RESOLUTIONS), default="day")
+
+    def validate(self, data):
+        buckets = data["days"] * (24 if data["resolution"] == "hour" else 1)
+        if buckets > self.RESOLUTIONS[data["resolution"]]:
+            raise serializers.ValidationError(
+                {"days": "Window is too large for this resolution."}
+            )
+        data["buckets"] = buckets
+        return data
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    file_format = serializers.ChoiceField(choices=["csv", "ndjson"], default="csv")
+    compress = serializers.ChoiceField(choices=["gzip"], required=False)
@@ -0,0 +1,82 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from app.api.models import (
+    CustomUser,
+    Employee,
+    LeaveBalanceEntry,
+    LeaveRequest,
+    LeaveRequestCounter,
+    Supervisor,
+    VersionStamp,
+)
+from app.api.token_cache import get_token_cache
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    get_token_cache().delete_many([instance.key])
+
+
+@receiver(post_save)
+def invalidate_user_tokens(sender, instance, created, **kwargs):
+    # Covers deactivation as well as role or supervisor changes. Connected
+    # without a sender so saves of Employee and Supervisor are caught too.
+    if created or not isinstance(instance, CustomUser):
+        return
+    keys = Token.objects.filter(user_id=instance.pk).values_list("key", flat=True)
+    get_token_cache().delete_many(list(keys))
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Supervisor)
+def create_leave_request_bookkeeping(sender, instance, created, **kwargs):
+    if created:
+        LeaveRequestCounter.objects.get_or_create(user_id=instance.pk)
+        VersionStamp.objects.get_or_create(scope=VersionStamp.for_user(instance.pk))
+
+
+@receiver(post_save, sender=Employee)
+def open_leave_balance(sender, instance, created, **kwargs):
+    if created:
+        LeaveBalanceEntry.objects.create(
+            employee_id=instance.pk,
+            kind=LeaveBalanceEntry.Kind.GRANT,
+            amount=instance.leave_requests_left,
+        )
+
+
+@receiver(pre_delete, sender=Employee)
+def uncount_cascaded_leave_requests(sender, instance, **kwargs):
+    # Sent inside the deletion's transaction, before the cascade. LeaveRequest
+    # has no delete receivers, so the cascade removes its rows in one DELETE.
+    LeaveRequest.record_deletions(LeaveRequest.objects.filter(employee_id=instance.pk))
+
+
+@receiver(pre_save, sender=Employee)
+def remember_assigned_supervisor(sender, instance, **kwargs):
+    if not instance._state.adding:
+        instance._previous_supervisor_id = (
+            Employee.objects.filter(pk=instance.pk)
+            .values_list("assigned_supervisor_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_save, sender=Supervisor)
+def bump_profile_versions(sender, instance, created, **kwargs):
+    # Profiles, and for reassigned employees the old and new supervisor's
+    # listings, may have changed.
+    if created:
+        return
+    user_ids = {
+        instance.pk,
+        getattr(instance, "assigned_supervisor_id", None),
+        getattr(instance, "_previous_supervisor_id", None),
+    }
+    VersionStamp.bump(
+        [VersionStamp.GLOBAL]
+        + [VersionStamp.for_user(pk) for pk in user_ids if pk is not None]
+    )
@@ -0,0 +1,44 @@
+"""
+Per-connection tuning of SQLite.
+
+`configure_connection` runs the SQLITE_PRAGMAS setting on every new SQLite
+connection. With WAL, readers and the single writer no longer block each
+other, and busy_timeout makes writers queue for the write lock instead of
+failing with "database is locked". The PRAGMAs run once per connection, so
+settings_production keeps connections open across requests with
+CONN_MAX_AGE.
+"""
+
+import re
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+PRAGMA_TOKEN = re.compile(r"-?\w+")
+
+
+def pragma_statements(pragmas):
+    """
+    Returns the PRAGMA statements for a {name: value} dict. busy_timeout goes
+    first, so switching the journal mode waits for other connections too.
+    """
+    statements = []
+    for name, value in sorted(
+        pragmas.items(), key=lambda item: item[0] != "busy_timeout"
+    ):
+        if not (PRAGMA_TOKEN.fullmatch(name) and PRAGMA_TOKEN.fullmatch(str(value))):
+            raise ImproperlyConfigured(f"Invalid SQLite PRAGMA {name} = {value!r}")
+        statements.append(f"PRAGMA {name} = {value}")
+    return statements
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    if connection.vendor != "sqlite":
+        return
+    # On the raw connection, so the statements are neither logged nor counted
+    # as queries.
+    for statement in pragma_statements(settings.SQLITE_PRAGMAS):
+        connection.connection.execute(statement)
@@ -0,0 +1,213 @@
+"""
+Cold-start profiling of the WSGI and ASGI entry points.
+
+`profile_startup()` runs this module as a script in a fresh interpreter with
+`-X importtime`. The child imports `app.wsgi` or `app.asgi`, serves a single
+GET request and reports when each step finished along with its peak resident
+memory. The parent builds the import tree from the importtime output. The
+module itself only imports what the child needs before the entry point, so
+the tree shows what booting the application costs.
+"""
+
+import importlib
+import importlib.util
+import io
+import os
+import resource
+import sys
+import time
+
+HANDLERS = {"wsgi": "app.wsgi", "asgi": "app.asgi"}
+IMPORTTIME_PREFIX = "import time:"
+
+
+class ImportNode:
+    """One module in the import tree. Times are in microseconds."""
+
+    def __init__(self, name, self_us, cumulative_us):
+        self.name = name
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.children = []
+
+    def walk(self):
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+def parse_importtime(output):
+    """
+    Returns the top-level ImportNodes from `-X importtime` output. Modules are
+    reported after their own imports, nested two spaces per level.
+    """
+    pending = {}  # depth -> nodes not yet attached to their importer
+    for line in output.splitlines():
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        self_us, cumulative_us, name = line[len(IMPORTTIME_PREFIX) :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        node = ImportNode(name.strip(), int(self_us), int(cumulative_us))
+        node.children = pending.pop(depth + 1, [])
+        pending.setdefault(depth, []).append(node)
+    return pending.get(0, [])
+
+
+def profile_startup(handler="wsgi", path="/", cwd=None, env=None):
+    """
+    Boots `handler` in a new process and returns a dict of the response
+    status, the seconds from launch until the interpreter started, the
+    application was loaded and the first response was served, the peak
+    resident memory in bytes at both points and the import tree.
+    """
+    import json
+    import subprocess
+
+    command = [
+        sys.executable,
+        "-X",
+        "importtime",
+        "-m",
+        __name__,
+        HANDLERS[handler],
+        path,
+    ]
+    started = time.time()
+    process = subprocess.run(command, cwd=cwd, env=env, capture_output=True, text=True)
+    if process.returncode != 0:
+        errors = [
+            line
+            for line in process.stderr.splitlines()
+            if not line.startswith(IMPORTTIME_PREFIX)
+        ]
+        raise RuntimeError("\n".join(errors[-20:]) or "startup failed")
+
+    child = json.loads(process.stdout.splitlines()[-1])
+    return {
+        "status": child["status"],
+        "interpreter": child["started"] - started,
+        "loaded": child["loaded"] - started,
+        "served": child["served"] - started,
+        "loaded_rss": child["loaded_rss"],
+        "served_rss": child["served_rss"],
+        "imports": parse_importtime(process.stderr),
+    }
+
+
+def _max_rss():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return usage if sys.platform == "darwin" else usage * 1024
+
+
+def _host():
+    from django.conf import settings
+
+    for host in settings.ALLOWED_HOSTS:
+        if not host.startswith((".", "*")):
+            return host
+    return "localhost"
+
+
+def _wsgi_request(application, path):
+    host = _host()
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "SCRIPT_NAME": "",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": host,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": host,
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    statuses = []
+    response = application(
+        environ, lambda status, headers, exc_info=None: statuses.append(status)
+    )
+    try:
+        for _ in response:
+            pass
+    finally:
+        response.close()
+    return int(statuses[0].split()[0])
+
+
+def _asgi_request(application, path):
+    import asyncio
+
+    host = _host()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", host.encode())],
+        "client": ("127.0.0.1", 0),
+        "server": (host, 80),
+    }
+    statuses = []
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        # The client stays connected until the handler is done.
+        await asyncio.Future()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    asyncio.run(application(scope, receive, send))
+    return statuses[0]
+
+
+def _timed_import_module(name, package=None):
+    # importlib.import_module() bypasses -X importtime, which would hide the
+    # apps, URLconfs and middleware Django loads by name. __import__ does not.
+    if name.startswith("."):
+        name = importlib.util.resolve_name(name, package)
+    __import__(name)
+    return sys.modules[name]
+
+
+def main(module, path):
+    started = time.time()
+    importlib.import_module = _timed_import_module
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+    application = __import__(module, fromlist=["application"]).application
+    loaded, loaded_rss = time.time(), _max_rss()
+    if module == HANDLERS["asgi"]:
+        status = _asgi_request(application, path)
+    else:
+        status = _wsgi_request(application, path)
+    result = {
+        "status": status,
+        "started": started,
+        "loaded": loaded,
+        "served": time.time(),
+        "loaded_rss": loaded_rss,
+        "served_rss": _max_rss(),
+    }
+    import json  # Only after the application has imported it.
+
+    print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,107 @@
+"""
+Delta sync for leave requests.
+
+A sync token records how far a client has read two streams: leave requests
+ordered by (updated_at, id) and tombstones ordered by (deleted_at, id). Each
+call returns the rows past both positions, so the response size follows the
+number of changes rather than the size of the history. A client that has no
+token yet receives every row and no tombstones.
+
+Tombstones are also written for the previous supervisor when an employee is
+reassigned. Tombstones of rows the user can still see are left out, so the
+employee, and a supervisor the employee was moved back to, keep the rows.
+"""
+
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+from app.api.models import LeaveRequestTombstone
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def encode_sync_token(changed, deleted):
+    """`changed` and `deleted` are (timestamp, id) positions or None."""
+    parts = []
+    for position in (changed, deleted):
+        if position is None:
+            parts.extend(["", ""])
+        else:
+            parts.extend([position[0].isoformat(), str(position[1])])
+    return base64.urlsafe_b64encode("|".join(parts).encode()).decode()
+
+
+def decode_sync_token(token):
+    try:
+        parts = base64.urlsafe_b64decode(token.encode()).decode().split("|")
+        if len(parts) != 4:
+            raise ValueError
+        positions = []
+        for timestamp, pk in (parts[:2], parts[2:]):
+            if timestamp:
+                positions.append((datetime.fromisoformat(timestamp), int(pk)))
+            else:
+                positions.append(None)
+    except ValueError:
+        raise InvalidSyncToken("Invalid sync token.")
+    return tuple(positions)
+
+
+def _after(queryset, field, position):
+    if position is None:
+        return queryset
+    timestamp, pk = position
+    return queryset.filter(
+        Q(**{f"{field}__gt": timestamp}) | Q(**{field: timestamp, "id__gt": pk})
+    )
+
+
+def leave_request_changes(queryset, tombstones, token=None, limit=500):
+    """
+    Returns (changed, deleted_ids, next_token, has_more) for the rows of
+    `queryset` and `tombstones` past `token`, at most `limit` of each.
+
+    Rows are re-sent whenever they change, so clients apply them as upserts.
+    """
+    if token:
+        changed_position, deleted_position = decode_sync_token(token)
+    else:
+        changed_position = None
+        latest = tombstones.order_by("-deleted_at", "-id").first()
+        deleted_position = latest and (latest.deleted_at, latest.pk)
+
+    changed = list(
+        _after(queryset, "updated_at", changed_position).order_by("updated_at", "id")[
+            : limit + 1
+        ]
+    )
+    deleted = list(
+        _after(tombstones, "deleted_at", deleted_position)
+        .exclude(leave_request_id__in=queryset.values("pk"))
+        .order_by("deleted_at", "id")
+        .values_list("deleted_at", "id", "leave_request_id")[: limit + 1]
+    )
+    has_more = len(changed) > limit or len(deleted) > limit
+    changed, deleted = changed[:limit], deleted[:limit]
+
+    if changed:
+        changed_position = (changed[-1].updated_at, changed[-1].pk)
+    if deleted:
+        deleted_position = deleted[-1][:2]
+    next_token = encode_sync_token(changed_position, deleted_position)
+    return changed, [row[2] for row in deleted], next_token, has_more
+
+
+def scoped_tombstones(user):
+    tombstones = LeaveRequestTombstone.objects.all()
+    if user.is_superuser:
+        return tombstones
+    elif user.is_supervisor():
+        return tombstones.filter(supervisor_id=user.pk)
+    elif user.is_employee():
+        return tombstones.filter(employee_id=user.pk)
+    return tombstones.none()
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app.api.async_views import (
+    AsyncEmployeeListView,
+    AsyncLeaveRequestListView,
+    AsyncUserProfileView,
+)
+from app.api.models import CustomUser, Employee, LeaveRequest, Supervisor
+
+
+def make_team():
+    supervisor = Supervisor.objects.create_user(
+        email="sup_async@example.com", password="pass", national_id="7171717171"
+    )
+    employee = Employee.objects.create_user(
+        email="emp_async@example.com",
+        password="pass",
+        national_id="8181818181",
+        first_name="Async",
+        last_name="Employee",
+        assigned_supervisor=supervisor,
+    )
+    for i in range(3):
+        start = timezone.now() + timezone.timedelta(days=i * 3)
+        LeaveRequest.objects.create(
+            employee=employee,
+            start_date=start,
+            end_date=start + timezone.timedelta(days=1),
+        )
+    return supervisor, employee
+
+
+def call(view_class, path, token=None, **extra):
+    if token is not None:
+        extra["HTTP_AUTHORIZATION"] = "Token " + token.key
+    request = RequestFactory().get(path, **extra)
+    return async_to_sync(view_class.as_view())(request)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "view_class, url_name, as_employee",
+    [
+        (AsyncLeaveRequestListView, "leave-request-list", False),
+        (AsyncEmployeeListView, "employee-list", False),
+        (AsyncUserProfileView, "user-profile", True),
+    ],
+)
+def test_async_views_match_sync_views(view_class, url_name, as_employee):
+    supervisor, employee = make_team()
+    token = Token.objects.create(user=employee if as_employee else supervisor)
+    path = reverse(url_name) + "?page_size=2"
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+    expected = client.get(path)
+
+    response = call(view_class, path, token)
+    assert response.status_code == 200
+    assert json.loads(response.content) == json.loads(expected.content)
+    assert response.get("ETag") == expected.get("ETag")
+
+
+@pytest.mark.django_db
+def test_async_list_answers_conditional_get_and_rejects_anonymous():
+    supervisor, _ = make_team()
+    token = Token.objects.create(user=supervisor)
+    path = reverse("leave-request-list")
+
+    etag = call(AsyncLeaveRequestListView, path, token)["ETag"]
+    response = call(AsyncLeaveRequestListView, path, token, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    request = RequestFactory().get(path)
+
+    async def anonymous():
+        return AnonymousUser()
+
+    request.auser = anonymous
+    response = async_to_sync(AsyncLeaveRequestListView.as_view())(request)
+    assert response.status_code == 401
+    assert response["WWW-Authenticate"] == "Token"
+
+
+@pytest.mark.django_db
+def test_async_employee_list_denies_employees():
+    _, employee = make_team()
+    token = Token.objects.create(user=employee)
+    response = call(AsyncEmployeeListView, reverse("employee-list"), token)
+    assert response.status_code == 403
+
+
+@pytest.mark.django_db
+def test_async_profile_denies_cached_user_without_role():
+    superuser = CustomUser.objects.create_superuser(
+        email="admin_async@example.com", password="pass", national_id="9191919191"
+    )
+    token = Token.objects.create(user=superuser)
+    # The second call authenticates from the token cache.
+    for _ in range(2):
+        response = call(AsyncUserProfileView, reverse("user-profile"), token)
+        assert response.status_code == 403
@@ -0,0 +1,173 @@
+import time
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app.api.models import CustomUser, Supervisor, Employee
+from app.api.token_cache import LRUTokenCache, TokenIdentity, get_token_cache
+
+
+@pytest.mark.django_db
+def test_role_checks_are_memoized(django_assert_num_queries):
+    Supervisor.objects.create_user(
+        email="sup_auth0@example.com", password="pass", national_id="1010101000"
+    )
+    user = CustomUser.objects.get(email="sup_auth0@example.com")
+
+    with django_assert_num_queries(2):
+        assert user.is_supervisor()
+        assert not user.is_employee()
+        assert user.is_employee_or_supervisor()
+
+
+@pytest.mark.django_db
+def test_profile_resolves_role_in_authentication_query(django_assert_num_queries):
+    supervisor = Supervisor.objects.create_user(
+        email="sup_auth1@example.com", password="pass", national_id="1010101010"
+    )
+    token = Token.objects.create(user=supervisor)
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+
+    # Authentication (with role), then the version stamp read.
+    with django_assert_num_queries(2):
+        response = client.get(reverse("user-profile"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["role"] == "supervisor"
+
+
+@pytest.mark.django_db
+def test_create_leave_request_query_count(django_assert_num_queries):
+    supervisor = Supervisor.objects.create_user(
+        email="sup_auth2@example.com", password="pass", national_id="2020202020"
+    )
+    employee = Employee.objects.create_user(
+        email="emp_auth2@example.com",
+        password="pass",
+        national_id="3030303030",
+        assigned_supervisor=supervisor,
+    )
+    token = Token.objects.create(user=employee)
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+
+    start = timezone.now()
+    data = {
+        "start_date": start.isoformat(),
+        "end_date": (start + timezone.timedelta(days=1)).isoformat(),
+    }
+    # Authentication (with role), overlap check, then savepoint, insert,
+    # counter update, version stamp bump and release.
+    with django_assert_num_queries(7):
+        response = client.post(reverse("leave-request-create"), data, format="json")
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_cached_token_authentication_skips_queries_on_hit(django_assert_num_queries):
+    supervisor = Supervisor.objects.create_user(
+        email="sup_auth3@example.com", password="pass", national_id="4040404040"
+    )
+    employee = Employee.objects.create_user(
+        email="emp_auth3@example.com",
+        password="pass",
+        national_id="5050505050",
+        assigned_supervisor=supervisor,
+    )
+    token = Token.objects.create(user=employee)
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+
+    # Authentication, version stamp, then the list itself.
+    with django_assert_num_queries(3):
+        assert client.get(reverse("leave-request-list")).status_code == 200
+    with django_assert_num_queries(2):
+        assert client.get(reverse("leave-request-list")).status_code == 200
+
+    response = client.get(reverse("user-profile"))
+    assert response.data["role"] == "employee"
+    assert response.data["email"] == "emp_auth3@example.com"
+    assert response.data["assigned_supervisor"] == supervisor.pk
+
+
+@pytest.mark.django_db
+def test_cached_token_of_user_without_role_skips_role_queries(
+    django_assert_num_queries,
+):
+    superuser = CustomUser.objects.create_superuser(
+        email="admin_auth@example.com", password="pass", national_id="7070707070"
+    )
+    token = Token.objects.create(user=superuser)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+
+    assert client.get(reverse("user-profile")).status_code == 403
+    # Version stamp and deferred fields only; no Employee/Supervisor lookups.
+    with django_assert_num_queries(2):
+        response = client.get(reverse("user-profile"))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_cached_token_is_invalidated_on_delete_and_deactivation():
+    supervisor = Supervisor.objects.create_user(
+        email="sup_auth4@example.com", password="pass", national_id="6060606060"
+    )
+    token = Token.objects.create(user=supervisor)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+    assert client.get(reverse("user-profile")).status_code == status.HTTP_200_OK
+
+    supervisor.is_active = False
+    supervisor.save()
+    assert client.get(reverse("user-profile")).status_code == 401
+
+    supervisor.is_active = True
+    supervisor.save()
+    assert client.get(reverse("user-profile")).status_code == status.HTTP_200_OK
+
+    token.delete()
+    assert client.get(reverse("user-profile")).status_code == 401
+
+
+def test_lru_token_cache_evicts_and_expires(monkeypatch):
+    token_cache = LRUTokenCache(max_size=2, ttl=10)
+    token_cache.set("a", 1)
+    token_cache.set("b", 2)
+    token_cache.get("a")
+    token_cache.set("c", 3)
+    assert token_cache.get("b") is None
+    assert token_cache.get("a") == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert token_cache.get("a") is None
+
+
+@pytest.mark.django_db
+def test_django_token_cache_backend(settings):
+    settings.TOKEN_AUTH_CACHE = {
+        "BACKEND": "app.api.token_cache.DjangoTokenCache",
+        "OPTIONS": {"alias": "default", "ttl": 60},
+    }
+    supervisor = Supervisor.objects.create_user(
+        email="sup_auth5@example.com", password="pass", national_id="7070707070"
+    )
+    token = Token.objects.create(user=supervisor)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+
+    assert client.get(reverse("employee-list")).status_code == status.HTTP_200_OK
+    key = token.key
+    identity = get_token_cache().get(key)
+    assert identity == TokenIdentity(supervisor.pk, "supervisor", None, False)
+
+    token.delete()
+    assert get_token_cache().get(key) is None
@@ -0,0 +1,84 @@
+import datetime
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.api.availability import bucket_range, occupancy
+from app.api.models import Supervisor, Employee, LeaveRequest
+
+DAY = datetime.timedelta(days=1)
+
+
+def test_bucket_range_clips_to_window():
+    origin = datetime.datetime(2025, 1, 1)
+    assert bucket_range(origin, origin + DAY, origin, DAY, 10) == (0, 0)
+    assert bucket_range(origin - 3 * DAY, origin + DAY / 2, origin, DAY, 10) == (0, 0)
+    assert bucket_range(origin + DAY / 2, origin + 20 * DAY, origin, DAY, 10) == (0, 9)
+    assert bucket_range(origin - 3 * DAY, origin, origin, DAY, 10) is None
+
+
+def test_occupancy_counts_each_owner_once_per_bucket():
+    ranges = [(1, 0, 2), (1, 2, 3), (2, 1, 1), (3, 4, 4)]
+    assert occupancy(ranges, 6) == [1, 2, 1, 1, 1, 0]
+    assert occupancy([], 3) == [0, 0, 0]
+
+
+@pytest.mark.django_db
+def test_supervisor_team_availability():
+    supervisor = Supervisor.objects.create_user(
+        email="avail_sup@example.com", password="pass", national_id="1231231231"
+    )
+    first, second = [
+        Employee.objects.create_user(
+            email=f"avail_emp{i}@example.com",
+            password="pass",
+            national_id=f"456456456{i}",
+            assigned_supervisor=supervisor,
+        )
+        for i in range(2)
+    ]
+    window_start = timezone.make_aware(datetime.datetime(2025, 3, 1))
+    LeaveRequest.objects.create(
+        employee=first,
+        start_date=window_start + DAY / 2,
+        end_date=window_start + 2 * DAY,
+        status=LeaveRequest.LeaveStatus.APPROVED,
+    )
+    LeaveRequest.objects.create(
+        employee=second,
+        start_date=window_start + DAY,
+        end_date=window_start + 3 * DAY,
+    )
+    LeaveRequest.objects.create(
+        employee=second,
+        start_date=window_start + 4 * DAY,
+        end_date=window_start + 5 * DAY,
+        status=LeaveRequest.LeaveStatus.REJECTED,
+    )
+
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+    response = client.get(
+        reverse("leave-request-availability"), {"start": "2025-03-01", "days": 5}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["team_size"] == 2
+    assert response.data["approved"] == [1, 1, 0, 0, 0]
+    assert response.data["pending"] == [0, 1, 1, 0, 0]
+    assert response.data["on_leave"] == [1, 2, 1, 0, 0]
+
+    response = client.get(
+        reverse("leave-request-availability"),
+        {"start": "2025-03-01", "days": 1, "resolution": "hour"},
+    )
+    assert response.data["buckets"] == 24
+    assert response.data["on_leave"] == [0] * 12 + [1] * 12
+
+    response = client.get(
+        reverse("leave-request-availability"), {"days": 40, "resolution": "hour"}
+    )
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,153 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.api.exports import EXPORT_COLUMNS, export_leave_requests
+from app.api.models import Employee, LeaveRequest, Supervisor
+
+
+@pytest.fixture
+def team():
+    supervisor = Supervisor.objects.create_user(
+        email="sup17@example.com", password="sup17pass", national_id="3434343434"
+    )
+    other = Supervisor.objects.create_user(
+        email="sup18@example.com", password="sup18pass", national_id="3535353535"
+    )
+    employee = Employee.objects.create_user(
+        email="emp17@example.com",
+        password="emp17pass",
+        first_name="Sara",
+        last_name="Karimi, Jr.",
+        national_id="3636363636",
+        assigned_supervisor=supervisor,
+    )
+    outsider = Employee.objects.create_user(
+        email="emp18@example.com",
+        password="emp18pass",
+        national_id="3737373737",
+        assigned_supervisor=other,
+    )
+    now = timezone.now()
+    leaves = [
+        LeaveRequest.objects.create(
+            employee=owner,
+            start_date=now + timezone.timedelta(days=days),
+            end_date=now + timezone.timedelta(days=days + 1),
+            reason='Family "matters"',
+        )
+        for owner, days in ((employee, 3), (employee, 40), (outsider, 3))
+    ]
+    return supervisor, employee, leaves
+
+
+@pytest.mark.django_db
+def test_export_streams_csv_scoped_to_team(team, django_assert_num_queries):
+    supervisor, employee, leaves = team
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+
+    response = client.get(reverse("leave-request-export"))
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv"
+    assert response["Content-Disposition"].endswith('.csv"')
+
+    # One joined query, run while the body is consumed.
+    with django_assert_num_queries(1):
+        body = b"".join(response.streaming_content).decode()
+    rows = list(csv.DictReader(io.StringIO(body)))
+    assert [int(row["id"]) for row in rows] == [leaves[0].pk, leaves[1].pk]
+    assert list(rows[0]) == [name for name, _ in EXPORT_COLUMNS]
+    assert rows[0]["employee_last_name"] == "Karimi, Jr."
+    assert rows[0]["supervisor_email"] == supervisor.email
+    assert rows[0]["reason"] == 'Family "matters"'
+    assert rows[0]["start_date"] == leaves[0].start_date.isoformat()
+
+
+@pytest.mark.django_db
+def test_export_ndjson_gzip_and_filters(team):
+    supervisor, employee, leaves = team
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+    now = timezone.now()
+
+    response = client.get(
+        reverse("leave-request-export"),
+        {
+            "file_format": "ndjson",
+            "compress": "gzip",
+            "overlaps_from": now.isoformat(),
+            "overlaps_to": (now + timezone.timedelta(days=10)).isoformat(),
+        },
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/gzip"
+    assert response["Content-Disposition"].endswith('.ndjson.gz"')
+    body = gzip.decompress(b"".join(response.streaming_content)).decode()
+    rows = [json.loads(line) for line in body.splitlines()]
+    assert [row["id"] for row in rows] == [leaves[0].pk]
+    assert rows[0]["employee_email"] == employee.email
+    assert rows[0]["status"] == LeaveRequest.LeaveStatus.PENDING
+
+    assert (
+        client.get(reverse("leave-request-export"), {"file_format": "xml"}).status_code
+        == status.HTTP_400_BAD_REQUEST
+    )
+    client.force_authenticate(user=employee)
+    assert (
+        client.get(reverse("leave-request-export")).status_code
+        == status.HTTP_403_FORBIDDEN
+    )
+
+
+@pytest.mark.django_db
+def test_export_first_chunk_is_sent_before_the_query(django_assert_num_queries):
+    chunks = export_leave_requests(LeaveRequest.objects.all(), compress=True)
+    with django_assert_num_queries(0):
+        first = next(chunks)
+    assert gzip.GzipFile(fileobj=io.BytesIO(first)).read1().startswith(b"id,")
+
+
+@pytest.mark.django_db
+def test_export_neutralizes_csv_formulas(team):
+    _, employee, leaves = team
+    LeaveRequest.objects.filter(pk=leaves[0].pk).update(reason="=HYPERLINK(1)")
+    Employee.objects.filter(pk=employee.pk).update(first_name="@SUM(A1)")
+    queryset = LeaveRequest.objects.filter(pk=leaves[0].pk)
+
+    body = b"".join(export_leave_requests(queryset)).decode()
+    [row] = csv.DictReader(io.StringIO(body))
+    assert row["reason"] == "'=HYPERLINK(1)"
+    assert row["employee_first_name"] == "'@SUM(A1)"
+    assert row["employee_last_name"] == "Karimi, Jr."
+
+    # NDJSON is not opened by spreadsheets and keeps the values as they are.
+    chunks = list(export_leave_requests(queryset, file_format="ndjson"))
+    assert all(chunks)
+    assert json.loads(b"".join(chunks))["reason"] == "=HYPERLINK(1)"
+
+
+@pytest.mark.django_db
+def test_export_leave_requests_command(team, tmp_path):
+    supervisor, employee, leaves = team
+    output = tmp_path / "export.csv.gz"
+    call_command(
+        "export_leave_requests",
+        output=output,
+        gzip=True,
+        supervisor=supervisor.email,
+        chunk_size=1,
+    )
+    rows = list(
+        csv.DictReader(io.StringIO(gzip.decompress(output.read_bytes()).decode()))
+    )
+    assert [int(row["id"]) for row in rows] == [leaves[0].pk, leaves[1].pk]
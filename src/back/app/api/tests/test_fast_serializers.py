@@ -0,0 +1,60 @@
+import pytest
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from app.api.fast_serializers import values_serializer_for
+from app.api.models import Employee, LeaveRequest, Supervisor
+from app.api.serializers import (
+    EmployeeSerializer,
+    LeaveRequestListSerializer,
+    LeaveRequestSerializer,
+    SupervisorSerializer,
+)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("time_zone", ["UTC", "Asia/Tehran"])
+def test_values_serializers_match_model_serializers(time_zone):
+    supervisor = Supervisor.objects.create_user(
+        email="sup19@example.com",
+        password="sup19pass",
+        first_name="Leila",
+        national_id="3838383838",
+        phone_number="09120000000",
+    )
+    employees = [
+        Employee.objects.create_user(
+            email="emp19@example.com",
+            password="emp19pass",
+            first_name="Reza",
+            last_name="Ahmadi",
+            national_id="3939393939",
+            assigned_supervisor=supervisor,
+        ),
+        Employee.objects.create_user(
+            email="emp20@example.com", password="emp20pass", national_id="4040404040"
+        ),
+    ]
+    now = timezone.now().replace(microsecond=123456)
+    for i, reason in enumerate(["Vacation", None, "Sick été"]):
+        LeaveRequest.objects.create(
+            employee=employees[i % 2],
+            start_date=now + timezone.timedelta(days=3 * i),
+            end_date=now + timezone.timedelta(days=3 * i + 1),
+            reason=reason,
+        )
+    LeaveRequest.objects.first().approve_leave()
+
+    renderer = JSONRenderer()
+    cases = [
+        (LeaveRequestListSerializer, LeaveRequest.objects.select_related("employee")),
+        (LeaveRequestSerializer, LeaveRequest.objects.all()),
+        (EmployeeSerializer, Employee.objects.all()),
+        (SupervisorSerializer, Supervisor.objects.all()),
+    ]
+    with timezone.override(time_zone):
+        for serializer_class, queryset in cases:
+            queryset = queryset.order_by("pk")
+            expected = renderer.render(serializer_class(queryset, many=True).data)
+            fast = values_serializer_for(serializer_class)
+            assert renderer.render(fast.serialize(fast.values(queryset))) == expected
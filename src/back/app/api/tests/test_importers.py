@@ -0,0 +1,123 @@
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.api.importers import import_employees, read_csv_rows, read_json_lines
+from app.api.models import Supervisor, Employee
+
+CSV_DATA = """email,password,first_name,last_name,national_id,phone_number,leave_requests_left
+imp1@example.com,importpass1,Imp,One,5000000001,,
+imp2@example.com,importpass2,Imp,Two,5000000002,09120000002,12
+imp1@example.com,importpass3,Imp,Dup,5000000003,,
+not-an-email,short,Imp,Bad,5000000004,,
+"""
+
+
+@pytest.mark.django_db
+def test_import_employees_from_csv():
+    supervisor = Supervisor.objects.create(
+        email="imp_sup@example.com", national_id="5000000000"
+    )
+
+    report = import_employees(
+        read_csv_rows(io.StringIO(CSV_DATA)),
+        assigned_supervisor=supervisor,
+        batch_size=2,
+        workers=1,
+    )
+
+    assert report["created"] == 2
+    assert [rejected["row"] for rejected in report["rejected"]] == [3, 4]
+    assert "email" in report["rejected"][0]["errors"]
+    assert set(report["rejected"][1]["errors"]) == {"email", "password"}
+
+    first = Employee.objects.get(email="imp1@example.com")
+    assert first.check_password("importpass1")
+    assert first.assigned_supervisor == supervisor
+    assert first.leave_requests_left == 30
+    assert first.is_employee()
+    assert Employee.objects.get(email="imp2@example.com").leave_requests_left == 12
+
+
+@pytest.mark.django_db
+def test_import_employees_hashes_in_process_pool():
+    lines = [
+        json.dumps(
+            {
+                "email": f"pool{i}@example.com",
+                "password": f"poolpass{i}",
+                "first_name": "Pool",
+                "last_name": f"Employee{i}",
+                "national_id": f"600000000{i}",
+            }
+        )
+        for i in range(3)
+    ]
+    lines.insert(1, "{not json")
+
+    report = import_employees(read_json_lines(io.StringIO("\n".join(lines))), workers=2)
+
+    assert report["created"] == 3
+    assert [rejected["row"] for rejected in report["rejected"]] == [2]
+    assert Employee.objects.get(email="pool2@example.com").check_password("poolpass2")
+
+
+@pytest.mark.django_db
+def test_import_employees_command(tmp_path):
+    source = tmp_path / "employees.csv"
+    source.write_text(CSV_DATA)
+    report_path = tmp_path / "rejected.jsonl"
+    out = io.StringIO()
+
+    call_command(
+        "import_employees",
+        str(source),
+        "--workers=1",
+        f"--report={report_path}",
+        stdout=out,
+    )
+
+    assert "Created 2 employees, rejected 2 rows." in out.getvalue()
+    assert len(report_path.read_text().splitlines()) == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "name, options, message",
+    [
+        ("employees.json", [], "Unsupported input format: 'json'"),
+        ("employees.csv", ["--workers=0"], "--workers must be at least 1."),
+    ],
+)
+def test_import_employees_command_rejects_bad_input(tmp_path, name, options, message):
+    source = tmp_path / name
+    source.write_text(CSV_DATA)
+
+    with pytest.raises(CommandError, match=message):
+        call_command("import_employees", str(source), *options)
+    assert not Employee.objects.exists()
+
+
+@pytest.mark.django_db
+def test_supervisor_imports_employees_through_api():
+    supervisor = Supervisor.objects.create_user(
+        email="imp_api_sup@example.com", password="pass", national_id="7000000000"
+    )
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+
+    upload = SimpleUploadedFile("employees.csv", CSV_DATA.encode(), "text/csv")
+    response = client.post(
+        reverse("employee-import"), {"file": upload}, format="multipart"
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["created"] == 2
+    assert len(response.data["rejected"]) == 2
+    assert Employee.objects.filter(assigned_supervisor=supervisor).count() == 2
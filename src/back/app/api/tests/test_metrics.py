@@ -0,0 +1,68 @@
+import pytest
+from django.db import connections
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.api.metrics import get_metrics_store
+from app.api.middleware import QueryTracker
+from app.api.models import Supervisor
+
+
+def metric_value(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint_reports_per_endpoint_counters():
+    supervisor = Supervisor.objects.create_user(
+        email="sup_metrics@example.com", password="pass", national_id="9191919191"
+    )
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+
+    with override_settings(REQUEST_METRICS={"MULTIPROCESS_DIR": None}):
+        for _ in range(3):
+            response = client.get(reverse("leave-request-list"))
+        body = client.get(reverse("metrics")).content.decode()
+
+    label = '{endpoint="leave-request-list"}'
+    assert metric_value(body, "api_requests_total" + label) == 3
+    assert metric_value(body, "api_db_queries_total" + label) == 6
+    assert metric_value(body, "api_response_bytes_total" + label) == 3 * len(
+        response.content
+    )
+    assert (
+        metric_value(
+            body,
+            'api_request_duration_seconds_bucket{endpoint="leave-request-list",le="+Inf"}',
+        )
+        == 3
+    )
+
+
+def test_metrics_store_merges_other_processes(tmp_path):
+    with override_settings(REQUEST_METRICS={"MULTIPROCESS_DIR": str(tmp_path)}):
+        other = get_metrics_store()
+        other.record("leave-request-list", 0.02, 2, 0.001, 100)
+        other.flush()
+        get_metrics_store.cache_clear()
+
+        store = get_metrics_store()
+        store.record("leave-request-list", 0.2, 1, 0.001, 50)
+        row = store.collect()["leave-request-list"]
+    assert row[:3] == [2, pytest.approx(0.22), 3]
+    assert row[4] == 150
+
+
+def test_query_tracker_wraps_every_database_alias():
+    tracker = QueryTracker()
+    tracker.install()
+    try:
+        assert all(tracker in c.execute_wrappers for c in connections.all())
+    finally:
+        tracker.uninstall()
+    assert not any(tracker in c.execute_wrappers for c in connections.all())
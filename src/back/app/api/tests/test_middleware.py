@@ -0,0 +1,55 @@
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import AsyncClient, Client, RequestFactory
+from django.urls import reverse
+
+from app.api.admin_apps import check_dependencies
+from app.api.middleware import PathRoutedMiddleware
+
+
+def test_api_requests_skip_the_session_stack():
+    client = Client()
+    response = client.get(reverse("leave-request-list"))
+    assert response.status_code == 401
+    assert "X-Frame-Options" not in response
+    assert "Cookie" not in response.get("Vary", "")
+
+    response = client.get(reverse("admin:login"))
+    assert response.status_code == 200
+    assert response["X-Frame-Options"] == "DENY"
+    assert "csrftoken" in response.cookies
+
+
+def test_full_stack_view_hooks_run_outside_lean_paths():
+    def view(request):
+        return HttpResponse()
+
+    middleware = PathRoutedMiddleware(view)
+    factory = RequestFactory()
+    # CsrfViewMiddleware.process_view rejects the POST without a token.
+    response = middleware.process_view(factory.post("/swagger/"), view, (), {})
+    assert response.status_code == 403
+    assert middleware.process_view(factory.post("/api/auth/"), view, (), {}) is None
+    assert middleware.process_view(factory.post("/metrics"), view, (), {}) is None
+    # LEAN_PATHS match exactly, unlike LEAN_PATH_PREFIXES.
+    response = middleware.process_view(factory.post("/metrics/x"), view, (), {})
+    assert response.status_code == 403
+
+
+def test_routed_middleware_under_asgi():
+    client = AsyncClient()
+    api = async_to_sync(client.get)(reverse("leave-request-list"))
+    admin = async_to_sync(client.get)(reverse("admin:login"))
+    assert api.status_code == 401 and "X-Frame-Options" not in api
+    assert admin.status_code == 200 and admin["X-Frame-Options"] == "DENY"
+
+
+def test_admin_middleware_is_checked_in_the_full_stack(settings):
+    assert check_dependencies() == []
+
+    settings.FULL_STACK_MIDDLEWARE = [
+        name
+        for name in settings.FULL_STACK_MIDDLEWARE
+        if name != "django.contrib.messages.middleware.MessageMiddleware"
+    ]
+    assert [error.id for error in check_dependencies()] == ["api.E002"]
@@ -1,7 +1,17 @@
+import threading
+
 import pytest
 from django.core.exceptions import ValidationError
+from django.db import OperationalError, connection
 from django.utils import timezone
-from app.api.models import Supervisor, Employee, LeaveRequest
+from app.api.models import (
+    Supervisor,
+    Employee,
+    LeaveBalanceEntry,
+    LeaveRequest,
+    LeaveRequestCounter,
+    LeaveRequestTombstone,
+)
 
 
 @pytest.mark.django_db
@@ -142,3 +152,275 @@ def test_reject_leave_sets_status():
     leave.reject_leave()
     leave.refresh_from_db()
     assert leave.status == LeaveRequest.LeaveStatus.REJECTED
+
+
+@pytest.mark.django_db
+def test_approve_leave_twice_is_rejected():
+    supervisor = Supervisor.objects.create(
+        email="sup6@example.com",
+        password="testpass123",
+        national_id="1212121212",
+    )
+    employee = Employee.objects.create(
+        email="emp6@example.com",
+        password="testpass123",
+        national_id="2323232323",
+        assigned_supervisor=supervisor,
+        leave_requests_left=5,
+    )
+    leave = LeaveRequest.objects.create(
+        employee=employee,
+        start_date=timezone.now(),
+        end_date=timezone.now() + timezone.timedelta(days=1),
+    )
+    leave.approve_leave()
+
+    stale = LeaveRequest.objects.get(pk=leave.pk)
+    stale.status = LeaveRequest.LeaveStatus.PENDING
+    with pytest.raises(ValidationError) as excinfo:
+        stale.approve_leave()
+    assert "not pending" in str(excinfo.value)
+
+    employee.refresh_from_db()
+    assert employee.leave_requests_left == 4
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_approvals_never_overdraw_balance():
+    supervisor = Supervisor.objects.create(
+        email="sup7@example.com",
+        password="testpass123",
+        national_id="3434343434",
+    )
+    employee = Employee.objects.create(
+        email="emp7@example.com",
+        password="testpass123",
+        national_id="4545454545",
+        assigned_supervisor=supervisor,
+        leave_requests_left=5,
+    )
+    now = timezone.now()
+    leaves = LeaveRequest.objects.bulk_create(
+        LeaveRequest(
+            employee=employee,
+            start_date=now + timezone.timedelta(days=2 * i),
+            end_date=now + timezone.timedelta(days=2 * i + 1),
+        )
+        for i in range(20)
+    )
+    # Every request is approved by two racing workers.
+    work = [leave.pk for leave in leaves] * 2
+    barrier = threading.Barrier(8)
+    lock = threading.Lock()
+
+    def worker():
+        barrier.wait()
+        try:
+            while True:
+                with lock:
+                    if not work:
+                        return
+                    pk = work.pop()
+                while True:
+                    try:
+                        LeaveRequest.objects.get(pk=pk).approve_leave()
+                    except ValidationError:
+                        pass
+                    except OperationalError:
+                        # SQLite table lock contention, try again.
+                        continue
+                    break
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not work
+
+    employee.refresh_from_db()
+    assert employee.leave_requests_left == 0
+    assert (
+        LeaveRequest.objects.filter(status=LeaveRequest.LeaveStatus.APPROVED).count()
+        == 5
+    )
+
+
+@pytest.mark.django_db
+def test_rebuild_counters_reports_drift():
+    supervisor = Supervisor.objects.create(
+        email="sup8@example.com", password="testpass123", national_id="5656565656"
+    )
+    employee = Employee.objects.create(
+        email="emp8@example.com",
+        password="testpass123",
+        national_id="6767676767",
+        assigned_supervisor=supervisor,
+    )
+    LeaveRequest.objects.create(
+        employee=employee,
+        start_date=timezone.now(),
+        end_date=timezone.now() + timezone.timedelta(days=1),
+    )
+    LeaveRequestCounter.objects.filter(user_id=supervisor.pk).update(pending=7)
+
+    drift = LeaveRequestCounter.rebuild()
+
+    assert drift == [(supervisor.pk, "pending", 7, 1)]
+    assert LeaveRequestCounter.objects.get(user_id=supervisor.pk).pending == 1
+    assert LeaveRequestCounter.objects.get(user_id=employee.pk).pending == 1
+
+
+@pytest.mark.django_db
+def test_reassigning_employee_moves_their_counts():
+    old, new = (
+        Supervisor.objects.create(
+            email=f"sup_move{i}@example.com",
+            password="pass",
+            national_id=f"909090909{i}",
+        )
+        for i in range(2)
+    )
+    employee = Employee.objects.create(
+        email="emp_move@example.com",
+        password="pass",
+        national_id="9292929292",
+        assigned_supervisor=old,
+    )
+    for days in (1, 5, 9):
+        LeaveRequest.objects.create(
+            employee=employee,
+            start_date=timezone.now() + timezone.timedelta(days=days),
+            end_date=timezone.now() + timezone.timedelta(days=days + 1),
+        )
+    LeaveRequest.objects.first().reject_leave()
+
+    employee.assigned_supervisor = new
+    employee.save()
+
+    def counts(user):
+        counter = LeaveRequestCounter.objects.get(user_id=user.pk)
+        return (counter.pending, counter.approved, counter.rejected)
+
+    assert counts(old) == (0, 0, 0)
+    assert counts(new) == (2, 0, 1)
+    assert counts(employee) == (2, 0, 1)
+    assert LeaveRequestCounter.rebuild() == []
+
+
+@pytest.mark.django_db
+def test_cascaded_and_queryset_deletes_are_counted_in_bulk(
+    django_assert_max_num_queries,
+):
+    supervisor = Supervisor.objects.create(
+        email="sup_del@example.com", password="pass", national_id="9494949490"
+    )
+
+    def employee_with_requests(i, count):
+        employee = Employee.objects.create(
+            email=f"emp_del{i}@example.com",
+            password="pass",
+            national_id=f"939393939{i}",
+            assigned_supervisor=supervisor,
+        )
+        LeaveRequest.objects.bulk_create(
+            LeaveRequest(
+                employee=employee,
+                start_date=timezone.now() + timezone.timedelta(days=3 * day),
+                end_date=timezone.now() + timezone.timedelta(days=3 * day + 1),
+            )
+            for day in range(count)
+        )
+        return employee
+
+    small, large, kept = (
+        employee_with_requests(i, count) for i, count in enumerate((3, 40, 5))
+    )
+    LeaveRequestCounter.rebuild()
+    pks = set(LeaveRequest.objects.filter(employee=large).values_list("pk", flat=True))
+
+    with django_assert_max_num_queries(15) as small_queries:
+        small.delete()
+    with django_assert_max_num_queries(len(small_queries)):
+        large.delete()
+    with django_assert_max_num_queries(7):
+        LeaveRequest.objects.filter(employee=kept).delete()
+
+    assert not LeaveRequest.objects.exists()
+    assert LeaveRequestCounter.objects.get(user_id=supervisor.pk).pending == 0
+    assert LeaveRequestCounter.rebuild() == []
+    assert pks <= set(
+        LeaveRequestTombstone.objects.filter(supervisor_id=supervisor.pk).values_list(
+            "leave_request_id", flat=True
+        )
+    )
+    assert LeaveRequestTombstone.objects.count() == 48
+
+
+@pytest.mark.django_db
+def test_leave_balance_ledger_tracks_every_change():
+    employee = Employee.objects.create(
+        email="emp9@example.com",
+        password="testpass123",
+        national_id="6868686868",
+        leave_requests_left=3,
+    )
+    now = timezone.now()
+    kept, deleted = (
+        LeaveRequest.objects.create(
+            employee=employee,
+            start_date=now + timezone.timedelta(days=days),
+            end_date=now + timezone.timedelta(days=days + 1),
+        )
+        for days in (1, 5)
+    )
+    kept.approve_leave()
+    deleted.approve_leave()
+    deleted_pk = deleted.pk
+    deleted.delete()
+    assert LeaveBalanceEntry.reset(10) == 1
+
+    entries = list(
+        employee.balance_entries.order_by("id").values_list(
+            "kind", "amount", "leave_request_id"
+        )
+    )
+    assert entries == [
+        ("grant", 3, None),
+        ("consumption", -1, kept.pk),
+        ("consumption", -1, deleted_pk),
+        ("reversal", 1, deleted_pk),
+        ("reset", 8, None),
+    ]
+    employee.refresh_from_db()
+    assert employee.leave_requests_left == 10 == sum(amount for _, amount, _ in entries)
+    assert not LeaveBalanceEntry.record(
+        employee.pk, LeaveBalanceEntry.Kind.CONSUMPTION, -11
+    )
+    assert employee.balance_entries.count() == 5
+
+
+@pytest.mark.django_db
+def test_rebuild_leave_balances_reports_drift():
+    employee = Employee.objects.create(
+        email="emp10@example.com", password="testpass123", national_id="6969696969"
+    )
+    Employee.objects.filter(pk=employee.pk).update(leave_requests_left=12)
+    unrecorded = Employee.objects.create(
+        email="emp11@example.com",
+        password="testpass123",
+        national_id="7070707070",
+        leave_requests_left=4,
+    )
+    unrecorded.balance_entries.all().delete()
+
+    assert LeaveBalanceEntry.rebuild() == [(employee.pk, 12, 30)]
+    employee.refresh_from_db()
+    assert employee.leave_requests_left == 30
+    # Employees without entries get an opening grant of their balance.
+    assert list(unrecorded.balance_entries.values_list("kind", "amount")) == [
+        ("grant", 4)
+    ]
+    assert LeaveBalanceEntry.rebuild() == []
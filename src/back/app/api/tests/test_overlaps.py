@@ -0,0 +1,122 @@
+import random
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from app.api.models import Supervisor, Employee, LeaveRequest
+from app.api.overlaps import IntervalIndex, has_overlap
+
+
+def test_interval_index_matches_brute_force():
+    rng = random.Random(7)
+    intervals = []
+    for item in range(300):
+        start = rng.randrange(1000)
+        intervals.append((start, start + rng.randrange(40), item))
+    index = IntervalIndex(intervals)
+
+    ranges = []
+    for _ in range(200):
+        start = rng.randrange(-50, 1050)
+        ranges.append((start, start + rng.randrange(60)))
+
+    for (start, end), found in zip(ranges, index.overlapping_many(ranges)):
+        expected = {item for s, e, item in intervals if s <= end and e >= start}
+        assert set(found) == expected
+
+
+def test_interval_index_touching_ranges_overlap():
+    index = IntervalIndex([(10, 20, "a"), (30, 40, "b")])
+    assert index.overlapping(20, 30) == ["a", "b"]
+    assert not index.overlaps(21, 29)
+    assert not IntervalIndex([]).overlaps(0, 100)
+
+
+@pytest.mark.django_db
+def test_rejected_requests_do_not_overlap():
+    supervisor = Supervisor.objects.create(
+        email="ovl_sup@example.com", national_id="8080808080"
+    )
+    employee = Employee.objects.create(
+        email="ovl_emp@example.com",
+        national_id="9090909090",
+        assigned_supervisor=supervisor,
+    )
+    now = timezone.now()
+    day = timezone.timedelta(days=1)
+    rejected = LeaveRequest.objects.create(
+        employee=employee,
+        start_date=now,
+        end_date=now + day,
+        status=LeaveRequest.LeaveStatus.REJECTED,
+    )
+    pending = LeaveRequest.objects.create(
+        employee=employee, start_date=now + 3 * day, end_date=now + 4 * day
+    )
+
+    assert not has_overlap(employee.pk, now, now + day)
+    assert has_overlap(employee.pk, now + 2 * day, now + 3 * day)
+    assert not has_overlap(employee.pk, now + 3 * day, now + 4 * day, pending.pk)
+
+    index = IntervalIndex.for_employee(employee.pk)
+    assert len(index) == 1
+    assert index.overlapping_many(
+        [(now, now + day), (now + 2 * day, now + 5 * day)]
+    ) == [[], [(pending.pk, employee.pk)]]
+
+    # The model and the view now agree that rejected requests don't block.
+    LeaveRequest(employee=employee, start_date=now, end_date=now + day).clean()
+    assert IntervalIndex.for_team(supervisor.pk).overlaps(now + 3 * day, now + 3 * day)
+    assert rejected.pk not in {pk for pk, _ in index.overlapping(now, now + 5 * day)}
+
+
+@pytest.mark.django_db
+def test_team_capacity_limits_overlapping_approvals(settings):
+    settings.MAX_TEAM_ON_LEAVE = 1
+    supervisor = Supervisor.objects.create(
+        email="cap_sup@example.com", national_id="8181818180"
+    )
+    first, second = (
+        Employee.objects.create(
+            email=f"cap_emp{i}@example.com",
+            national_id=f"919191919{i}",
+            assigned_supervisor=supervisor,
+        )
+        for i in range(2)
+    )
+    now = timezone.now()
+    day = timezone.timedelta(days=1)
+
+    def request(employee, offset):
+        return LeaveRequest.objects.create(
+            employee=employee,
+            start_date=now + offset * day,
+            end_date=now + (offset + 2) * day,
+        )
+
+    early, clash, later, own = (
+        request(first, 0),
+        request(second, 1),
+        request(second, 5),
+        request(first, 3),
+    )
+    results = LeaveRequest.bulk_update_status(
+        [(pk, "approved") for pk in (early.pk, clash.pk, later.pk, own.pk)]
+    )
+    assert [result.get("status") for result in results] == [
+        "approved",
+        None,
+        "approved",
+        None,
+    ]
+    assert results[1]["detail"] == "Too many team members are on leave at that time."
+    # `own` only overlaps `later`, of another member.
+    assert LeaveRequest.objects.get(pk=own.pk).status == "pending"
+
+    with pytest.raises(ValidationError):
+        clash.approve_leave()
+    assert LeaveRequest.objects.get(pk=clash.pk).status == "pending"
+    clash.reject_leave()
+    settings.MAX_TEAM_ON_LEAVE = None
+    own.approve_leave()
@@ -0,0 +1,103 @@
+import datetime
+
+import pytest
+from django.core.cache import caches
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from app.api.models import Employee, LeaveRequest, Supervisor
+from app.api.replicas import ReplicaRouter, replicate
+
+
+@pytest.fixture
+def replica(tmp_path, settings):
+    """A second SQLite file, registered as the only read replica."""
+    connections.settings["replica"] = {
+        **connections["default"].settings_dict,
+        "NAME": str(tmp_path / "replica.sqlite3"),
+    }
+    # Connected directly: the test case only lets the databases it was set
+    # up with connect through ensure_connection().
+    connections["replica"].connect()
+    settings.READ_REPLICAS = {**settings.READ_REPLICAS, "ALIASES": ["replica"]}
+    caches[settings.READ_REPLICAS["CACHE"]].clear()
+    yield "replica"
+    connections["replica"].close()
+    del connections["replica"]
+    del connections.settings["replica"]
+
+
+def token_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user)}")
+    return client
+
+
+def listed_reasons(client):
+    response = client.get(reverse("leave-request-list"))
+    assert response.status_code == status.HTTP_200_OK
+    return sorted(row["reason"] for row in response.data["results"])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_reads_use_replica_until_the_user_writes(replica):
+    supervisor = Supervisor.objects.create_user(
+        email="sup25@example.com", password="sup25pass", national_id="2525252525"
+    )
+    employee = Employee.objects.create_user(
+        email="emp25@example.com",
+        password="emp25pass",
+        national_id="2626262626",
+        assigned_supervisor=supervisor,
+    )
+    supervisor_client = token_client(supervisor)
+    employee_client = token_client(employee)
+    start = timezone.now() + datetime.timedelta(days=10)
+    LeaveRequest.objects.create(
+        employee=employee,
+        start_date=start,
+        end_date=start + datetime.timedelta(days=1),
+        reason="replicated",
+    )
+    replicate(replica)
+    pending = LeaveRequest.objects.create(
+        employee=employee,
+        start_date=start + datetime.timedelta(days=5),
+        end_date=start + datetime.timedelta(days=6),
+        reason="primary only",
+    )
+
+    assert listed_reasons(supervisor_client) == ["replicated"]
+    assert listed_reasons(employee_client) == ["replicated"]
+    # Streamed after the view returns, still from the replica.
+    export = supervisor_client.get(reverse("leave-request-export"))
+    assert len(b"".join(export.streaming_content).splitlines()) == 2
+    summary = employee_client.get(reverse("leave-request-summary"))
+    assert summary.data["pending"] == 1
+
+    response = supervisor_client.patch(
+        reverse("leave-request-status-update", args=[pending.pk]),
+        {"status": "approved"},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    # The supervisor now reads their own write; the employee is not pinned.
+    assert listed_reasons(supervisor_client) == ["primary only", "replicated"]
+    assert listed_reasons(employee_client) == ["replicated"]
+
+    caches["default"].clear()  # The pin expires.
+    assert listed_reasons(supervisor_client) == ["replicated"]
+    replicate(replica)
+    assert listed_reasons(employee_client) == ["primary only", "replicated"]
+
+
+def test_router_writes_to_primary_and_never_migrates_replicas(settings):
+    settings.READ_REPLICAS = {**settings.READ_REPLICAS, "ALIASES": ["replica"]}
+    router = ReplicaRouter()
+    assert router.db_for_read(LeaveRequest) is None
+    assert router.db_for_write(LeaveRequest) == "default"
+    assert router.allow_migrate("replica", "api") is False
+    assert router.allow_migrate("default", "api") is None
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from app.api.schema import get_schema
+
+
+def test_schema_is_generated_once_and_served_with_etag():
+    get_schema.cache_clear()
+    client = Client()
+    response = client.get(reverse("schema-json"))
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/openapi+json"
+    schema = json.loads(response.content)
+    assert schema["basePath"] == "/api"
+    assert "/leave-requests/" in schema["paths"]
+
+    etag = response["ETag"]
+    assert client.get(reverse("schema-json"))["ETag"] == etag
+    response = client.get(reverse("schema-json"), HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    page = client.get(reverse("schema-swagger-ui"))
+    assert page.status_code == 200
+    assert reverse("schema-json").encode() in page.content
+
+
+def test_schema_is_read_from_generated_file(tmp_path):
+    output = tmp_path / "schema.json"
+    call_command("generate_api_schema", output)
+    content = output.read_bytes()
+    assert json.loads(content)["info"]["title"] == "Leave Request API"
+
+    output.write_bytes(content.replace(b"Leave Request API", b"Static API"))
+    with override_settings(API_SCHEMA_FILE=str(output)):
+        response = Client().get(reverse("schema-json"))
+        assert json.loads(response.content)["info"]["title"] == "Static API"
+    assert b"Static API" not in get_schema()[0]
+
+
+def test_schema_file_must_be_json(tmp_path):
+    output = tmp_path / "schema.yaml"
+    call_command("generate_api_schema", output)
+    assert output.read_bytes().startswith(b"swagger:")
+
+    with override_settings(API_SCHEMA_FILE=str(output)):
+        with pytest.raises(ImproperlyConfigured, match="not a JSON schema"):
+            get_schema()
@@ -0,0 +1,79 @@
+import datetime
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from app.api.models import (
+    CustomUser,
+    Employee,
+    LeaveRequest,
+    LeaveRequestCounter,
+    Supervisor,
+)
+from app.api.overlaps import IntervalIndex, active_leave_requests
+from app.api.seeding import seed_org
+
+
+@pytest.mark.django_db
+def test_seed_org_builds_consistent_organization():
+    call_command("seed_org", supervisors=2, employees_per_supervisor=3, years=1)
+
+    assert Supervisor.objects.count() == 2
+    assert Employee.objects.filter(assigned_supervisor__isnull=False).count() == 6
+    assert LeaveRequest.objects.exists()
+    assert LeaveRequestCounter.rebuild() == []
+    assert set(LeaveRequest.objects.values_list("status", flat=True)) == set(
+        LeaveRequest.LeaveStatus.values
+    )
+    index = IntervalIndex.from_queryset(active_leave_requests())
+    for leave in active_leave_requests():
+        overlapping = [
+            item
+            for item in index.overlapping(leave.start_date, leave.end_date)
+            if item[1] == leave.employee_id
+        ]
+        assert overlapping == [(leave.pk, leave.employee_id)]
+
+
+@pytest.mark.django_db
+def test_seed_org_is_deterministic():
+    now = timezone.now()
+
+    def generate():
+        seed_org(1, 2, 1, seed=7, now=now)
+        rows = list(
+            LeaveRequest.objects.order_by("pk").values_list(
+                "status", "start_date", "end_date", "employee__first_name"
+            )
+        )
+        CustomUser.objects.all().delete()
+        return rows
+
+    assert generate() == generate()
+
+
+@pytest.mark.django_db
+def test_seed_org_command_generates_around_now():
+    def generate():
+        call_command(
+            "seed_org",
+            "--now=2024-03-01",
+            supervisors=1,
+            employees_per_supervisor=2,
+            years=1,
+            seed=3,
+        )
+        rows = list(
+            LeaveRequest.objects.order_by("pk").values_list(
+                "id", "status", "start_date", "end_date", "employee__email"
+            )
+        )
+        CustomUser.objects.all().delete()
+        return rows
+
+    rows = generate()
+    assert rows == generate()
+    now = timezone.make_aware(datetime.datetime(2024, 3, 1))
+    assert max(start for _, _, start, _, _ in rows) < now + datetime.timedelta(days=60)
+    assert min(start for _, _, start, _, _ in rows) > now - datetime.timedelta(days=365)
@@ -0,0 +1,41 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import override_settings
+
+from app.api.sqlite import pragma_statements
+
+
+def pragma(wrapper, name):
+    return wrapper.connection.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_pragmas_are_applied_to_new_connections(tmp_path):
+    wrapper = connection.copy()
+    wrapper.settings_dict["NAME"] = str(tmp_path / "db.sqlite3")
+    with override_settings(SQLITE_PRAGMAS={"journal_mode": "WAL", "mmap_size": 4096}):
+        wrapper.ensure_connection()
+    try:
+        assert pragma(wrapper, "journal_mode") == "wal"
+        assert pragma(wrapper, "mmap_size") == 4096
+    finally:
+        wrapper.close()
+
+
+@pytest.mark.django_db
+def test_default_pragmas():
+    connection.ensure_connection()
+    assert pragma(connection, "busy_timeout") == 5000
+    assert pragma(connection, "synchronous") == 1  # NORMAL
+    assert pragma(connection, "temp_store") == 2  # MEMORY
+    assert connection.transaction_mode == "IMMEDIATE"
+
+
+def test_pragma_statements_put_busy_timeout_first_and_reject_sql():
+    assert pragma_statements({"journal_mode": "WAL", "busy_timeout": 100}) == [
+        "PRAGMA busy_timeout = 100",
+        "PRAGMA journal_mode = WAL",
+    ]
+    with pytest.raises(ImproperlyConfigured):
+        pragma_statements({"cache_size": "1; DROP TABLE api_leaverequest"})
@@ -0,0 +1,67 @@
+import os
+
+from django.conf import settings
+
+from app.api.startup import parse_importtime, profile_startup
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:        10 |         10 |   _io
+import time:        20 |         30 | io
+import time:         5 |          5 |       c
+import time:         7 |         12 |     b
+import time:         3 |         15 |   a
+import time:         4 |         19 | app
+Unauthorized: /api/
+"""
+
+# Only imported by the admin, the API docs and CORS.
+OPTIONAL_MODULES = [
+    "drf_yasg",
+    "corsheaders",
+    "django.contrib.sessions",
+    "app.api.admin",
+]
+
+
+def test_parse_importtime_builds_tree():
+    roots = parse_importtime(IMPORTTIME_OUTPUT)
+    assert [node.name for node in roots] == ["io", "app"]
+    assert [node.name for node in roots[0].children] == ["_io"]
+    assert [node.name for node in roots[1].walk()] == ["app", "a", "b", "c"]
+    assert roots[1].self_us == 4
+    assert roots[1].cumulative_us == 19
+
+
+def imported_modules(result):
+    return {node.name for root in result["imports"] for node in root.walk()}
+
+
+def test_production_profile_skips_optional_apps():
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "app.settings_production",
+        "DJANGO_SECRET_KEY": "test",
+        "DJANGO_ALLOWED_HOSTS": "localhost",
+    }
+    result = profile_startup(
+        "wsgi", "/api/leave-requests/", cwd=settings.BASE_DIR, env=env
+    )
+    assert result["status"] == 401
+    assert 0 < result["interpreter"] < result["loaded"] < result["served"]
+    assert result["served_rss"] >= result["loaded_rss"] > 0
+    modules = imported_modules(result)
+    assert "app.api.views" in modules
+    for module in OPTIONAL_MODULES:
+        assert module not in modules
+
+
+def test_development_profile_loads_docs_and_admin():
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "app.settings"}
+    result = profile_startup(
+        "asgi", "/api/leave-requests/", cwd=settings.BASE_DIR, env=env
+    )
+    assert result["status"] == 401
+    modules = imported_modules(result)
+    for module in OPTIONAL_MODULES:
+        assert module in modules
@@ -0,0 +1,131 @@
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.api.models import Employee, LeaveRequest, Supervisor
+
+
+def make_team():
+    supervisor = Supervisor.objects.create_user(
+        email="sup_sync@example.com", password="pass", national_id="5151515151"
+    )
+    employee = Employee.objects.create_user(
+        email="emp_sync@example.com",
+        password="pass",
+        national_id="6161616161",
+        assigned_supervisor=supervisor,
+    )
+    return supervisor, employee
+
+
+def make_leave_request(employee, offset):
+    start = timezone.now() + timezone.timedelta(days=offset * 3)
+    return LeaveRequest.objects.create(
+        employee=employee, start_date=start, end_date=start + timezone.timedelta(days=1)
+    )
+
+
+@pytest.mark.django_db
+def test_changes_returns_only_rows_changed_since_token():
+    supervisor, employee = make_team()
+    first, second, third = (make_leave_request(employee, i) for i in range(3))
+
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+    url = reverse("leave-request-changes")
+    response = client.get(url)
+    assert response.status_code == status.HTTP_200_OK
+    assert [row["id"] for row in response.data["changed"]] == [
+        first.pk,
+        second.pk,
+        third.pk,
+    ]
+    assert response.data["deleted"] == []
+    token = response.data["next"]
+
+    response = client.get(url, {"since": token})
+    assert response.data["changed"] == []
+    assert response.data["next"] == token
+
+    second.approve_leave()
+    third_pk = third.pk
+    third.delete()
+    response = client.get(url, {"since": token})
+    assert [row["id"] for row in response.data["changed"]] == [second.pk]
+    assert response.data["changed"][0]["status"] == "approved"
+    assert response.data["deleted"] == [third_pk]
+    assert not response.data["has_more"]
+
+    response = client.get(url, {"since": response.data["next"]})
+    assert response.data["changed"] == []
+    assert response.data["deleted"] == []
+
+
+@pytest.mark.django_db
+def test_changes_pages_through_large_deltas():
+    supervisor, employee = make_team()
+    created = [make_leave_request(employee, i).pk for i in range(5)]
+
+    client = APIClient()
+    client.force_authenticate(user=employee)
+    url = reverse("leave-request-changes")
+    seen, params = [], {"page_size": 2}
+    while True:
+        response = client.get(url, params)
+        seen.extend(row["id"] for row in response.data["changed"])
+        params["since"] = response.data["next"]
+        if not response.data["has_more"]:
+            break
+    assert seen == created
+
+
+@pytest.mark.django_db
+def test_changes_rejects_invalid_token():
+    supervisor, _ = make_team()
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+    response = client.get(reverse("leave-request-changes"), {"since": "garbage"})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_changes_follow_reassigned_employees():
+    old_supervisor, employee = make_team()
+    new_supervisor = Supervisor.objects.create_user(
+        email="sup_sync2@example.com", password="pass", national_id="5252525252"
+    )
+    leaves = [make_leave_request(employee, i) for i in range(3)]
+    url = reverse("leave-request-changes")
+
+    def delta(user, token=None):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client.get(url, {"since": token} if token else {}).data
+
+    tokens = {
+        user: delta(user)["next"] for user in (old_supervisor, new_supervisor, employee)
+    }
+    employee.assigned_supervisor = new_supervisor
+    employee.save()
+
+    ids = sorted(leave.pk for leave in leaves)
+    response = delta(new_supervisor, tokens[new_supervisor])
+    assert sorted(row["id"] for row in response["changed"]) == ids
+    assert response["deleted"] == []
+    response = delta(old_supervisor, tokens[old_supervisor])
+    assert response["changed"] == []
+    assert sorted(response["deleted"]) == ids
+    # The employee still sees their requests.
+    response = delta(employee, tokens[employee])
+    assert sorted(row["id"] for row in response["changed"]) == ids
+    assert response["deleted"] == []
+
+    # Moved back, the old supervisor gets the rows again.
+    token = delta(old_supervisor, tokens[old_supervisor])["next"]
+    employee.assigned_supervisor = old_supervisor
+    employee.save()
+    response = delta(old_supervisor, token)
+    assert sorted(row["id"] for row in response["changed"]) == ids
+    assert response["deleted"] == []
@@ -1,10 +1,13 @@
 import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.utils import timezone
 
-from app.api.models import Supervisor, Employee, LeaveRequest
+from app.api.models import Supervisor, Employee, LeaveRequest, LeaveRequestCounter
 
 
 @pytest.mark.django_db
@@ -120,7 +123,7 @@ def test_supervisor_can_view_assigned_employee_requests():
     url = reverse("leave-request-list")
     response = client.get(url)
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 1
+    assert len(response.data["results"]) == 1
 
 
 @pytest.mark.django_db
@@ -218,3 +221,383 @@ def test_employee_cannot_approve_leave_request():
     response = client.put(url, {"status": "approved"}, format="json")
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_leave_request_list_query_count_is_constant(django_assert_num_queries):
+    supervisor = Supervisor.objects.create_user(
+        email="sup8@example.com", password="sup8pass", national_id="1212121212"
+    )
+    employees = [
+        Employee.objects.create_user(
+            email=f"emp8_{i}@example.com",
+            password="emppass",
+            national_id=f"343434340{i}",
+            first_name=f"Emp{i}",
+            assigned_supervisor=supervisor,
+        )
+        for i in range(3)
+    ]
+    now = timezone.now()
+    LeaveRequest.objects.bulk_create(
+        LeaveRequest(
+            employee=employees[i % 3],
+            start_date=now + timezone.timedelta(days=2 * i),
+            end_date=now + timezone.timedelta(days=2 * i + 1),
+        )
+        for i in range(12)
+    )
+
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+
+    # Version stamp, then the list itself.
+    with django_assert_num_queries(2):
+        response = client.get(reverse("leave-request-list"))
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.data["results"]) == 12
+    assert response.data["results"][0]["employee_summary"] == {
+        "id": employees[0].id,
+        "email": "emp8_0@example.com",
+        "first_name": "Emp0",
+        "last_name": "",
+    }
+
+
+@pytest.mark.django_db
+def test_leave_request_list_cursor_pagination():
+    supervisor = Supervisor.objects.create_user(
+        email="sup9@example.com", password="sup9pass", national_id="5656565656"
+    )
+    employee = Employee.objects.create_user(
+        email="emp9@example.com",
+        password="emppass",
+        national_id="7878787878",
+        assigned_supervisor=supervisor,
+    )
+    now = timezone.now()
+    leaves = LeaveRequest.objects.bulk_create(
+        LeaveRequest(
+            employee=employee,
+            start_date=now + timezone.timedelta(days=2 * i),
+            end_date=now + timezone.timedelta(days=2 * i + 1),
+        )
+        for i in range(5)
+    )
+
+    client = APIClient()
+    client.force_authenticate(user=employee)
+
+    seen = []
+    url = reverse("leave-request-list") + "?page_size=2"
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) <= 2
+        seen += [row["id"] for row in response.data["results"]]
+        url = response.data["next"]
+
+    assert seen == [leave.id for leave in leaves]
+
+
+@pytest.mark.django_db
+def test_leave_request_cursor_pagination_breaks_ordering_ties_by_id():
+    supervisor = Supervisor.objects.create_user(
+        email="sup17@example.com", password="sup17pass", national_id="1717171717"
+    )
+    employee = Employee.objects.create_user(
+        email="emp17@example.com",
+        password="emp17pass",
+        national_id="1818181817",
+        assigned_supervisor=supervisor,
+    )
+    now = timezone.now()
+    leaves = LeaveRequest.objects.bulk_create(
+        LeaveRequest(
+            employee=employee,
+            start_date=now + timezone.timedelta(days=i // 3),
+            end_date=now + timezone.timedelta(days=i // 3, hours=1),
+        )
+        for i in range(7)
+    )
+
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+
+    for ordering, expected in [
+        ("start_date", [leave.id for leave in leaves]),
+        ("-start_date", [leave.id for leave in reversed(leaves)]),
+    ]:
+        seen = []
+        url = reverse("leave-request-list") + f"?page_size=2&ordering={ordering}"
+        while url:
+            response = client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            seen += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+        assert seen == expected
+
+
+@pytest.mark.django_db
+def test_supervisor_bulk_status_update():
+    supervisor = Supervisor.objects.create_user(
+        email="sup10@example.com", password="sup10pass", national_id="1313131313"
+    )
+    other_supervisor = Supervisor.objects.create_user(
+        email="sup11@example.com", password="sup11pass", national_id="1414141414"
+    )
+    employee = Employee.objects.create_user(
+        email="emp10@example.com",
+        password="emppass",
+        national_id="1515151515",
+        assigned_supervisor=supervisor,
+        leave_requests_left=1,
+    )
+    other_employee = Employee.objects.create_user(
+        email="emp11@example.com",
+        password="emppass",
+        national_id="1616161616",
+        assigned_supervisor=other_supervisor,
+    )
+    now = timezone.now()
+
+    def leave(owner, days, **kwargs):
+        return LeaveRequest.objects.create(
+            employee=owner,
+            start_date=now + timezone.timedelta(days=days),
+            end_date=now + timezone.timedelta(days=days + 1),
+            **kwargs,
+        )
+
+    first, second, third = leave(employee, 0), leave(employee, 2), leave(employee, 4)
+    approved = leave(employee, 6, status=LeaveRequest.LeaveStatus.APPROVED)
+    foreign = leave(other_employee, 0)
+
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+
+    payload = [
+        {"id": first.pk, "status": "approved"},
+        {"id": second.pk, "status": "approved"},
+        {"id": third.pk, "status": "rejected"},
+        {"id": approved.pk, "status": "rejected"},
+        {"id": foreign.pk, "status": "approved"},
+    ]
+    response = client.post(
+        reverse("leave-request-bulk-status-update"), payload, format="json"
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == [
+        {"id": first.pk, "status": "approved"},
+        {"id": second.pk, "detail": "No leave requests left."},
+        {"id": third.pk, "status": "rejected"},
+        {"id": approved.pk, "detail": "Leave request is not pending."},
+        {"id": foreign.pk, "detail": "Not found."},
+    ]
+
+    statuses = dict(LeaveRequest.objects.values_list("pk", "status"))
+    assert statuses[first.pk] == LeaveRequest.LeaveStatus.APPROVED
+    assert statuses[second.pk] == LeaveRequest.LeaveStatus.PENDING
+    assert statuses[third.pk] == LeaveRequest.LeaveStatus.REJECTED
+    assert statuses[foreign.pk] == LeaveRequest.LeaveStatus.PENDING
+    employee.refresh_from_db()
+    assert employee.leave_requests_left == 0
+
+
+@pytest.mark.django_db
+def test_bulk_status_update_query_count_is_constant(django_assert_num_queries):
+    supervisor = Supervisor.objects.create_user(
+        email="sup12@example.com", password="sup12pass", national_id="1717171717"
+    )
+    employees = [
+        Employee.objects.create_user(
+            email=f"emp12_{i}@example.com",
+            password="emppass",
+            national_id=f"181818181{i}",
+            assigned_supervisor=supervisor,
+        )
+        for i in range(4)
+    ]
+    now = timezone.now()
+    leaves = LeaveRequest.objects.bulk_create(
+        LeaveRequest(
+            employee=employees[i % 4],
+            start_date=now + timezone.timedelta(days=2 * i),
+            end_date=now + timezone.timedelta(days=2 * i + 1),
+        )
+        for i in range(40)
+    )
+
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+
+    payload = [
+        {"id": leave.pk, "status": "approved" if (i // 4) % 2 else "rejected"}
+        for i, leave in enumerate(leaves)
+    ]
+    # Savepoint, leave requests, balances, rejections, approvals, balance
+    # update, ledger entries, counters, version stamps, release.
+    with django_assert_num_queries(10):
+        response = client.post(
+            reverse("leave-request-bulk-status-update"), payload, format="json"
+        )
+    assert response.status_code == status.HTTP_200_OK
+    assert all("status" in result for result in response.data["results"])
+    assert Employee.objects.filter(leave_requests_left=25).count() == 4
+
+
+@pytest.mark.django_db
+def test_leave_request_summary_tracks_counters():
+    supervisor = Supervisor.objects.create_user(
+        email="sup13@example.com", password="sup13pass", national_id="1919191919"
+    )
+    employee = Employee.objects.create_user(
+        email="emp13@example.com",
+        password="emppass",
+        national_id="2020202021",
+        assigned_supervisor=supervisor,
+    )
+    now = timezone.now()
+    leaves = [
+        LeaveRequest.objects.create(
+            employee=employee,
+            start_date=now + timezone.timedelta(days=2 * i),
+            end_date=now + timezone.timedelta(days=2 * i + 1),
+        )
+        for i in range(4)
+    ]
+    leaves[0].approve_leave()
+    leaves[1].reject_leave()
+    LeaveRequest.bulk_update_status([(leaves[2].pk, "approved")])
+    leaves[3].delete()
+
+    client = APIClient()
+    expected = {"pending": 0, "approved": 2, "rejected": 1}
+    for user in (employee, supervisor):
+        client.force_authenticate(user=user)
+        response = client.get(reverse("leave-request-summary"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == expected
+
+    assert LeaveRequestCounter.rebuild() == []
+
+
+@pytest.mark.django_db
+def test_leave_request_list_conditional_get(django_assert_num_queries):
+    supervisor = Supervisor.objects.create_user(
+        email="sup14@example.com", password="sup14pass", national_id="1919191919"
+    )
+    employee = Employee.objects.create_user(
+        email="emp14@example.com",
+        password="emp14pass",
+        national_id="2929292929",
+        assigned_supervisor=supervisor,
+    )
+    leave = LeaveRequest.objects.create(
+        employee=employee,
+        start_date=timezone.now(),
+        end_date=timezone.now() + timezone.timedelta(days=1),
+        reason="Trip",
+    )
+
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+    url = reverse("leave-request-list")
+    response = client.get(url)
+    etag = response["ETag"]
+    assert response.status_code == status.HTTP_200_OK
+
+    with django_assert_num_queries(1):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response["ETag"] == etag
+
+    leave.approve_leave()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+    client.force_authenticate(user=employee)
+    profile_etag = client.get(reverse("user-profile"))["ETag"]
+    response = client.get(reverse("user-profile"), HTTP_IF_NONE_MATCH=profile_etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+def test_leave_request_list_filters_and_ordering():
+    supervisor = Supervisor.objects.create_user(
+        email="sup15@example.com", password="sup15pass", national_id="3131313131"
+    )
+    employee = Employee.objects.create_user(
+        email="emp15@example.com",
+        password="emp15pass",
+        national_id="3232323232",
+        assigned_supervisor=supervisor,
+    )
+    now = timezone.now()
+    soon, later, past = (
+        LeaveRequest.objects.create(
+            employee=employee,
+            start_date=now + timezone.timedelta(days=days),
+            end_date=now + timezone.timedelta(days=days + 1),
+        )
+        for days in (5, 60, -20)
+    )
+    past.approve_leave()
+
+    client = APIClient()
+    client.force_authenticate(user=supervisor)
+    url = reverse("leave-request-list")
+
+    def ids(params):
+        response = client.get(url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return [row["id"] for row in response.data["results"]]
+
+    next_30_days = {
+        "status": "pending",
+        "overlaps_from": now.isoformat(),
+        "overlaps_to": (now + timezone.timedelta(days=30)).isoformat(),
+    }
+    assert ids(next_30_days) == [soon.pk]
+    assert ids({"status": ["pending", "approved"], "ordering": "-start_date"}) == [
+        later.pk,
+        soon.pk,
+        past.pk,
+    ]
+    assert ids({"employee": employee.pk, "status": "approved"}) == [past.pk]
+    assert ids({"created_after": (now + timezone.timedelta(days=1)).isoformat()}) == []
+    # Unknown ordering fields are ignored.
+    assert ids({"ordering": "reason"}) == [soon.pk, later.pk, past.pk]
+    assert client.get(url, {"status": "unknown"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_leave_request_list_filters_use_indexes():
+    admin = get_user_model().objects.create_superuser(
+        email="admin16@example.com", password="admin16pass", national_id="3333333330"
+    )
+    client = APIClient()
+    client.force_authenticate(user=admin)
+    now = timezone.now()
+    combinations = {
+        "": "leave_created_idx",
+        "?status=pending": "leave_status_created_idx",
+        "?status=pending&overlaps_from={}&overlaps_to={}".format(
+            now.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            (now + timezone.timedelta(days=30)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        ): "leave_status_start_idx",
+        "?ordering=-start_date&status=approved": "leave_status_start_idx",
+        "?ordering=start_date": "leave_start_idx",
+        "?ordering=-end_date": "leave_end_idx",
+    }
+    for query, index in combinations.items():
+        with CaptureQueriesContext(connection) as queries:
+            client.get(reverse("leave-request-list") + query)
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + queries[-1]["sql"])
+            plan = " ".join(row[-1] for row in cursor.fetchall())
+        assert f"api_leaverequest USING INDEX {index}" in plan, (query, plan)
+        if query.startswith("?ordering=") and "&" not in query:
+            # Pages are read in index order, without sorting the table.
+            assert "TEMP B-TREE" not in plan, (query, plan)
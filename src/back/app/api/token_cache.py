@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import cache
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+class TokenIdentity(NamedTuple):
+    user_id: int
+    role: str | None
+    supervisor_id: int | None
+    is_superuser: bool
+
+
+class LRUTokenCache:
+    """
+    In-process, thread-safe LRU cache with a per-entry time to live. Entries
+    are only invalidated in the process that handled the signal, so with
+    several workers a revoked token stays usable elsewhere for up to `ttl`
+    seconds; use DjangoTokenCache with a shared backend when that matters.
+    """
+
+    def __init__(self, max_size=10_000, ttl=300):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    async def aget(self, key):
+        return self.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def aset(self, key, value):
+        self.set(key, value)
+
+    def delete_many(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoTokenCache:
+    """
+    Stores entries in one of the configured CACHES, e.g. a local-memory or
+    file-based backend.
+    """
+
+    key_prefix = "auth-token:"
+
+    def __init__(self, alias="default", ttl=300):
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    def get(self, key):
+        value = self.cache.get(self.key_prefix + key)
+        return TokenIdentity(*value) if value is not None else None
+
+    async def aget(self, key):
+        value = await self.cache.aget(self.key_prefix + key)
+        return TokenIdentity(*value) if value is not None else None
+
+    def set(self, key, value):
+        self.cache.set(self.key_prefix + key, tuple(value), self.ttl)
+
+    async def aset(self, key, value):
+        await self.cache.aset(self.key_prefix + key, tuple(value), self.ttl)
+
+    def delete_many(self, keys):
+        self.cache.delete_many([self.key_prefix + key for key in keys])
+
+    def clear(self):
+        self.cache.clear()
+
+
+@cache
+def get_token_cache():
+    config = getattr(settings, "TOKEN_AUTH_CACHE", {})
+    backend = import_string(config.get("BACKEND", "app.api.token_cache.LRUTokenCache"))
+    return backend(**config.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def reset_token_cache(*, setting, **kwargs):
+    if setting == "TOKEN_AUTH_CACHE":
+        get_token_cache.cache_clear()
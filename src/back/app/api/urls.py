@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
 from rest_framework.authtoken.views import obtain_auth_token
@@ -5,14 +6,27 @@ from rest_framework.authtoken.views import obtain_auth_token
 from .views import (
     EmployeeSignupView,
     EmployeeListView,
+    EmployeeImportView,
     SupervisorSignupView,
     LeaveRequestListView,
+    LeaveRequestChangesView,
+    LeaveRequestExportView,
     LeaveRequestCreateView,
     LeaveRequestStatusUpdateView,
+    LeaveRequestBulkStatusUpdateView,
     LeaveRequestDeleteView,
+    LeaveRequestSummaryView,
+    LeaveRequestAvailabilityView,
     UserProfileView,
 )
 
+if settings.ASYNC_READ_VIEWS:
+    from .async_views import (
+        AsyncEmployeeListView as EmployeeListView,
+        AsyncLeaveRequestListView as LeaveRequestListView,
+        AsyncUserProfileView as UserProfileView,
+    )
+
 router = routers.DefaultRouter()
 
 
@@ -24,7 +38,28 @@ urlpatterns = [
     ),
     path("employees/", EmployeeListView.as_view(), name="employee-list"),
     path("employees/signup/", EmployeeSignupView.as_view(), name="employee-signup"),
+    path("employees/import/", EmployeeImportView.as_view(), name="employee-import"),
     path("leave-requests/", LeaveRequestListView.as_view(), name="leave-request-list"),
+    path(
+        "leave-requests/changes/",
+        LeaveRequestChangesView.as_view(),
+        name="leave-request-changes",
+    ),
+    path(
+        "leave-requests/export/",
+        LeaveRequestExportView.as_view(),
+        name="leave-request-export",
+    ),
+    path(
+        "leave-requests/summary/",
+        LeaveRequestSummaryView.as_view(),
+        name="leave-request-summary",
+    ),
+    path(
+        "leave-requests/availability/",
+        LeaveRequestAvailabilityView.as_view(),
+        name="leave-request-availability",
+    ),
     path(
         "leave-requests/create/",
         LeaveRequestCreateView.as_view(),
@@ -35,6 +70,11 @@ urlpatterns = [
         LeaveRequestStatusUpdateView.as_view(),
         name="leave-request-status-update",
     ),
+    path(
+        "leave-requests/status/",
+        LeaveRequestBulkStatusUpdateView.as_view(),
+        name="leave-request-bulk-status-update",
+    ),
     path(
         "leave-requests/<int:pk>/delete/",
         LeaveRequestDeleteView.as_view(),
@@ -1,18 +1,42 @@
+import datetime
+import io
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.db.models import Sum
+from django.http import StreamingHttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import permissions, viewsets, generics, status
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.exceptions import PermissionDenied
 
-from .models import Supervisor, Employee, LeaveRequest
+from .models import Supervisor, Employee, LeaveRequest, LeaveRequestCounter
 from .serializers import (
     EmployeeSerializer,
     EmployeeSignupSerializer,
     LeaveRequestSerializer,
+    LeaveRequestListSerializer,
     SupervisorSerializer,
     SupervisorSignupSerializer,
     LeaveRequestStatusUpdateSerializer,
+    LeaveRequestStatusDecisionSerializer,
+    AvailabilityQuerySerializer,
+    ExportQuerySerializer,
 )
+from . import sync
+from .exports import EXPORT_FORMATS, export_leave_requests
+from .fast_serializers import ValuesListMixin
+from .availability import team_availability
+from .conditional import VersionStampConditionalGetMixin
+from .filters import LeaveRequestFilter
+from .overlaps import has_overlap
+from .importers import READERS, import_employees
 from .permissions import IsSuperuserOrEmployee, IsSuperuserOrSupervisor
+from .pagination import EmployeeCursorPagination, LeaveRequestCursorPagination
+from .replicas import ReplicaReadMixin
 
 
 class SupervisorSignupView(generics.CreateAPIView):
@@ -34,9 +58,44 @@ class EmployeeSignupView(generics.CreateAPIView):
             serializer.save()
 
 
-class EmployeeListView(generics.ListAPIView):
+class EmployeeImportView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, IsSuperuserOrSupervisor]
+    parser_classes = [MultiPartParser]
+    readers = READERS
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"detail": "A CSV or JSON Lines file is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        suffix = "." + upload.name.rsplit(".", 1)[-1].lower()
+        if suffix not in self.readers:
+            return Response(
+                {"detail": "Unsupported file type."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        assigned_supervisor = None
+        if request.user.is_supervisor():
+            assigned_supervisor = request.user.get_subclass_instance()
+
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        # Hashed in-process: a process pool per upload would fork the worker
+        # on every request. Large files go through the import_employees command.
+        report = import_employees(
+            self.readers[suffix](stream),
+            assigned_supervisor=assigned_supervisor,
+            workers=1,
+        )
+        return Response(report)
+
+
+class EmployeeListView(ReplicaReadMixin, ValuesListMixin, generics.ListAPIView):
     serializer_class = EmployeeSerializer
     permission_classes = [IsAuthenticated, IsSuperuserOrSupervisor]
+    pagination_class = EmployeeCursorPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -64,12 +123,7 @@ class LeaveRequestCreateView(generics.CreateAPIView):
                 raise PermissionDenied("You have run out of available leave requests.")
 
             # Check for overlapping leave requests
-            overlapping_requests = LeaveRequest.objects.filter(
-                employee=employee,
-                start_date__lte=end_date,
-                end_date__gte=start_date,
-            ).exclude(status=LeaveRequest.LeaveStatus.REJECTED)
-            if overlapping_requests.exists():
+            if has_overlap(employee.pk, start_date, end_date):
                 raise PermissionDenied(
                     "You already have a leave request that overlaps with the requested date range."
                 )
@@ -79,28 +133,204 @@ class LeaveRequestCreateView(generics.CreateAPIView):
             serializer.save()
 
 
-class LeaveRequestListView(generics.ListAPIView):
+class LeaveRequestListView(
+    ReplicaReadMixin,
+    VersionStampConditionalGetMixin,
+    ValuesListMixin,
+    generics.ListAPIView,
+):
     queryset = LeaveRequest.objects.none()  # default fallback
-    serializer_class = LeaveRequestSerializer
+    serializer_class = LeaveRequestListSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = LeaveRequestCursorPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = LeaveRequestFilter
+    ordering_fields = ["created_at", "start_date", "end_date", "updated_at"]
+
+    # Columns read by LeaveRequestListSerializer when it serializes instances,
+    # as the changes endpoint does; listings render `.values()` rows instead.
+    list_fields = [
+        "id",
+        "employee",
+        "start_date",
+        "end_date",
+        "reason",
+        "status",
+        "created_at",
+        "updated_at",
+        "employee__email",
+        "employee__first_name",
+        "employee__last_name",
+    ]
 
     def get_queryset(self):
         user = self.request.user
+        queryset = LeaveRequest.objects.select_related("employee").only(
+            *self.list_fields
+        )
 
         if user.is_superuser:
-            return LeaveRequest.objects.all()
+            return queryset
 
         elif user.is_supervisor():
             supervisor = user.get_subclass_instance()
-            return LeaveRequest.objects.filter(employee__assigned_supervisor=supervisor)
+            return queryset.filter(employee__assigned_supervisor=supervisor)
 
         elif user.is_employee():
             employee = user.get_subclass_instance()
-            return LeaveRequest.objects.filter(employee=employee)
+            return queryset.filter(employee=employee)
 
         return LeaveRequest.objects.none()
 
 
+class LeaveRequestChangesView(LeaveRequestListView):
+    """
+    Returns the leave requests created or changed, and the ids of those
+    deleted, since the `since` token of the previous call. Follow with the
+    returned `next` token while `has_more` is true.
+    """
+
+    pagination_class = None
+    # A filtered delta could not report rows that stop matching the filter.
+    filter_backends = []
+    page_size = 500
+    max_page_size = 1000
+
+    def get_read_database(self):
+        # A row that reached the replica late could carry an older change
+        # position than a token already handed out, and would be skipped.
+        return None
+
+    def list(self, request, *args, **kwargs):
+        try:
+            limit = min(
+                int(request.query_params.get("page_size", self.page_size)),
+                self.max_page_size,
+            )
+        except ValueError:
+            limit = self.page_size
+        try:
+            changed, deleted, next_token, has_more = sync.leave_request_changes(
+                self.get_queryset(),
+                sync.scoped_tombstones(request.user),
+                request.query_params.get("since"),
+                limit=max(limit, 1),
+            )
+        except sync.InvalidSyncToken as error:
+            return Response({"detail": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "changed": self.get_serializer(changed, many=True).data,
+                "deleted": deleted,
+                "next": next_token,
+                "has_more": has_more,
+            }
+        )
+
+
+class LeaveRequestExportView(ReplicaReadMixin, generics.GenericAPIView):
+    """
+    Streams the leave history visible to the user as CSV or NDJSON, gzipped
+    when `compress=gzip`. Accepts the same filters as the list endpoint.
+    """
+
+    permission_classes = [IsAuthenticated, IsSuperuserOrSupervisor]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = LeaveRequestFilter
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_superuser:
+            return LeaveRequest.objects.all()
+        return LeaveRequest.objects.filter(employee__assigned_supervisor_id=user.pk)
+
+    def get(self, request, *args, **kwargs):
+        params = ExportQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        file_format = params.validated_data["file_format"]
+        compress = params.validated_data.get("compress") == "gzip"
+
+        content_type, extension = EXPORT_FORMATS[file_format]
+        filename = f"leave-requests-{timezone.localdate():%Y%m%d}{extension}"
+        if compress:
+            content_type, filename = "application/gzip", filename + ".gz"
+
+        response = StreamingHttpResponse(
+            export_leave_requests(
+                self.filter_queryset(self.get_queryset()), file_format, compress
+            ),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class LeaveRequestSummaryView(ReplicaReadMixin, generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    statuses = LeaveRequest.LeaveStatus.values
+
+    def get(self, request, *args, **kwargs):
+        user = request.user
+
+        if user.is_superuser:
+            totals = LeaveRequestCounter.objects.filter(
+                user__employee__isnull=False
+            ).aggregate(*[Sum(status) for status in self.statuses])
+            summary = {
+                status: totals[f"{status}__sum"] or 0 for status in self.statuses
+            }
+        elif user.is_employee_or_supervisor():
+            summary = (
+                LeaveRequestCounter.objects.filter(user_id=user.pk)
+                .values(*self.statuses)
+                .first()
+            ) or dict.fromkeys(self.statuses, 0)
+        else:
+            raise PermissionDenied(
+                "Only employees and supervisors can access this endpoint."
+            )
+
+        return Response(summary)
+
+
+class LeaveRequestAvailabilityView(ReplicaReadMixin, generics.GenericAPIView):
+    permission_classes = [IsAuthenticated, IsSuperuserOrSupervisor]
+
+    def get(self, request, *args, **kwargs):
+        params = AvailabilityQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        start = params.validated_data.get("start") or timezone.localdate()
+        resolution = params.validated_data["resolution"]
+        buckets = params.validated_data["buckets"]
+
+        window_start = timezone.make_aware(
+            datetime.datetime.combine(start, datetime.time.min)
+        )
+        step = datetime.timedelta(**{f"{resolution}s": 1})
+
+        user = request.user
+        if user.is_superuser:
+            leave_requests = LeaveRequest.objects.all()
+            employees = Employee.objects.all()
+        else:
+            supervisor = user.get_subclass_instance()
+            leave_requests = LeaveRequest.objects.filter(
+                employee__assigned_supervisor=supervisor
+            )
+            employees = Employee.objects.filter(assigned_supervisor=supervisor)
+
+        return Response(
+            {
+                "start": window_start,
+                "resolution": resolution,
+                "buckets": buckets,
+                "team_size": employees.count(),
+                **team_availability(leave_requests, window_start, step, buckets),
+            }
+        )
+
+
 class LeaveRequestDeleteView(generics.DestroyAPIView):
     queryset = LeaveRequest.objects.all()
     serializer_class = LeaveRequestSerializer
@@ -158,31 +388,65 @@ class LeaveRequestStatusUpdateView(generics.UpdateAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        if new_status == LeaveRequest.LeaveStatus.APPROVED:
-            if leave_request.employee.leave_requests_left <= 0:
+        try:
+            if new_status == LeaveRequest.LeaveStatus.APPROVED:
+                leave_request.approve_leave()
+            elif new_status == LeaveRequest.LeaveStatus.REJECTED:
+                leave_request.reject_leave()
+            else:
                 return Response(
-                    {"detail": "Employee has no remaining leave requests."},
-                    status=status.HTTP_400_BAD_REQUEST,
+                    {"detail": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST
                 )
-            leave_request.approve_leave()
-        elif new_status == LeaveRequest.LeaveStatus.REJECTED:
-            leave_request.reject_leave()
-        else:
+        except ValidationError as error:
             return Response(
-                {"detail": "Invalid status"}, status=status.HTTP_400_BAD_REQUEST
+                {"detail": " ".join(error.messages)},
+                status=status.HTTP_400_BAD_REQUEST,
             )
 
         serializer = self.get_serializer(leave_request)
         return Response(serializer.data)
 
 
-class UserProfileView(generics.RetrieveAPIView):
+class LeaveRequestBulkStatusUpdateView(generics.GenericAPIView):
+    serializer_class = LeaveRequestStatusDecisionSerializer
+    permission_classes = [IsSuperuserOrSupervisor]
+    max_batch_size = 1000
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_superuser:
+            return LeaveRequest.objects.all()
+        supervisor = user.get_subclass_instance()
+        return LeaveRequest.objects.filter(employee__assigned_supervisor=supervisor)
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=self.max_batch_size,
+        )
+        serializer.is_valid(raise_exception=True)
+
+        decisions = [(item["id"], item["status"]) for item in serializer.validated_data]
+        results = LeaveRequest.bulk_update_status(
+            decisions, queryset=self.get_queryset()
+        )
+        return Response({"results": results})
+
+
+class UserProfileView(
+    ReplicaReadMixin, VersionStampConditionalGetMixin, generics.RetrieveAPIView
+):
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        user = request.user
-        subclass_instance = user.get_subclass_instance()
+    def retrieve(self, request, *args, **kwargs):
+        subclass_instance = request.user.get_subclass_instance()
+        subclass_instance.load_deferred_fields()
+        return Response(self.get_profile_data(subclass_instance))
 
+    def get_profile_data(self, subclass_instance):
+        user = self.request.user
         if user.is_employee():
             serializer = EmployeeSerializer(subclass_instance)
             role = "employee"
@@ -196,5 +460,4 @@ class UserProfileView(generics.RetrieveAPIView):
 
         response_data = serializer.data
         response_data["role"] = role
-
-        return Response(response_data)
+        return response_data
@@ -31,7 +31,7 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
-    "django.contrib.admin",
+    "app.api.admin_apps.AdminConfig",
     "django.contrib.auth",
     "django.contrib.contenttypes",
     "django.contrib.sessions",
@@ -40,37 +40,98 @@ INSTALLED_APPS = [
     "corsheaders",
     "rest_framework",
     "rest_framework.authtoken",
-    "drf_yasg",
+    "django_filters",
     "app.api.apps.ApiConfig",
 ]
 
+# The Django admin at /admin/. app.settings_production disables it, along
+# with the apps and middleware only it uses, unless DJANGO_ADMIN_ENABLED is set.
+ADMIN_ENABLED = True
+
+# Swagger UI at /swagger/ and the OpenAPI schema at /swagger.json. When
+# disabled, drf_yasg is neither installed nor imported. The schema is
+# generated on first request unless API_SCHEMA_FILE points at the output of
+# the generate_api_schema command.
+API_DOCS_ENABLED = True
+API_SCHEMA_FILE = None
+if API_DOCS_ENABLED:
+    INSTALLED_APPS.append("drf_yasg")
+
 MIDDLEWARE = [
+    "app.api.middleware.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "app.api.middleware.PrimaryPinningMiddleware",
+    "app.api.middleware.PathRoutedMiddleware",
+]
+
+# Run by PathRoutedMiddleware for every path except LEAN_PATH_PREFIXES and
+# LEAN_PATHS, which are matched exactly. The API authenticates with tokens, so
+# sessions only matter for the admin and docs.
+# app.api.admin_apps checks that the admin's middleware are here.
+FULL_STACK_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
+LEAN_PATH_PREFIXES = ["/api/"]
+LEAN_PATHS = ["/metrics"]
 
+# Cross-origin requests from the frontend dev server. app.settings_production
+# leaves corsheaders out unless DJANGO_CORS_ENABLED is set.
+CORS_ENABLED = True
 CORS_ALLOWED_ORIGINS = ["http://localhost:5173", "http://127.0.0.1:5173"]
 CORS_ALLOW_CREDENTIALS = True
 
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",  # For API
-        "rest_framework.authentication.SessionAuthentication",  # For admin
+        "app.api.authentication.CachedTokenAuthentication",  # For API
+        # Only effective outside LEAN_PATH_PREFIXES, where sessions are loaded.
+        "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
 }
 
+# Identity cache used by CachedTokenAuthentication. Use
+# "app.api.token_cache.DjangoTokenCache" with OPTIONS {"alias": ..., "ttl": ...}
+# to store entries in one of CACHES instead, e.g. a file-based cache shared by
+# all workers.
+TOKEN_AUTH_CACHE = {
+    "BACKEND": "app.api.token_cache.LRUTokenCache",
+    "OPTIONS": {"max_size": 10_000, "ttl": 300},
+}
+
+# Approvals that would put more than this many members of a team on approved
+# leave at the same time are refused. None disables the check.
+MAX_TEAM_ON_LEAVE = None
+
+# Serve the leave request list, employee list and profile endpoints with the
+# async views in app.api.async_views. Enable when running under an ASGI server
+# (app.asgi.application); under WSGI each async view runs in its own event loop.
+ASYNC_READ_VIEWS = False
+
+# Per-endpoint metrics served, without authentication, at /metrics.
+# app.settings_production leaves them out unless DJANGO_METRICS_ENABLED is set,
+# so expose them only where the scraper alone can reach them.
+METRICS_ENABLED = True
+
+# With several worker processes, set
+# MULTIPROCESS_DIR to a directory shared by all of them; each process writes
+# its totals there at most every FLUSH_INTERVAL seconds.
+REQUEST_METRICS = {
+    "MULTIPROCESS_DIR": None,
+    "FLUSH_INTERVAL": 1.0,
+}
+
 SWAGGER_SETTINGS = {
     "USE_SESSION_AUTH": False,
+    "SPEC_URL": "schema-json",
     "SECURITY_DEFINITIONS": {
         "Token": {
             "type": "apiKey",
@@ -112,9 +173,47 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # Closed after each request; settings_production keeps them open.
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {
+            # Take the write lock when a transaction begins. A transaction
+            # that reads before writing cannot wait for the lock once another
+            # connection holds it, and fails with "database is locked".
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
+DATABASE_ROUTERS = ["app.api.replicas.ReplicaRouter"]
+
+# Read replicas of the default database, by DATABASES alias. Views with
+# ReplicaReadMixin read from one of them, except for users who made a
+# successful write request within the last STICKY_SECONDS. Those pins are kept
+# in the CACHE alias, which must be shared by all workers when there are
+# several. To try it locally, add a second SQLite file:
+#     DATABASES["replica"] = {**DATABASES["default"], "NAME": BASE_DIR / "replica.sqlite3"}
+# list "replica" in ALIASES and copy the primary into it with sync_replicas.
+READ_REPLICAS = {
+    "ALIASES": [],
+    "STICKY_SECONDS": 5,
+    "CACHE": "default",
+}
+
+# Run on every new SQLite connection by app.api.sqlite. app.settings_production
+# reads overrides from DJANGO_SQLITE_<NAME> environment variables.
+SQLITE_PRAGMAS = {
+    # Wait up to 5 s for the write lock instead of failing.
+    "busy_timeout": 5000,
+    # Readers neither block nor are blocked by the writer.
+    "journal_mode": "WAL",
+    # Sync at checkpoints instead of every commit. A power loss can lose the
+    # latest commits but, in WAL mode, not corrupt the database.
+    "synchronous": "NORMAL",
+    "cache_size": -32_000,  # negative: in KiB
+    "mmap_size": 256 * 2**20,
+    "temp_store": "MEMORY",
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -0,0 +1,96 @@
+"""
+Production settings, selected with DJANGO_SETTINGS_MODULE=app.settings_production.
+
+The secret key and allowed hosts come from DJANGO_SECRET_KEY and
+DJANGO_ALLOWED_HOSTS (comma separated). DJANGO_CONN_MAX_AGE (60 seconds by
+default) and DJANGO_SQLITE_<NAME> (e.g. DJANGO_SQLITE_MMAP_SIZE) override
+CONN_MAX_AGE and SQLITE_PRAGMAS. The admin, the API docs, CORS and the
+request metrics are off unless DJANGO_ADMIN_ENABLED, DJANGO_API_DOCS_ENABLED, DJANGO_CORS_ENABLED
+or DJANGO_METRICS_ENABLED is set to 1; the apps and middleware only they need are then not installed, so
+workers neither import nor run them. Compare the boot time of both profiles
+with the profile_startup command.
+"""
+
+import os
+
+from app.settings import *  # noqa: F401,F403
+from app.settings import (
+    DATABASES,
+    FULL_STACK_MIDDLEWARE,
+    INSTALLED_APPS,
+    MIDDLEWARE,
+    SQLITE_PRAGMAS,
+    TEMPLATES,
+)
+
+
+def env_flag(name):
+    return os.environ.get(name, "").lower() in ("1", "true", "yes", "on")
+
+
+DEBUG = False
+SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get("DJANGO_ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
+
+DATABASES = {
+    **DATABASES,
+    "default": {
+        **DATABASES["default"],
+        # Keep connections across requests, so SQLITE_PRAGMAS run once each.
+        "CONN_MAX_AGE": int(os.environ.get("DJANGO_CONN_MAX_AGE", 60)),
+    },
+}
+SQLITE_PRAGMAS = {
+    name: os.environ.get(f"DJANGO_SQLITE_{name.upper()}", value)
+    for name, value in SQLITE_PRAGMAS.items()
+}
+
+ADMIN_ENABLED = env_flag("DJANGO_ADMIN_ENABLED")
+API_DOCS_ENABLED = env_flag("DJANGO_API_DOCS_ENABLED")
+CORS_ENABLED = env_flag("DJANGO_CORS_ENABLED")
+METRICS_ENABLED = env_flag("DJANGO_METRICS_ENABLED")
+
+disabled = set()
+if not ADMIN_ENABLED:
+    # The API authenticates with tokens; sessions and messages are only used
+    # by the admin.
+    disabled |= {
+        "app.api.admin_apps.AdminConfig",
+        "django.contrib.sessions",
+        "django.contrib.messages",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "django.contrib.messages.context_processors.messages",
+    }
+if not API_DOCS_ENABLED:
+    disabled.add("drf_yasg")
+if not CORS_ENABLED:
+    disabled |= {"corsheaders", "corsheaders.middleware.CorsMiddleware"}
+if not METRICS_ENABLED:
+    disabled.add("app.api.middleware.RequestMetricsMiddleware")
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in disabled]
+if API_DOCS_ENABLED and "drf_yasg" not in INSTALLED_APPS:
+    INSTALLED_APPS.append("drf_yasg")
+MIDDLEWARE = [name for name in MIDDLEWARE if name not in disabled]
+FULL_STACK_MIDDLEWARE = [name for name in FULL_STACK_MIDDLEWARE if name not in disabled]
+TEMPLATES = [
+    {
+        **backend,
+        "OPTIONS": {
+            **backend["OPTIONS"],
+            "context_processors": [
+                name
+                for name in backend["OPTIONS"]["context_processors"]
+                if name not in disabled
+            ],
+        },
+    }
+    for backend in TEMPLATES
+]
+del disabled
@@ -15,28 +15,22 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
-from django.contrib import admin
+from django.conf import settings
 from django.urls import include, path
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Leave Request API",
-        default_version="v1",
-        description="API docs for Leave Request portal",
-    ),
-    public=True,
-    permission_classes=[permissions.AllowAny],
-)
 
 urlpatterns = [
     path("api/", include("app.api.urls")),
-    path("admin/", admin.site.urls),
-    path(
-        "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
 ]
+
+if settings.METRICS_ENABLED:
+    from app.api.metrics import metrics_view
+
+    urlpatterns.append(path("metrics", metrics_view, name="metrics"))
+
+if settings.ADMIN_ENABLED:
+    from django.contrib import admin
+
+    urlpatterns.append(path("admin/", admin.site.urls))
+
+if settings.API_DOCS_ENABLED:
+    urlpatterns.append(path("", include("app.api.schema")))
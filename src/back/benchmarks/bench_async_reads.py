@@ -0,0 +1,199 @@
+"""
+Compares the sync views behind a threaded WSGI server with the async views
+under ASGI, at a fixed number of concurrent clients.
+
+    cd src/back && python -m benchmarks.bench_async_reads --clients 500
+
+Both handlers are driven in-process, so no server needs to be installed. The
+WSGI side runs each request on a pool of `--wsgi-threads` threads, as a
+threaded WSGI server would; the ASGI side runs every request on the event
+loop. `--client-latency-ms` models slow clients: the time taken to write the
+response to the socket, which blocks a WSGI thread but only suspends a
+coroutine.
+"""
+
+import argparse
+import asyncio
+import io
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.utils import setup_django, report
+
+urlpatterns = []
+
+
+def wsgi_caller(application, token, latency):
+    def call(url):
+        parts = urlsplit(url)
+        environ = {
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": parts.query,
+            "HTTP_HOST": "testserver",
+            "HTTP_AUTHORIZATION": f"Token {token}",
+            "wsgi.input": io.BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        statuses = []
+        body = application(environ, lambda status, headers: statuses.append(status))
+        try:
+            b"".join(body)
+        finally:
+            body.close()
+        time.sleep(latency)
+        return statuses[0]
+
+    return call
+
+
+def asgi_caller(application, token, latency):
+    async def call(url):
+        parts = urlsplit(url)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": parts.path,
+            "raw_path": parts.path.encode(),
+            "query_string": parts.query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", b"testserver"),
+                (b"authorization", f"Token {token}".encode()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+        statuses = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # Nothing more to read; Django waits here for a disconnect.
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                statuses.append(message["status"])
+            elif not message.get("more_body"):
+                await asyncio.sleep(latency)
+
+        await application(scope, receive, send)
+        return statuses[0]
+
+    return call
+
+
+async def run_load(send, url, clients, requests_per_client):
+    latencies = []
+
+    async def client():
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            status = await send(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert status in (200, "200 OK"), status
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    timings = statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+    return timings, len(latencies) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--requests-per-client", type=int, default=4)
+    parser.add_argument("--wsgi-threads", type=int, default=16)
+    parser.add_argument("--client-latency-ms", type=float, default=20)
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--requests-per-employee", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    import datetime
+
+    from django.conf import settings
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from django.db import transaction
+    from django.urls import path
+    from django.utils import timezone
+    from rest_framework.authtoken.models import Token
+
+    from app.api import async_views, views
+    from app.api.models import Employee, LeaveRequest, Supervisor
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    settings.ROOT_URLCONF = sys.modules[__name__]
+    urlpatterns[:] = [
+        path("sync/leave-requests/", views.LeaveRequestListView.as_view()),
+        path("sync/employees/", views.EmployeeListView.as_view()),
+        path("sync/profile/", views.UserProfileView.as_view()),
+        path("async/leave-requests/", async_views.AsyncLeaveRequestListView.as_view()),
+        path("async/employees/", async_views.AsyncEmployeeListView.as_view()),
+        path("async/profile/", async_views.AsyncUserProfileView.as_view()),
+    ]
+
+    now = timezone.now()
+    with transaction.atomic():
+        supervisor = Supervisor.objects.create(
+            email="sup@bench.local", national_id="S1"
+        )
+        employees = [
+            Employee.objects.create(
+                email=f"emp{i}@bench.local",
+                national_id=f"E{i}",
+                assigned_supervisor=supervisor,
+            )
+            for i in range(args.employees)
+        ]
+        LeaveRequest.objects.bulk_create(
+            LeaveRequest(
+                employee=employee,
+                start_date=now + datetime.timedelta(days=3 * j),
+                end_date=now + datetime.timedelta(days=3 * j + 1),
+            )
+            for employee in employees
+            for j in range(args.requests_per_employee)
+        )
+    token = Token.objects.create(user=supervisor).key
+
+    latency = args.client_latency_ms / 1000
+    pool = ThreadPoolExecutor(max_workers=args.wsgi_threads)
+    call_wsgi = wsgi_caller(get_wsgi_application(), token, latency)
+    call_asgi = asgi_caller(get_asgi_application(), token, latency)
+
+    async def send_wsgi(url):
+        return await asyncio.get_running_loop().run_in_executor(pool, call_wsgi, url)
+
+    print(
+        f"{args.clients} concurrent clients x {args.requests_per_client} requests, "
+        f"{args.wsgi_threads} WSGI threads, "
+        f"{args.client_latency_ms:g} ms client latency"
+    )
+    for endpoint in ("leave-requests/?page_size=50", "employees/", "profile/"):
+        for label, send, prefix in (
+            ("WSGI", send_wsgi, "sync"),
+            ("ASGI", call_asgi, "async"),
+        ):
+            url = f"/{prefix}/{endpoint}"
+            timings, throughput = asyncio.run(
+                run_load(send, url, args.clients, args.requests_per_client)
+            )
+            report(f"{label} {endpoint} ({throughput:,.0f} req/s)", timings)
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Times the availability computation for a whole organization over a year.
+
+    cd src/back && python -m benchmarks.bench_availability --employees 5000
+"""
+
+import argparse
+import datetime
+import random
+
+from benchmarks.utils import setup_django, timeit, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--requests-per-employee", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    setup_django()
+
+    from django.db import transaction
+    from django.utils import timezone
+
+    from app.api.availability import team_availability
+    from app.api.models import Supervisor, Employee, LeaveRequest
+
+    window_start = timezone.make_aware(datetime.datetime(2025, 1, 1))
+    with transaction.atomic():
+        supervisor = Supervisor.objects.create(
+            email="sup@bench.local", national_id="S1"
+        )
+        employees = [
+            Employee.objects.create(
+                email=f"emp{i}@bench.local",
+                national_id=f"E{i}",
+                assigned_supervisor=supervisor,
+            )
+            for i in range(args.employees)
+        ]
+    statuses = LeaveRequest.LeaveStatus.values
+    LeaveRequest.objects.bulk_create(
+        (
+            LeaveRequest(
+                employee=employee,
+                start_date=start,
+                end_date=start + datetime.timedelta(hours=rng.randrange(4, 240)),
+                status=rng.choice(statuses),
+            )
+            for employee in employees
+            for start in (
+                window_start + datetime.timedelta(hours=rng.randrange(365 * 24))
+                for _ in range(args.requests_per_employee)
+            )
+        ),
+        batch_size=10_000,
+    )
+
+    queryset = LeaveRequest.objects.filter(employee__assigned_supervisor=supervisor)
+    print(
+        f"{args.employees} employees, "
+        f"{args.employees * args.requests_per_employee} leave requests"
+    )
+    report(
+        "365 days, daily buckets",
+        timeit(
+            lambda: team_availability(
+                queryset, window_start, datetime.timedelta(days=1), 365
+            ),
+            repeat=10,
+        ),
+    )
+    report(
+        "31 days, hourly buckets",
+        timeit(
+            lambda: team_availability(
+                queryset, window_start, datetime.timedelta(hours=1), 31 * 24
+            ),
+            repeat=10,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
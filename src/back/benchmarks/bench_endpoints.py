@@ -0,0 +1,238 @@
+"""
+Times every endpoint in app/api/urls.py for each role against a seeded
+organization, and records status codes and query counts as JSON so runs can
+be compared over time.
+
+    cd src/back && python -m benchmarks.bench_endpoints --output results.json
+
+Seeding a large organization takes minutes; pass `--db` to keep the database
+and reuse it on the next run. Write requests run inside a transaction that is
+rolled back, so every iteration sees the same data.
+"""
+
+import argparse
+import datetime
+import io
+import itertools
+import json
+import os
+import platform
+import subprocess
+
+from benchmarks.utils import setup_django, timeit, report
+
+ROLES = ("superuser", "supervisor", "employee")
+
+
+def build_requests(fixtures):
+    """Maps URL names to functions returning (method, path kwargs, data, format)."""
+    counter = itertools.count()
+    start = datetime.date.today() + datetime.timedelta(days=400)
+
+    def signup_data():
+        n = next(counter)
+        return {
+            "email": f"bench{n}@bench.example",
+            "password": "benchpass123",
+            "first_name": "Bench",
+            "last_name": "User",
+            "national_id": f"8{n:09d}",
+        }
+
+    def import_file():
+        data = signup_data()
+        upload = io.BytesIO(
+            (",".join(data) + "\n" + ",".join(data.values()) + "\n").encode()
+        )
+        upload.name = "employees.csv"
+        return {"file": upload}
+
+    return {
+        "api-root": lambda role: ("get", {}, None, None),
+        "api-token-auth": lambda role: (
+            "post",
+            {},
+            {"username": fixtures[role].email, "password": fixtures["password"]},
+            "json",
+        ),
+        "supervisor-signup": lambda role: ("post", {}, signup_data(), "json"),
+        "employee-list": lambda role: ("get", {}, None, None),
+        "employee-signup": lambda role: ("post", {}, signup_data(), "json"),
+        "employee-import": lambda role: ("post", {}, import_file(), "multipart"),
+        "leave-request-list": lambda role: ("get", {}, None, None),
+        "leave-request-changes": lambda role: ("get", {}, None, None),
+        "leave-request-export": lambda role: ("get", {}, None, None),
+        "leave-request-summary": lambda role: ("get", {}, None, None),
+        "leave-request-availability": lambda role: (
+            "get",
+            {},
+            {"days": 30},
+            None,
+        ),
+        "leave-request-create": lambda role: (
+            "post",
+            {},
+            {
+                "start_date": f"{start}T09:00:00Z",
+                "end_date": f"{start}T17:00:00Z",
+                "reason": "Benchmark",
+            },
+            "json",
+        ),
+        "leave-request-status-update": lambda role: (
+            "put",
+            {"pk": fixtures["pending_ids"][0]},
+            {"status": "approved"},
+            "json",
+        ),
+        "leave-request-bulk-status-update": lambda role: (
+            "post",
+            {},
+            [{"id": pk, "status": "approved"} for pk in fixtures["pending_ids"]],
+            "json",
+        ),
+        "leave-request-delete": lambda role: (
+            "delete",
+            {"pk": fixtures["pending_ids"][0]},
+            None,
+            None,
+        ),
+        "user-profile": lambda role: ("get", {}, None, None),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--supervisors", type=int, default=20)
+    parser.add_argument("--employees-per-supervisor", type=int, default=25)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", help="SQLite file to seed once and reuse.")
+    parser.add_argument("--output", default="bench_endpoints.json")
+    args = parser.parse_args()
+
+    db_exists = args.db is not None and os.path.exists(args.db)
+    setup_django(args.db)
+
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection, transaction
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import get_resolver, reverse
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    from app.api.models import CustomUser, Employee, LeaveRequest, Supervisor
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    settings.DEBUG = False
+
+    if not db_exists:
+        call_command(
+            "seed_org",
+            supervisors=args.supervisors,
+            employees_per_supervisor=args.employees_per_supervisor,
+            years=args.years,
+            seed=args.seed,
+        )
+
+    employee = (
+        Employee.objects.filter(leave_requests__status=LeaveRequest.LeaveStatus.PENDING)
+        .order_by("pk")
+        .first()
+    )
+    superuser = CustomUser.objects.filter(is_superuser=True).first()
+    if superuser is None:
+        superuser = CustomUser.objects.create_superuser(
+            email="admin@bench.example", password="password", national_id="0000000000"
+        )
+    fixtures = {
+        "superuser": superuser,
+        "supervisor": Supervisor.objects.get(pk=employee.assigned_supervisor_id),
+        "employee": employee,
+        "password": "password",
+        "pending_ids": list(
+            employee.leave_requests.filter(
+                status=LeaveRequest.LeaveStatus.PENDING
+            ).values_list("pk", flat=True)
+        ),
+    }
+    clients = {}
+    for role in ROLES:
+        token, _ = Token.objects.get_or_create(user=fixtures[role])
+        clients[role] = APIClient(raise_request_exception=False)
+        clients[role].credentials(HTTP_AUTHORIZATION="Token " + token.key)
+
+    requests = build_requests(fixtures)
+    api_names = [
+        pattern.name
+        for pattern in get_resolver("app.api.urls").url_patterns
+        if getattr(pattern, "name", None)
+    ] + ["api-root"]
+    missing = sorted(set(api_names) - set(requests))
+    if missing:
+        print(f"No benchmark request defined for: {', '.join(missing)}")
+
+    results = []
+    for name in sorted(set(api_names) & set(requests)):
+        for role in ROLES:
+            client = clients[role]
+
+            def call():
+                method, kwargs, data, fmt = requests[name](role)
+                with transaction.atomic():
+                    response = getattr(client, method)(
+                        reverse(name, kwargs=kwargs), data, format=fmt
+                    )
+                    transaction.set_rollback(True)
+                return response
+
+            with CaptureQueriesContext(connection) as queries:
+                response = call()
+            timings = timeit(call, repeat=args.repeat)
+            report(f"{name} [{role}] {response.status_code}", timings)
+            results.append(
+                {
+                    "endpoint": name,
+                    "role": role,
+                    "status": response.status_code,
+                    "queries": len(queries),
+                    "median_ms": round(timings[0], 3),
+                    "p99_ms": round(timings[1], 3),
+                }
+            )
+
+    with open(args.output, "w") as output:
+        json.dump(
+            {
+                "revision": git_revision(),
+                "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "dataset": {
+                    "users": CustomUser.objects.count(),
+                    "leave_requests": LeaveRequest.objects.count(),
+                    "seed": args.seed,
+                },
+                "repeat": args.repeat,
+                "results": results,
+            },
+            output,
+            indent=2,
+        )
+    print(f"Wrote {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
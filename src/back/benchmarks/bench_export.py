@@ -0,0 +1,85 @@
+"""
+Measures time to first byte, throughput and peak memory of the leave
+history export, at growing numbers of rows.
+
+    cd src/back && python -m benchmarks.bench_export --employees-per-supervisor 50
+
+Memory is traced with tracemalloc while the whole stream is consumed; its
+peak should stay about the same whatever the number of rows.
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+
+from benchmarks.utils import setup_django
+
+
+def measure(make_chunks):
+    chunks = make_chunks()
+    start = time.perf_counter()
+    size = len(next(chunks))
+    first_byte = time.perf_counter() - start
+    for chunk in chunks:
+        size += len(chunk)
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc slows the export down, so memory is traced on a second run.
+    tracemalloc.start()
+    for chunk in make_chunks():
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first_byte * 1000, elapsed, size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--supervisors", type=int, default=20)
+    parser.add_argument("--employees-per-supervisor", type=int, default=25)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--db", help="SQLite file to seed once and reuse.")
+    args = parser.parse_args()
+
+    db_exists = args.db is not None and os.path.exists(args.db)
+    setup_django(args.db)
+
+    from django.core.management import call_command
+
+    from app.api.exports import export_leave_requests
+    from app.api.models import LeaveRequest
+
+    if not db_exists:
+        call_command(
+            "seed_org",
+            supervisors=args.supervisors,
+            employees_per_supervisor=args.employees_per_supervisor,
+            years=args.years,
+        )
+    total = LeaveRequest.objects.count()
+    ids = LeaveRequest.objects.order_by("pk").values_list("pk", flat=True)
+
+    for file_format in ("csv", "ndjson"):
+        for compress in (False, True):
+            for rows in sorted({total // 100, total // 10, total} - {0}):
+                last_id = ids[rows - 1]
+                ttfb, elapsed, size, peak = measure(
+                    lambda: export_leave_requests(
+                        LeaveRequest.objects.filter(pk__lte=last_id),
+                        file_format,
+                        compress,
+                        chunk_size=args.chunk_size,
+                    )
+                )
+                label = f"{file_format}{'.gz' if compress else ''} {rows:,} rows"
+                print(
+                    f"{label:<28} first byte {ttfb:7.2f} ms   "
+                    f"{rows / elapsed:10,.0f} rows/s   {size / 2**20:8.1f} MiB   "
+                    f"peak memory {peak / 2**20:6.2f} MiB"
+                )
+
+
+if __name__ == "__main__":
+    main()
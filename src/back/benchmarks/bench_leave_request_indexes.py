@@ -0,0 +1,151 @@
+"""
+Seeds a large LeaveRequest table and times the overlap check and the listing
+queries, with and without the composite indexes declared on the model.
+
+    cd src/back && python -m benchmarks.bench_leave_request_indexes --rows 1000000
+"""
+
+import argparse
+import random
+
+from benchmarks.utils import setup_django, timeit, report
+
+
+def seed(rows, employees_per_supervisor, supervisors):
+    from django.utils import timezone
+
+    from app.api.models import Supervisor, Employee, LeaveRequest
+
+    # bulk_create can't insert multi-table inherited rows, and user counts are
+    # small next to the leave request table anyway.
+    supervisor_objs = [
+        Supervisor.objects.create(email=f"sup{i}@bench.local", national_id=f"S{i:09d}")
+        for i in range(supervisors)
+    ]
+    employees = []
+    for s_index, supervisor in enumerate(supervisor_objs):
+        for e_index in range(employees_per_supervisor):
+            n = s_index * employees_per_supervisor + e_index
+            employees.append(
+                Employee.objects.create(
+                    email=f"emp{n}@bench.local",
+                    national_id=f"E{n:09d}",
+                    assigned_supervisor=supervisor,
+                )
+            )
+
+    per_employee = rows // len(employees)
+    origin = timezone.now() - timezone.timedelta(days=3 * per_employee)
+    statuses = ["approved"] * 7 + ["rejected"] * 2 + ["pending"]
+    batch = []
+    for employee in employees:
+        for i in range(per_employee):
+            start = origin + timezone.timedelta(days=3 * i)
+            batch.append(
+                LeaveRequest(
+                    employee=employee,
+                    start_date=start,
+                    end_date=start + timezone.timedelta(days=2),
+                    status=random.choice(statuses),
+                )
+            )
+            if len(batch) >= 10_000:
+                LeaveRequest.objects.bulk_create(batch)
+                batch = []
+    LeaveRequest.objects.bulk_create(batch)
+    return supervisor_objs, employees
+
+
+def run_queries(supervisors, employees):
+    from django.utils import timezone
+
+    from app.api.models import LeaveRequest
+
+    employee = random.choice(employees)
+    supervisor = random.choice(supervisors)
+    start = timezone.now() - timezone.timedelta(days=30)
+    end = start + timezone.timedelta(days=2)
+
+    report(
+        "overlap check (employee, range, status)",
+        timeit(
+            lambda: LeaveRequest.objects.filter(
+                employee=employee, start_date__lte=end, end_date__gte=start
+            )
+            .exclude(status=LeaveRequest.LeaveStatus.REJECTED)
+            .exists()
+        ),
+    )
+    report(
+        "employee pending requests",
+        timeit(
+            lambda: list(
+                LeaveRequest.objects.filter(
+                    employee=employee, status=LeaveRequest.LeaveStatus.PENDING
+                )
+            )
+        ),
+    )
+    report(
+        "supervisor team, first page",
+        timeit(
+            lambda: list(
+                LeaveRequest.objects.filter(
+                    employee__assigned_supervisor=supervisor
+                ).order_by("created_at", "id")[:50]
+            )
+        ),
+    )
+    report(
+        "superuser pending, first page",
+        timeit(
+            lambda: list(
+                LeaveRequest.objects.filter(
+                    status=LeaveRequest.LeaveStatus.PENDING
+                ).order_by("created_at", "id")[:50]
+            )
+        ),
+    )
+
+
+def drop_indexes():
+    from django.db import connection
+
+    from app.api.models import LeaveRequest
+
+    with connection.cursor() as cursor:
+        for index in LeaveRequest._meta.indexes:
+            cursor.execute(f'DROP INDEX "{index.name}"')
+        cursor.execute("ANALYZE")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--supervisors", type=int, default=50)
+    parser.add_argument("--employees-per-supervisor", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    setup_django()
+
+    from django.db import connection
+
+    supervisors, employees = seed(
+        args.rows, args.employees_per_supervisor, args.supervisors
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    print(f"seeded {args.rows} leave requests for {len(employees)} employees")
+
+    print("\nwith composite indexes")
+    run_queries(supervisors, employees)
+
+    drop_indexes()
+    print("\nwithout composite indexes")
+    run_queries(supervisors, employees)
+
+
+if __name__ == "__main__":
+    main()
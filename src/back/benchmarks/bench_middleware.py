@@ -0,0 +1,87 @@
+"""
+Measures the per-request overhead of the middleware stack on a view that does
+nothing, comparing the previous flat MIDDLEWARE with PathRoutedMiddleware on
+API and admin paths.
+
+    cd src/back && python -m benchmarks.bench_middleware --repeat 20000
+"""
+
+import argparse
+import io
+import sys
+import time
+from wsgiref.util import setup_testing_defaults
+
+from benchmarks.utils import setup_django
+
+urlpatterns = []
+
+FLAT_MIDDLEWARE = [
+    "app.api.middleware.RequestMetricsMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+
+def per_request_us(application, path, repeat):
+    environ = {"PATH_INFO": path, "HTTP_HOST": "testserver"}
+    setup_testing_defaults(environ)
+
+    def call():
+        environ["wsgi.input"] = io.BytesIO()
+        body = application(environ.copy(), lambda status, headers: None)
+        body.close()
+
+    for _ in range(repeat // 10):
+        call()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.http import HttpResponse
+    from django.urls import path
+
+    def view(request):
+        # Touch the user as an authenticated view would.
+        getattr(request, "user", None)
+        return HttpResponse(b"{}", content_type="application/json")
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    settings.DEBUG = False
+    settings.ROOT_URLCONF = sys.modules[__name__]
+    urlpatterns[:] = [path("api/ping/", view), path("admin/ping/", view)]
+
+    routed_middleware = settings.MIDDLEWARE
+    baseline = None
+    for label, middleware, url in (
+        ("flat MIDDLEWARE, /api/", FLAT_MIDDLEWARE, "/api/ping/"),
+        ("flat MIDDLEWARE, /admin/", FLAT_MIDDLEWARE, "/admin/ping/"),
+        ("routed, /api/ (lean)", routed_middleware, "/api/ping/"),
+        ("routed, /admin/ (full)", routed_middleware, "/admin/ping/"),
+        ("no middleware", [], "/api/ping/"),
+    ):
+        settings.MIDDLEWARE = middleware
+        elapsed = per_request_us(WSGIHandler(), url, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{label:<28} {elapsed:8.1f} us/request  ({elapsed / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Compares checking many candidate ranges against one employee's history with
+a query per check (the previous approach) versus a single load into an
+IntervalIndex. Then does the same for the MAX_TEAM_ON_LEAVE check of a bulk
+approval: a counting query per decision versus TeamLeaveCapacity.
+
+    cd src/back && python -m benchmarks.bench_overlap_detection --history 5000
+"""
+
+import argparse
+import random
+
+from benchmarks.utils import setup_django, timeit, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history", type=int, default=5000)
+    parser.add_argument("--candidates", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--team", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    setup_django()
+
+    from django.utils import timezone
+
+    from app.api.models import Supervisor, Employee, LeaveRequest
+    from app.api.overlaps import (
+        IntervalIndex,
+        TeamLeaveCapacity,
+        active_leave_requests,
+    )
+
+    supervisor = Supervisor.objects.create(email="sup@bench.local", national_id="S1")
+    employee = Employee.objects.create(
+        email="emp@bench.local", national_id="E1", assigned_supervisor=supervisor
+    )
+    origin = timezone.now() - timezone.timedelta(days=3 * args.history)
+    statuses = LeaveRequest.LeaveStatus.values
+    LeaveRequest.objects.bulk_create(
+        LeaveRequest(
+            employee=employee,
+            start_date=origin + timezone.timedelta(days=3 * i),
+            end_date=origin + timezone.timedelta(days=3 * i + 2),
+            status=rng.choice(statuses),
+        )
+        for i in range(args.history)
+    )
+    candidates = []
+    for _ in range(args.candidates):
+        start = origin + timezone.timedelta(hours=rng.randrange(72 * args.history))
+        candidates.append((start, start + timezone.timedelta(hours=rng.randrange(96))))
+
+    def query_per_check():
+        return [
+            list(
+                active_leave_requests()
+                .filter(employee=employee, start_date__lte=end, end_date__gte=start)
+                .values_list("pk", flat=True)
+            )
+            for start, end in candidates
+        ]
+
+    def interval_index():
+        return IntervalIndex.for_employee(employee.pk).overlapping_many(candidates)
+
+    index = IntervalIndex.for_employee(employee.pk)
+    expected = [sorted(pks) for pks in query_per_check()]
+    assert [sorted(pk for pk, _ in found) for found in interval_index()] == expected
+
+    print(f"{args.candidates} candidates against {args.history} requests")
+    report("query per check", timeit(query_per_check, repeat=5))
+    report("load IntervalIndex + check all", timeit(interval_index, repeat=5))
+    report(
+        "check all on a loaded IntervalIndex",
+        timeit(lambda: index.overlapping_many(candidates), repeat=20),
+    )
+
+    teammates = [employee] + [
+        Employee.objects.create(
+            email=f"emp{i}@bench.local",
+            national_id=f"E{i}",
+            assigned_supervisor=supervisor,
+        )
+        for i in range(2, args.team + 1)
+    ]
+    LeaveRequest.objects.bulk_create(
+        LeaveRequest(
+            employee=teammate,
+            start_date=origin + timezone.timedelta(days=3 * i),
+            end_date=origin + timezone.timedelta(days=3 * i + 2),
+            status=rng.choice(statuses),
+        )
+        for teammate in teammates[1:]
+        for i in range(0, args.history, 5)
+    )
+    pending = list(
+        LeaveRequest.objects.filter(
+            employee__assigned_supervisor=supervisor, status="pending"
+        ).values_list("pk", "employee_id", "start_date", "end_date")[: args.candidates]
+    )
+    limit = args.team // 4
+
+    def count_per_decision():
+        return [
+            active_leave_requests()
+            .filter(
+                employee__assigned_supervisor=supervisor,
+                status="approved",
+                start_date__lte=end,
+                end_date__gte=start,
+            )
+            .exclude(employee_id=employee_id)
+            .values("employee_id")
+            .distinct()
+            .count()
+            < limit
+            for _, employee_id, start, end in pending
+        ]
+
+    def team_capacity():
+        capacity = TeamLeaveCapacity(
+            limit, [supervisor.pk], [(pk, start, end) for pk, _, start, end in pending]
+        )
+        return [
+            capacity.allows(supervisor.pk, employee_id, start, end)
+            for _, employee_id, start, end in pending
+        ]
+
+    assert team_capacity() == count_per_decision()
+    print(f"{len(pending)} approvals in a team of {args.team}")
+    report("counting query per decision", timeit(count_per_decision, repeat=5))
+    report("load TeamLeaveCapacity + check all", timeit(team_capacity, repeat=5))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compares DRF ModelSerializers with their ValuesSerializer counterparts on a
+large page: rendering rows already fetched, and fetching plus rendering.
+
+    cd src/back && python -m benchmarks.bench_serializers --rows 10000
+"""
+
+import argparse
+
+from benchmarks.utils import setup_django, timeit, report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    setup_django()
+
+    import datetime
+
+    from django.db import transaction
+    from django.utils import timezone
+
+    from app.api.fast_serializers import values_serializer_for
+    from app.api.models import Employee, LeaveRequest, Supervisor
+    from app.api.serializers import (
+        EmployeeSerializer,
+        LeaveRequestListSerializer,
+        LeaveRequestSerializer,
+        SupervisorSerializer,
+    )
+
+    now = timezone.now()
+    with transaction.atomic():
+        supervisors = [
+            Supervisor.objects.create(email=f"sup{i}@bench.local", national_id=f"S{i}")
+            for i in range(args.rows)
+        ]
+        employees = [
+            Employee.objects.create(
+                email=f"emp{i}@bench.local",
+                national_id=f"E{i}",
+                assigned_supervisor=supervisors[0],
+            )
+            for i in range(args.rows)
+        ]
+    LeaveRequest.objects.bulk_create(
+        (
+            LeaveRequest(
+                employee=employee,
+                start_date=now + datetime.timedelta(days=1),
+                end_date=now + datetime.timedelta(days=2),
+                reason="Vacation",
+            )
+            for employee in employees
+        ),
+        batch_size=5000,
+    )
+
+    cases = [
+        (
+            LeaveRequestListSerializer,
+            LeaveRequest.objects.select_related("employee"),
+        ),
+        (LeaveRequestSerializer, LeaveRequest.objects.all()),
+        (EmployeeSerializer, Employee.objects.all()),
+        (SupervisorSerializer, Supervisor.objects.all()),
+    ]
+    print(f"{args.rows:,} rows")
+    for serializer_class, queryset in cases:
+        queryset = queryset.order_by("pk")[: args.rows]
+        fast = values_serializer_for(serializer_class)
+        instances, rows = list(queryset), list(fast.values(queryset))
+        name = serializer_class.__name__
+        compare(
+            f"{name} render",
+            timeit(
+                lambda: serializer_class(instances, many=True).data,
+                repeat=args.repeat,
+            ),
+            timeit(lambda: fast.serialize(rows), repeat=args.repeat),
+        )
+        compare(
+            f"{name} fetch+render",
+            timeit(
+                lambda: serializer_class(queryset.all(), many=True).data,
+                repeat=args.repeat,
+            ),
+            timeit(lambda: fast.serialize(fast.values(queryset)), repeat=args.repeat),
+        )
+
+
+def compare(label, model_timings, values_timings):
+    report(f"{label}, ModelSerializer", model_timings)
+    report(
+        f"{label}, values ({model_timings[0] / values_timings[0]:.1f}x)",
+        values_timings,
+    )
+
+
+if __name__ == "__main__":
+    main()
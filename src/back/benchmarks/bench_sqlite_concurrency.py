@@ -0,0 +1,161 @@
+"""
+Runs concurrent writers and readers against one SQLite file, first with
+Django's defaults (rollback journal, DEFERRED transactions, no PRAGMAs) and
+then with the tuned DATABASES options and SQLITE_PRAGMAS. Every worker is a
+separate process, like the workers of a WSGI server.
+
+    cd src/back && python -m benchmarks.bench_sqlite_concurrency --writers 4 --readers 4
+
+Writers submit a leave request and then approve or reject it, on its own or
+through the bulk decision path. Readers fetch a page of a supervisor's team
+requests. "database is locked" errors are counted, and the operation is not
+retried.
+"""
+
+import argparse
+import datetime
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from benchmarks.utils import setup_django
+
+CONFIGS = ["default", "tuned"]
+
+
+def worker(config, db_name, role, duration, seed, barrier, results):
+    from django.conf import settings
+
+    if config == "default":
+        settings.SQLITE_PRAGMAS = {}
+        settings.DATABASES["default"]["OPTIONS"] = {}
+    setup_django(db_name, migrate=False)
+
+    from django.core.exceptions import ValidationError
+    from django.db import OperationalError
+    from django.utils import timezone
+
+    from app.api.models import Employee, LeaveRequest
+
+    rng = random.Random(seed)
+    team = list(Employee.objects.values_list("pk", "assigned_supervisor_id"))
+    now = timezone.now()
+
+    def write():
+        employee_id, _ = rng.choice(team)
+        start = now + datetime.timedelta(days=rng.randrange(60, 400))
+        leave_request = LeaveRequest.objects.create(
+            employee_id=employee_id,
+            start_date=start,
+            end_date=start + datetime.timedelta(days=1),
+            reason="bench",
+        )
+        status = rng.choice(["approved", "rejected"])
+        if rng.random() < 0.5:
+            # Reads the requests before updating them, in one transaction.
+            LeaveRequest.bulk_update_status([(leave_request.pk, status)])
+            return
+        try:
+            if status == "approved":
+                leave_request.approve_leave()
+            else:
+                leave_request.reject_leave()
+        except ValidationError:  # No leave left.
+            leave_request.reject_leave()
+
+    def read():
+        _, supervisor_id = rng.choice(team)
+        list(
+            LeaveRequest.objects.filter(employee__assigned_supervisor_id=supervisor_id)
+            .order_by("-created_at")
+            .values()[:50]
+        )
+
+    operation = write if role == "writer" else read
+    latencies, errors = [], 0
+    barrier.wait()
+    deadline = time.perf_counter() + duration
+    while (start := time.perf_counter()) < deadline:
+        try:
+            operation()
+        except OperationalError as error:
+            if "locked" not in str(error):
+                raise
+            errors += 1
+        else:
+            latencies.append((time.perf_counter() - start) * 1000)
+    results.put((role, latencies, errors))
+
+
+def run(config, db_name, args):
+    context = multiprocessing.get_context("spawn")
+    roles = ["writer"] * args.writers + ["reader"] * args.readers
+    barrier = context.Barrier(len(roles))
+    results = context.Queue()
+    processes = [
+        context.Process(
+            target=worker,
+            args=(config, db_name, role, args.duration, seed, barrier, results),
+        )
+        for seed, role in enumerate(roles)
+    ]
+    for process in processes:
+        process.start()
+    totals = {"writer": ([], 0), "reader": ([], 0)}
+    for _ in processes:
+        role, latencies, errors = results.get()
+        totals[role] = (totals[role][0] + latencies, totals[role][1] + errors)
+    for process in processes:
+        process.join()
+
+    for role, (latencies, errors) in totals.items():
+        if not latencies and not errors:
+            continue
+        latencies.sort()
+        p99 = latencies[int(len(latencies) * 0.99) - 1] if latencies else 0
+        print(
+            f"{config:<8} {role}s {len(latencies) / args.duration:9.1f} ops/s   "
+            f"median {statistics.median(latencies or [0]):7.2f} ms   "
+            f"p99 {p99:8.2f} ms   locked errors {errors}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--supervisors", type=int, default=10)
+    parser.add_argument("--employees-per-supervisor", type=int, default=20)
+    args = parser.parse_args()
+
+    seeded = setup_django()
+
+    from django.core.management import call_command
+    from django.db import connections
+
+    call_command(
+        "seed_org",
+        supervisors=args.supervisors,
+        employees_per_supervisor=args.employees_per_supervisor,
+        years=1,
+    )
+    connections.close_all()  # Checkpoints and removes the WAL.
+
+    directory = tempfile.mkdtemp(prefix="bench-")
+    for config in CONFIGS:
+        db_name = os.path.join(directory, f"{config}.sqlite3")
+        shutil.copy(seeded, db_name)
+        if config == "default":
+            with sqlite3.connect(db_name) as db:
+                db.execute("PRAGMA journal_mode = DELETE")
+        run(config, db_name, args)
+
+
+if __name__ == "__main__":
+    main()
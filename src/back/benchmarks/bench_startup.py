@@ -0,0 +1,54 @@
+"""
+Compares worker cold starts under app.settings and app.settings_production:
+time until the application is loaded and the first (unauthenticated) request
+is served, peak resident memory and the number of imported modules. Runs of
+the two profiles are interleaved so machine noise affects both alike.
+
+    cd src/back && python -m benchmarks.bench_startup --repeat 15
+"""
+
+import argparse
+import os
+import statistics
+
+from app.api.startup import profile_startup
+
+PROFILES = {
+    "development": {"DJANGO_SETTINGS_MODULE": "app.settings"},
+    "production": {
+        "DJANGO_SETTINGS_MODULE": "app.settings_production",
+        "DJANGO_SECRET_KEY": "bench",
+        "DJANGO_ALLOWED_HOSTS": "localhost",
+    },
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--path", default="/api/leave-requests/")
+    args = parser.parse_args()
+
+    for handler in ("wsgi", "asgi"):
+        runs = {name: [] for name in PROFILES}
+        for _ in range(args.repeat):
+            for name, env in PROFILES.items():
+                runs[name].append(
+                    profile_startup(handler, args.path, env={**os.environ, **env})
+                )
+        for name, results in runs.items():
+
+            def median(key):
+                return statistics.median(result[key] for result in results)
+
+            modules = sum(1 for node in results[-1]["imports"] for _ in node.walk())
+            print(
+                f"{handler} {name:<12} loaded {median('loaded') * 1000:6.1f} ms   "
+                f"first response {median('served') * 1000:6.1f} ms   "
+                f"RSS {median('served_rss') / 2**20:5.1f} MiB   "
+                f"{modules} modules"
+            )
+
+
+if __name__ == "__main__":
+    main()
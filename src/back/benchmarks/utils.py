@@ -0,0 +1,42 @@
+import os
+import statistics
+import tempfile
+import time
+
+
+def setup_django(db_name=None, migrate=True):
+    """
+    Configures Django against a throwaway SQLite database and applies the
+    migrations, so benchmarks never touch the development database.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "app.settings")
+
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+
+    if db_name is None:
+        db_name = os.path.join(tempfile.mkdtemp(prefix="bench-"), "db.sqlite3")
+    settings.DATABASES["default"]["NAME"] = db_name
+    django.setup()
+    if migrate:
+        call_command("migrate", verbosity=0)
+    return db_name
+
+
+def timeit(fn, repeat=50):
+    """
+    Runs `fn` `repeat` times and returns (median, p99) wall time in milliseconds.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def report(label, timings):
+    median, p99 = timings
+    print(f"{label:<48} median {median:8.3f} ms   p99 {p99:8.3f} ms")
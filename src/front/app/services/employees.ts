@@ -1,6 +1,6 @@
 import { MissingAccessTokenError } from "~/constants/errors";
 import { employeeListUrl, employeeSignupUrl } from "~/constants/linksConfig";
-import type { Employee } from "~/types";
+import type { CursorPage, Employee } from "~/types";
 import { getAccessTokenFromCookie } from "~/utils";
 import apiClient, { parseApiError } from "~/utils/apiClient";
 
@@ -11,14 +11,21 @@ export async function fetchEmployeesList(): Promise<{
   try {
     const accessToken = getAccessTokenFromCookie();
     if (!accessToken) throw new MissingAccessTokenError();
-    const response = await apiClient
-      .get(employeeListUrl, {
-        headers: { Authorization: `Token ${accessToken}` },
-      })
-      .catch((error) => {
-        throw new Error(parseApiError(error));
-      });
-    return { data: response.data as Employee[] };
+    const data: Employee[] = [];
+    let nextUrl: string | null = employeeListUrl;
+    while (nextUrl) {
+      const response = await apiClient
+        .get(nextUrl, {
+          headers: { Authorization: `Token ${accessToken}` },
+        })
+        .catch((error) => {
+          throw new Error(parseApiError(error));
+        });
+      const page = response.data as CursorPage<Employee>;
+      data.push(...page.results);
+      nextUrl = page.next;
+    }
+    return { data };
   } catch (error) {
     console.error("Failed to fetch employees list:", error);
     return { data: [], error: error + "" };
@@ -5,25 +5,39 @@ import {
   buildLeaveRequestStatusUpdateUrl,
   buildLeaveRequestDeleteUrl,
 } from "~/constants/linksConfig";
-import type { LeaveRequest } from "~/types";
+import type { CursorPage, LeaveRequest, LeaveRequestFilters } from "~/types";
 import { getAccessTokenFromCookie } from "~/utils";
 import apiClient, { parseApiError } from "~/utils/apiClient";
 
-export async function fetchLeaveRequestsList(): Promise<{
+export async function fetchLeaveRequestsList(
+  filters: LeaveRequestFilters = {}
+): Promise<{
   data: LeaveRequest[];
   error?: string;
 }> {
   try {
     const accessToken = getAccessTokenFromCookie();
     if (!accessToken) throw new MissingAccessTokenError();
-    const response = await apiClient
-      .get(leaveRequestListUrl, {
-        headers: { Authorization: `Token ${accessToken}` },
-      })
-      .catch((error) => {
-        throw new Error(parseApiError(error));
-      });
-    return { data: response.data as LeaveRequest[] };
+    const data: LeaveRequest[] = [];
+    let nextUrl: string | null = leaveRequestListUrl;
+    // Filters go on the first request only; `next` links already carry them.
+    let params: LeaveRequestFilters | undefined = filters;
+    while (nextUrl) {
+      const response = await apiClient
+        .get(nextUrl, {
+          headers: { Authorization: `Token ${accessToken}` },
+          params,
+          paramsSerializer: { indexes: null },
+        })
+        .catch((error) => {
+          throw new Error(parseApiError(error));
+        });
+      const page = response.data as CursorPage<LeaveRequest>;
+      data.push(...page.results);
+      nextUrl = page.next;
+      params = undefined;
+    }
+    return { data };
   } catch (error) {
     console.error("Failed to fetch leave requests list:", error);
     return { data: [], error: error + "" };
@@ -7,6 +7,22 @@ export type LeaveRequest = {
   reason: string | null;
 };
 
+export type LeaveRequestFilters = {
+  status?: LeaveRequest["status"][];
+  employee?: number;
+  overlaps_from?: string;
+  overlaps_to?: string;
+  created_after?: string;
+  created_before?: string;
+  ordering?: string;
+};
+
+export type CursorPage<T> = {
+  next: string | null;
+  previous: string | null;
+  results: T[];
+};
+
 export enum UserRole {
   SUPERVISOR = "supervisor",
   EMPLOYEE = "employee",
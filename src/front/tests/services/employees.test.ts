@@ -43,7 +43,9 @@ describe("employees service", () => {
         },
       ];
       mockedGetToken.mockReturnValue("valid-token");
-      mockedApiClient.get.mockResolvedValue({ data: mockEmployees });
+      mockedApiClient.get.mockResolvedValue({
+        data: { next: null, previous: null, results: mockEmployees },
+      });
 
       const result = await fetchEmployeesList();
       expect(result.data).toEqual(mockEmployees);
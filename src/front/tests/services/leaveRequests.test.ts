@@ -50,13 +50,33 @@ describe("leaveRequests service", () => {
         },
       ];
       mockedGetToken.mockReturnValue("valid-token");
-      mockedApiClient.get.mockResolvedValue({ data: mockData });
+      mockedApiClient.get.mockResolvedValue({
+        data: { next: null, previous: null, results: mockData },
+      });
 
       const result = await fetchLeaveRequestsList();
       expect(result.data).toEqual(mockData);
       expect(result.error).toBeUndefined();
     });
 
+    it("sends filters with the first page request only", async () => {
+      mockedGetToken.mockReturnValue("valid-token");
+      mockedApiClient.get
+        .mockResolvedValueOnce({
+          data: { next: "/next-page", previous: null, results: [] },
+        })
+        .mockResolvedValueOnce({
+          data: { next: null, previous: null, results: [] },
+        });
+
+      const filters = { status: ["pending" as const], overlaps_to: "2025-09-01" };
+      await fetchLeaveRequestsList(filters);
+      expect(mockedApiClient.get.mock.calls[0][1]).toMatchObject({
+        params: filters,
+      });
+      expect(mockedApiClient.get.mock.calls[1][1].params).toBeUndefined();
+    });
+
     it("returns error when token is missing", async () => {
       mockedGetToken.mockReturnValue(undefined);
 